@@ -0,0 +1,196 @@
+"""Shared bootstrap for the benchmark scripts.
+
+Benchmarks always run against a throwaway SQLite database, so they never touch
+the database configured in .env. Import this module before anything from the app.
+
+Run a benchmark from the Backend folder, eg: python -m benchmarks.bench_async_db
+"""
+
+import os
+import tempfile
+import time
+
+from cryptography.fernet import Fernet
+
+BENCH_DIR = tempfile.mkdtemp(prefix="event_bench_")
+BENCH_DB_PATH = os.path.join(BENCH_DIR, "bench.sqlite")
+
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{BENCH_DB_PATH}"
+
+_defaults = {
+    "APP_NAME": "Event Management Benchmark",
+    "JWT_SECRET_KEY": "benchmark-secret-key-which-is-long-enough",
+    "ACCESS_TOKEN_EXPIRE_MINUTES": "120",
+    "ALGORITHM": "HS256",
+    "GEOCODING_API_KEY": "benchmark",
+    "RAZORPAY_MERCHANT_ID": "benchmark",
+    "RAZORPAY_SECRET_KEY": "benchmark",
+    "CLOUDINARY_SECRET_KEY": "benchmark",
+    "CLOUDINARY_API_KEY": "benchmark",
+    "CIPHER_KEY": Fernet.generate_key().decode(),
+}
+
+for key, value in _defaults.items():
+    os.environ.setdefault(key, value)
+
+
+def install_db_latency(sync_engine):
+    """Registers db_sleep(ms) on every SQLite connection to fake network latency."""
+    from sqlalchemy import event
+
+    @event.listens_for(sync_engine, "connect")
+    def _register_sleep(dbapi_connection, connection_record):
+        dbapi_connection.create_function(
+            "db_sleep", 1, lambda ms: time.sleep(ms / 1000) or 1
+        )
+
+
+async def create_tables():
+    from database import engine, Base
+
+    # Importing the controllers registers every model on Base.metadata
+    import main  # noqa: F401
+
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.drop_all)
+        await connection.run_sync(Base.metadata.create_all)
+
+
+def percentile(samples: list, pct: float):
+    if not samples:
+        return 0.0
+
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+
+    return ordered[index]
+
+
+def print_table(title: str, rows: list):
+    print(f"\n{title}")
+    width = max(len(label) for label, _ in rows)
+
+    for label, value in rows:
+        print(f"  {label.ljust(width)}  {value}")
+
+
+def request_scope():
+    """Async context manager which mimics the get_db dependency of a request."""
+    from contextlib import asynccontextmanager
+
+    from database import get_db
+
+    return asynccontextmanager(get_db)()
+
+
+def count_statements(sync_engine, latency_ms: float = 0):
+    """Counts statements sent to the database, optionally adding a fake round trip."""
+    from sqlalchemy import event
+
+    counter = {"statements": 0}
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _count(conn, cursor, statement, parameters, context, executemany):
+        counter["statements"] += 1
+
+        if latency_ms:
+            time.sleep(latency_ms / 1000)
+
+    return counter
+
+
+async def seed_catalogue(event_count: int = 1, bookings_per_event: int = 0):
+    """Inserts users, profiles, a category, locations, events and bookings.
+
+    Returns the ids of the creator and of the seeded events.
+    """
+    from datetime import datetime, timedelta
+    from sqlalchemy import insert
+
+    from database import SessionLocal
+    from modules.events import models as event_models
+    from modules.users import models as user_models
+    from utils.ids import new_id
+
+    now = datetime.now()
+    creator_id = new_id()
+    attendee_ids = [new_id() for _ in range(bookings_per_event)]
+
+    users = [
+        {"user_id": user_id, "email": f"user{index}@bench.dev", "password": "x"}
+        for index, user_id in enumerate([creator_id, *attendee_ids])
+    ]
+    profiles = [
+        {
+            "profile_id": new_id(),
+            "user_id": user["user_id"],
+            "first_name": "Bench",
+            "last_name": f"User{index}",
+            "college_name": "Benchmark College",
+            "about_me": "Seeded for benchmarks",
+        }
+        for index, user in enumerate(users)
+    ]
+
+    events = []
+    locations = []
+
+    for index in range(event_count):
+        locations.append(
+            {
+                "location_id": index + 1,
+                "full_location": f"{index} Bench Street Chennai Tamil Nadu India",
+                "latitude": 13.0 + (index % 1000) / 1000,
+                "longitude": 80.2 + (index % 997) / 1000,
+            }
+        )
+        events.append(
+            {
+                "event_id": new_id(),
+                "event_name": f"Benchmark event {index}",
+                "event_description": "An event seeded for benchmarking",
+                "event_image_url": "https://example.com/event.png",
+                "event_agenda": "Talks, food and music " * 20,
+                "landmark": "Near Bench Park",
+                "event_start_date_time": now + timedelta(days=1, minutes=index),
+                "event_end_date_time": now + timedelta(days=2, minutes=index),
+                "ticket_type": "FREE",
+                "ticket_fare": 0,
+                "total_tickets": bookings_per_event + 100,
+                "tickets_sold": bookings_per_event,
+                "participant_type": "INDIVIDUAL",
+                "participant_count": 1,
+                "category_id": 1,
+                "address_id": index + 1,
+                "creator_id": creator_id,
+            }
+        )
+
+    bookings = [
+        {
+            "booking_id": new_id(),
+            "event_id": event["event_id"],
+            "attendee_id": attendee_id,
+            "booking_status": True,
+            "registered_at": now,
+        }
+        for event in events
+        for attendee_id in attendee_ids
+    ]
+
+    async with SessionLocal() as db:
+        await db.execute(insert(user_models.UsersModel), users)
+        await db.execute(insert(user_models.ProfileModel), profiles)
+        await db.execute(
+            insert(event_models.Event_Category_Model),
+            [{"category_name": "Bench", "category_image_url": "https://x/c.png"}],
+        )
+        await db.execute(insert(event_models.Event_Location_Model), locations)
+        await db.execute(insert(event_models.Events_Model), events)
+
+        if bookings:
+            await db.execute(insert(event_models.Event_Bookings_Model), bookings)
+
+        await db.commit()
+
+    return creator_id, [event["event_id"] for event in events]
@@ -0,0 +1,70 @@
+"""Requests per worker with blocking vs async database access.
+
+Every simulated request runs QUERIES_PER_REQUEST statements that each take
+DB_LATENCY_MS on the database side (a stand-in for the network round trip to
+MySQL). The "before" run uses the old synchronous engine inside async handlers,
+the "after" run awaits the async engine from database.py.
+"""
+
+import asyncio
+import time
+
+from benchmarks import _setup
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from database import SessionLocal, engine
+
+CONCURRENT_REQUESTS = 200
+QUERIES_PER_REQUEST = 3
+DB_LATENCY_MS = 5
+
+query = text("SELECT db_sleep(:ms)")
+
+
+async def blocking_handler(sync_session_factory):
+    with sync_session_factory() as db:
+        for _ in range(QUERIES_PER_REQUEST):
+            db.execute(query, {"ms": DB_LATENCY_MS}).scalar()
+
+
+async def async_handler():
+    async with SessionLocal() as db:
+        for _ in range(QUERIES_PER_REQUEST):
+            (await db.execute(query, {"ms": DB_LATENCY_MS})).scalar()
+
+
+async def run(handler, *args):
+    started = time.perf_counter()
+    await asyncio.gather(*(handler(*args) for _ in range(CONCURRENT_REQUESTS)))
+    elapsed = time.perf_counter() - started
+
+    return CONCURRENT_REQUESTS / elapsed, elapsed
+
+
+async def main():
+    sync_engine = create_engine(f"sqlite:///{_setup.BENCH_DB_PATH}")
+    _setup.install_db_latency(sync_engine)
+    _setup.install_db_latency(engine.sync_engine)
+
+    sync_session_factory = sessionmaker(bind=sync_engine)
+
+    before_rps, before_elapsed = await run(blocking_handler, sync_session_factory)
+    after_rps, after_elapsed = await run(async_handler)
+
+    _setup.print_table(
+        f"{CONCURRENT_REQUESTS} concurrent requests, "
+        f"{QUERIES_PER_REQUEST} x {DB_LATENCY_MS} ms queries each",
+        [
+            ("sync engine (before)", f"{before_rps:8.1f} req/s  {before_elapsed:.2f}s"),
+            ("async engine (after)", f"{after_rps:8.1f} req/s  {after_elapsed:.2f}s"),
+        ],
+    )
+
+    sync_engine.dispose()
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,81 @@
+"""Cost of authenticating a protected request.
+
+"before" replays what get_current_user used to do on every request: decode the
+JWT and load the user row. "after" is get_current_user with the verified token
+and principal caches warm. Each statement pays a fake DB_LATENCY_MS round trip.
+"""
+
+import asyncio
+import time
+
+from benchmarks import _setup
+
+import jwt
+
+from database import engine
+from core.auth import Jwt_Token
+from middlewares.protected_dependency import get_current_user
+from modules.users.models import auth_dao
+from settings import settings
+
+ITERATIONS = 2000
+DB_LATENCY_MS = 1
+
+
+class Fake_Request:
+    def __init__(self, access_token: str):
+        self.cookies = {"access_token": access_token}
+
+
+async def legacy_current_user(request):
+    payload = jwt.decode(
+        request.cookies["access_token"],
+        settings.JWT_SECRET_KEY,
+        algorithms=[settings.ALGORITHM],
+    )
+    user_id = payload["sub"]
+
+    await auth_dao.fetch_record(field_name="user_id", field_value=user_id)
+
+    return user_id
+
+
+async def measure(handler, request, counter):
+    counter["statements"] = 0
+    started = time.perf_counter()
+
+    for _ in range(ITERATIONS):
+        async with _setup.request_scope():
+            await handler(request)
+
+    elapsed = time.perf_counter() - started
+
+    return counter["statements"] / ITERATIONS, elapsed / ITERATIONS * 1000
+
+
+async def main():
+    await _setup.create_tables()
+    user_id, _ = await _setup.seed_catalogue(1)
+
+    request = Fake_Request(
+        Jwt_Token.create_access_token({"sub": user_id})
+    )
+
+    counter = _setup.count_statements(engine.sync_engine, DB_LATENCY_MS)
+
+    before = await measure(legacy_current_user, request, counter)
+    after = await measure(get_current_user, request, counter)
+
+    _setup.print_table(
+        f"get_current_user, {DB_LATENCY_MS} ms per round trip",
+        [
+            ("before", f"{before[0]:.2f} statements/request  {before[1]:.3f} ms"),
+            ("after", f"{after[0]:.2f} statements/request  {after[1]:.3f} ms"),
+        ],
+    )
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,114 @@
+"""Round trips of saving a new free event with its creator's booking.
+
+"before" is how create_event used to save them: the event in its own commit,
+then register_attendee with its profile check, seat reservation and booking
+insert in a second one. "after" is the profile check followed by the event and
+the booking in one unit_of_work. Statements and COMMITs each pay a fake
+DB_LATENCY_MS round trip. The category and location lookups, which did not
+change, are left out.
+"""
+
+import asyncio
+import time
+from datetime import datetime, timedelta
+
+from benchmarks import _setup
+
+from sqlalchemy import event
+
+from database import engine, unit_of_work
+from modules.events import validator
+from modules.events.models import events_dao
+from modules.events.service import bookings_service
+from utils.ids import new_id
+
+ITERATIONS = 200
+DB_LATENCY_MS = 1
+
+
+def event_row(creator_id):
+    now = datetime.now()
+
+    return {
+        "event_id": new_id(),
+        "event_name": "Benchmark event",
+        "event_description": "An event created by the benchmark",
+        "event_image_url": "https://example.com/event.png",
+        "event_agenda": "Talks",
+        "event_start_date_time": now + timedelta(days=1),
+        "event_end_date_time": now + timedelta(days=2),
+        "ticket_type": "FREE",
+        "ticket_fare": 0,
+        "total_tickets": 100,
+        "participant_type": "INDIVIDUAL",
+        "participant_count": 1,
+        "category_id": 1,
+        "address_id": 1,
+        "creator_id": creator_id,
+    }
+
+
+async def create_before(creator_id):
+    new_event = await events_dao.create_record(event_row(creator_id))
+
+    await bookings_service.register_attendee(new_event["event_id"], creator_id)
+
+
+async def create_after(creator_id):
+    await validator.participant_validator.check_profile_exists(creator_id)
+
+    async with unit_of_work():
+        new_event = await events_dao.create_record(
+            {**event_row(creator_id), "tickets_sold": 1}
+        )
+
+        await bookings_service.add_creator_booking(new_event["event_id"], creator_id)
+
+
+def count_round_trips():
+    counter = _setup.count_statements(engine.sync_engine, DB_LATENCY_MS)
+
+    @event.listens_for(engine.sync_engine, "commit")
+    def _count_commit(conn):
+        counter["statements"] += 1
+
+        time.sleep(DB_LATENCY_MS / 1000)
+
+    return counter
+
+
+async def measure(create, creator_id, counter):
+    counter["statements"] = 0
+    started = time.perf_counter()
+
+    for _ in range(ITERATIONS):
+        async with _setup.request_scope():
+            await create(creator_id)
+
+    elapsed = time.perf_counter() - started
+
+    return (
+        f"{counter['statements'] / ITERATIONS:4.1f} round trips  "
+        f"{elapsed / ITERATIONS * 1000:6.2f} ms"
+    )
+
+
+async def main():
+    await _setup.create_tables()
+    creator_id, _ = await _setup.seed_catalogue(1)
+
+    counter = count_round_trips()
+
+    _setup.print_table(
+        f"Free event plus creator booking, {DB_LATENCY_MS} ms per round trip",
+        [
+            ("before", await measure(create_before, creator_id, counter)),
+            ("after", await measure(create_after, creator_id, counter)),
+        ],
+    )
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
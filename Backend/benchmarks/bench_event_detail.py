@@ -0,0 +1,73 @@
+"""Round trips and latency of GET /events/{event_id}.
+
+"before" replays the lookups the endpoint used to make one after another (the
+auth check, the event fetch, the caller's booking lookup and the booking
+count). "after" is the auth check plus the single query behind
+Events_Class.get_event_by_id. Each statement pays a fake DB_LATENCY_MS round trip.
+"""
+
+import asyncio
+import time
+
+from benchmarks import _setup
+
+from database import engine
+from modules.events.service import bookings_service, events_service
+from modules.events.models import bookings_dao, events_dao
+from modules.users.validator import general_user_validation
+
+ITERATIONS = 200
+BOOKINGS = 500
+DB_LATENCY_MS = 1
+
+
+async def legacy_event_detail(event_id, user_id):
+    await general_user_validation.validate_user_exists(user_id)
+
+    await events_dao.fetch_record("event_id", event_id)
+
+    await bookings_service.get_attendee_booking_status(event_id, user_id)
+    await bookings_dao.get_event_bookings_count(event_id)
+
+
+async def event_detail(event_id, user_id):
+    await general_user_validation.validate_user_exists(user_id)
+    await events_service.get_event_by_id(event_id, user_id)
+
+
+async def measure(handler, event_id, user_id, counter):
+    counter["statements"] = 0
+    started = time.perf_counter()
+
+    for _ in range(ITERATIONS):
+        async with _setup.request_scope():
+            await handler(event_id, user_id)
+
+    elapsed = time.perf_counter() - started
+
+    return counter["statements"] / ITERATIONS, elapsed / ITERATIONS * 1000
+
+
+async def main():
+    await _setup.create_tables()
+    user_id, (event_id,) = await _setup.seed_catalogue(1, BOOKINGS)
+
+    counter = _setup.count_statements(engine.sync_engine, DB_LATENCY_MS)
+
+    before = await measure(legacy_event_detail, event_id, user_id, counter)
+    after = await measure(event_detail, event_id, user_id, counter)
+
+    _setup.print_table(
+        f"GET /events/{{event_id}} with {BOOKINGS} bookings, "
+        f"{DB_LATENCY_MS} ms per round trip",
+        [
+            ("before", f"{before[0]:.1f} statements/request  {before[1]:.2f} ms"),
+            ("after", f"{after[0]:.1f} statements/request  {after[1]:.2f} ms"),
+        ],
+    )
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,98 @@
+"""Peak memory of answering with the attendee list of a large event.
+
+"before" is GET /events/{event_id}/bookings: every booking is loaded, converted
+and encoded as one JSON document. "after" is the streamed CSV and JSON Lines
+export, whose chunks are consumed as they are produced, like a client download.
+Peak memory is the tracemalloc peak of the Python heap while answering.
+"""
+
+import asyncio
+import time
+import tracemalloc
+
+from benchmarks import _setup
+
+from database import engine
+from modules.events.controller import event_bookings_adapter
+from modules.events.service import bookings_service
+from shared.generic_enum import Export_Format_Enum
+from shared.streaming_export import export_response
+
+ATTENDEE_COUNTS = [10_000, 50_000]
+
+
+async def before(event_id, creator_id):
+    async with _setup.request_scope():
+        event_bookings = await bookings_service.get_event_booking_data(
+            event_id=event_id, creator_id=creator_id
+        )
+
+        return len(event_bookings_adapter.dump_json(event_bookings))
+
+
+async def after(event_id, creator_id, export_format):
+    async with _setup.request_scope():
+        booking_batches = await bookings_service.export_event_bookings(
+            event_id=event_id, creator_id=creator_id
+        )
+
+    response = export_response(
+        export_format,
+        bookings_service.BOOKING_EXPORT_COLUMNS,
+        booking_batches,
+        filename="bench",
+    )
+
+    sent_bytes = 0
+
+    async for chunk in response.body_iterator:
+        sent_bytes += len(chunk)
+
+    return sent_bytes
+
+
+async def measure(call):
+    tracemalloc.start()
+    started = time.perf_counter()
+
+    sent_bytes = await call()
+
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return (
+        f"peak {peak / 1024 / 1024:6.1f} MiB  {elapsed * 1000:6.0f} ms  "
+        f"{sent_bytes / 1024 / 1024:.1f} MiB sent"
+    )
+
+
+async def main():
+    for attendee_count in ATTENDEE_COUNTS:
+        await _setup.create_tables()
+        creator_id, (event_id,) = await _setup.seed_catalogue(1, attendee_count)
+
+        _setup.print_table(
+            f"Attendee list of {attendee_count} bookings",
+            [
+                ("before (JSON)", await measure(lambda: before(event_id, creator_id))),
+                (
+                    "after (CSV)",
+                    await measure(
+                        lambda: after(event_id, creator_id, Export_Format_Enum.CSV)
+                    ),
+                ),
+                (
+                    "after (JSONL)",
+                    await measure(
+                        lambda: after(event_id, creator_id, Export_Format_Enum.JSONL)
+                    ),
+                ),
+            ],
+        )
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
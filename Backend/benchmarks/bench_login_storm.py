@@ -0,0 +1,128 @@
+"""Latency of an unrelated endpoint while a burst of sign ins is being hashed.
+
+"before" verifies the password the way signin used to, with bcrypt called
+straight from the async handler. "after" awaits Hashing.verify_hash_data, which
+runs bcrypt on its thread pool. A probe wants to call GET /ping every 5 ms
+during the storm and records how late each answer is against its schedule, with
+the pings skipped while the loop was blocked counted as waiting too. Requests are
+sent straight into the ASGI app. Cost is BCRYPT_ROUNDS.
+"""
+
+import asyncio
+import time
+
+from benchmarks import _setup
+
+from fastapi import FastAPI
+
+from core.auth import Hashing
+from settings import settings
+
+LOGINS = 16
+PROBE_INTERVAL_SECONDS = 0.005
+PASSWORD = "benchmark-password"
+
+
+def build_app(hashed_password: str):
+    app = FastAPI()
+
+    @app.get("/ping")
+    async def ping():
+        return {"message": "pong"}
+
+    @app.post("/signin/before")
+    async def signin_before():
+        return {"ok": Hashing.pwd_context.verify(PASSWORD, hashed_password)}
+
+    @app.post("/signin/after")
+    async def signin_after():
+        return {"ok": await Hashing.verify_hash_data(PASSWORD, hashed_password)}
+
+    return app
+
+
+async def call(app, method: str, path: str):
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"host", b"bench")],
+        "client": ("127.0.0.1", 1234),
+        "server": ("bench", 80),
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    await app(scope, receive, send)
+
+
+async def storm(app, signin_path: str):
+    latencies = []
+    storm_done = asyncio.Event()
+
+    async def probe():
+        while not storm_done.is_set():
+            due = time.perf_counter() + PROBE_INTERVAL_SECONDS
+
+            await asyncio.sleep(PROBE_INTERVAL_SECONDS)
+            await call(app, "GET", "/ping")
+
+            latency = time.perf_counter() - due
+
+            # The pings which were due while this one waited
+            while latency > 0:
+                latencies.append(latency)
+                latency -= PROBE_INTERVAL_SECONDS
+
+    async def logins():
+        # Lets the probe send its first request before the storm starts
+        await asyncio.sleep(PROBE_INTERVAL_SECONDS)
+
+        await asyncio.gather(
+            *(call(app, "POST", signin_path) for _ in range(LOGINS))
+        )
+
+        storm_done.set()
+
+    started = time.perf_counter()
+    await asyncio.gather(probe(), logins())
+
+    return latencies, time.perf_counter() - started
+
+
+async def main():
+    app = build_app(Hashing.pwd_context.hash(PASSWORD))
+
+    before, before_wall = await storm(app, "/signin/before")
+    after, after_wall = await storm(app, "/signin/after")
+
+    def row(latencies, wall):
+        return (
+            f"ping p50 {_setup.percentile(latencies, 50) * 1000:.1f} ms  "
+            f"p99 {_setup.percentile(latencies, 99) * 1000:.1f} ms  "
+            f"max {max(latencies) * 1000:.1f} ms  "
+            f"(storm {wall:.2f} s)"
+        )
+
+    _setup.print_table(
+        f"{LOGINS} concurrent sign ins, bcrypt cost {settings.BCRYPT_ROUNDS}, "
+        f"{settings.PASSWORD_HASH_WORKERS} hashing workers",
+        [
+            ("before", row(before, before_wall)),
+            ("after", row(after, after_wall)),
+        ],
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,116 @@
+"""Per-request overhead of the middleware stack, without any network or database.
+
+Requests are sent straight into the ASGI app, so the numbers are the cost of
+routing plus the middleware itself. "BaseHTTPMiddleware" is the Entry_Middleware
+main.py used to have, "pure ASGI" is Request_Metrics_Middleware plus the
+SQLAlchemyError exception handler which replaced it.
+"""
+
+import asyncio
+import time
+
+from benchmarks import _setup
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+from sqlalchemy.exc import SQLAlchemyError
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from middlewares.request_metrics import Request_Metrics_Middleware
+from shared import response_schema
+from shared.generic_error_handling import Generic_Error_Handling
+
+ITERATIONS = 20_000
+
+
+class Legacy_Entry_Middleware(BaseHTTPMiddleware):
+    async def dispatch(self, request, call_next):
+        try:
+            return await call_next(request)
+
+        except SQLAlchemyError as e:
+            error_details = Generic_Error_Handling.db_exception_handling(e)
+
+            return JSONResponse(
+                status_code=500,
+                content=response_schema.Error_Response_Schema(
+                    details=error_details
+                ).model_dump(),
+            )
+
+
+async def db_exception_handler(request: Request, e: SQLAlchemyError):
+    return JSONResponse(
+        status_code=500,
+        content=response_schema.Error_Response_Schema(
+            details=Generic_Error_Handling.db_exception_handling(e)
+        ).model_dump(),
+    )
+
+
+def build_app(middleware=None, exception_handler=False):
+    app = FastAPI()
+
+    @app.get("/ping")
+    async def ping():
+        return {"message": "pong"}
+
+    if middleware:
+        app.add_middleware(middleware)
+
+    if exception_handler:
+        app.add_exception_handler(SQLAlchemyError, db_exception_handler)
+
+    return app
+
+
+async def measure(app):
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/ping",
+        "raw_path": b"/ping",
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"host", b"bench")],
+        "client": ("127.0.0.1", 1234),
+        "server": ("bench", 80),
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    for _ in range(500):  # warm up routing and the middleware stack build
+        await app(dict(scope), receive, send)
+
+    started = time.perf_counter()
+
+    for _ in range(ITERATIONS):
+        await app(dict(scope), receive, send)
+
+    return (time.perf_counter() - started) / ITERATIONS * 1_000_000
+
+
+async def main():
+    bare = await measure(build_app())
+    legacy = await measure(build_app(Legacy_Entry_Middleware))
+    pure = await measure(build_app(Request_Metrics_Middleware, exception_handler=True))
+
+    _setup.print_table(
+        f"Raw ASGI request overhead over {ITERATIONS} requests",
+        [
+            ("no middleware", f"{bare:.1f} us/request"),
+            ("BaseHTTPMiddleware", f"{legacy:.1f} us/request  ({legacy - bare:+.1f} us)"),
+            ("pure ASGI", f"{pure:.1f} us/request  ({pure - bare:+.1f} us)"),
+        ],
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
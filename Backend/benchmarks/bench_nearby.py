@@ -0,0 +1,179 @@
+"""Radius search over 1M event locations.
+
+"scan" is what a nearby query needs without a spatial index: read every
+location and compute its distance. "geohash" is the lookup behind
+GET /events/nearby: range scans over the indexed geohash column for the few
+cells covering the circle, then exact haversine filtering of those rows only.
+"""
+
+import asyncio
+import random
+import time
+
+from benchmarks import _setup
+
+from sqlalchemy import and_, insert, or_, select
+
+from database import SessionLocal, engine
+from modules.events.models import Event_Location_Model
+from utils import geohash
+
+LOCATION_COUNT = 1_000_000
+QUERY_COUNT = 50
+SEED = 11
+
+# Locations cluster around cities, with a thin spread over the whole country
+CITIES = [
+    (13.08, 80.27),
+    (12.97, 77.59),
+    (19.08, 72.88),
+    (28.61, 77.21),
+    (22.57, 88.36),
+    (17.39, 78.49),
+    (18.52, 73.86),
+    (11.02, 76.96),
+]
+
+
+def synthetic_locations(rng: random.Random):
+    for location_id in range(1, LOCATION_COUNT + 1):
+        if rng.random() < 0.9:
+            city_latitude, city_longitude = rng.choice(CITIES)
+            latitude = rng.gauss(city_latitude, 0.15)
+            longitude = rng.gauss(city_longitude, 0.15)
+        else:
+            latitude = rng.uniform(8, 32)
+            longitude = rng.uniform(70, 90)
+
+        yield {
+            "location_id": location_id,
+            "full_location": f"{location_id} Bench Street",
+            "latitude": latitude,
+            "longitude": longitude,
+            "geohash": geohash.encode(latitude, longitude),
+        }
+
+
+def nearest(latitude, longitude, radius_km, rows):
+    if not rows:
+        return []
+
+    location_ids, latitudes, longitudes = zip(*rows)
+    distances = geohash.haversine_km(latitude, longitude, latitudes, longitudes)
+    order = distances.argsort()
+
+    return [location_ids[i] for i in order if distances[i] <= radius_km][:20]
+
+
+async def scan(latitude, longitude, radius_km):
+    async with SessionLocal() as db:
+        rows = (
+            await db.execute(
+                select(
+                    Event_Location_Model.location_id,
+                    Event_Location_Model.latitude,
+                    Event_Location_Model.longitude,
+                )
+            )
+        ).all()
+
+    return nearest(latitude, longitude, radius_km, rows)
+
+
+async def geohash_lookup(latitude, longitude, radius_km):
+    cells = geohash.covering_cells(latitude, longitude, radius_km)
+
+    async with SessionLocal() as db:
+        rows = (
+            await db.execute(
+                select(
+                    Event_Location_Model.location_id,
+                    Event_Location_Model.latitude,
+                    Event_Location_Model.longitude,
+                ).where(
+                    or_(
+                        *(
+                            and_(
+                                Event_Location_Model.geohash >= cell,
+                                Event_Location_Model.geohash < cell + "~",
+                            )
+                            for cell in cells
+                        )
+                    )
+                )
+            )
+        ).all()
+
+    return nearest(latitude, longitude, radius_km, rows)
+
+
+async def timed(handler, queries):
+    latencies = []
+    results = []
+
+    for query in queries:
+        started = time.perf_counter()
+        results.append(await handler(*query))
+        latencies.append(time.perf_counter() - started)
+
+    return latencies, results
+
+
+async def main():
+    rng = random.Random(SEED)
+
+    await _setup.create_tables()
+
+    started = time.perf_counter()
+    locations = list(synthetic_locations(rng))
+
+    async with SessionLocal() as db:
+        for start in range(0, LOCATION_COUNT, 50_000):
+            await db.execute(
+                insert(Event_Location_Model), locations[start : start + 50_000]
+            )
+
+        await db.commit()
+
+    seed_seconds = time.perf_counter() - started
+
+    queries = []
+
+    for _ in range(QUERY_COUNT):
+        city_latitude, city_longitude = rng.choice(CITIES)
+        queries.append(
+            (
+                rng.gauss(city_latitude, 0.1),
+                rng.gauss(city_longitude, 0.1),
+                rng.choice([1, 2, 5, 10]),
+            )
+        )
+
+    geohash_latencies, geohash_results = await timed(geohash_lookup, queries)
+    scan_latencies, scan_results = await timed(scan, queries[:5])
+
+    # Both paths must agree on the nearest locations
+    assert geohash_results[:5] == scan_results
+
+    await engine.dispose()
+
+    _setup.print_table(
+        f"Radius search over {LOCATION_COUNT} locations",
+        [
+            ("seed", f"{seed_seconds:.1f} s"),
+            (
+                "geohash index",
+                f"p50 {_setup.percentile(geohash_latencies, 50) * 1000:.2f} ms  "
+                f"p99 {_setup.percentile(geohash_latencies, 99) * 1000:.2f} ms",
+            ),
+            (
+                "full scan",
+                f"p50 {_setup.percentile(scan_latencies, 50) * 1000:.2f} ms  "
+                f"p99 {_setup.percentile(scan_latencies, 99) * 1000:.2f} ms",
+            ),
+        ],
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,70 @@
+"""Round trips of reading many records by id within one request.
+
+"fetch_record" reads every record with its own SELECT. "load_many" reads the
+same records with one IN (...) query. Each statement pays a fake DB_LATENCY_MS
+round trip.
+"""
+
+import asyncio
+import time
+
+from benchmarks import _setup
+
+from database import engine
+from modules.events.models import events_dao
+
+ITERATIONS = 50
+EVENT_COUNT = 100
+DB_LATENCY_MS = 1
+
+
+async def events_one_by_one(event_ids, creator_id):
+    for event_id in event_ids:
+        await events_dao.fetch_record("event_id", event_id)
+
+
+async def events_load_many(event_ids, creator_id):
+    await events_dao.load_many("event_id", event_ids)
+
+
+async def measure(handler, event_ids, creator_id, counter):
+    counter["statements"] = 0
+    started = time.perf_counter()
+
+    for _ in range(ITERATIONS):
+        async with _setup.request_scope():
+            await handler(event_ids, creator_id)
+
+    elapsed = time.perf_counter() - started
+
+    return (
+        f"{counter['statements'] / ITERATIONS:5.1f} statements  "
+        f"{elapsed / ITERATIONS * 1000:7.2f} ms"
+    )
+
+
+async def main():
+    await _setup.create_tables()
+    creator_id, event_ids = await _setup.seed_catalogue(EVENT_COUNT)
+
+    counter = _setup.count_statements(engine.sync_engine, DB_LATENCY_MS)
+
+    _setup.print_table(
+        f"{EVENT_COUNT} event lookups per request, {DB_LATENCY_MS} ms per round trip",
+        [
+            (
+                "fetch_record",
+                await measure(events_one_by_one, event_ids, creator_id, counter),
+            ),
+            (
+                "load_many",
+                await measure(events_load_many, event_ids, creator_id, counter),
+            ),
+        ],
+    )
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
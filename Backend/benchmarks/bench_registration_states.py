@@ -0,0 +1,71 @@
+"""Cost of showing the caller's registration on every card of an events page.
+
+"before" is what the frontend had to do: one GET /events/{event_id} per card,
+measured as the event detail each of them runs. "after" is the single
+registration state query GET /events?include_registration=true adds to the
+cached page. Each statement pays a fake DB_LATENCY_MS round trip.
+"""
+
+import asyncio
+import time
+
+from benchmarks import _setup
+
+from database import engine
+from modules.events.service import bookings_service, events_service
+from modules.users.validator import general_user_validation
+
+ITERATIONS = 50
+PAGE_SIZE = 20
+DB_LATENCY_MS = 1
+
+
+async def per_card_details(event_ids, user_id):
+    for event_id in event_ids:
+        await general_user_validation.validate_user_exists(user_id)
+        await events_service.get_event_by_id(event_id, user_id)
+
+
+async def batched_states(event_ids, user_id):
+    await bookings_service.add_registration_states(
+        [{"event_id": event_id} for event_id in event_ids],
+        user_id,
+    )
+
+
+async def measure(handler, event_ids, user_id, counter):
+    counter["statements"] = 0
+    started = time.perf_counter()
+
+    for _ in range(ITERATIONS):
+        async with _setup.request_scope():
+            await handler(event_ids, user_id)
+
+    elapsed = time.perf_counter() - started
+
+    return (
+        f"{counter['statements'] / ITERATIONS:5.1f} statements  "
+        f"{elapsed / ITERATIONS * 1000:7.2f} ms"
+    )
+
+
+async def main():
+    await _setup.create_tables()
+    user_id, event_ids = await _setup.seed_catalogue(PAGE_SIZE, 10)
+
+    counter = _setup.count_statements(engine.sync_engine, DB_LATENCY_MS)
+
+    _setup.print_table(
+        f"Registration state of a {PAGE_SIZE} event page, "
+        f"{DB_LATENCY_MS} ms per round trip",
+        [
+            ("before", await measure(per_card_details, event_ids, user_id, counter)),
+            ("after", await measure(batched_states, event_ids, user_id, counter)),
+        ],
+    )
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,88 @@
+"""Time and memory of reading 10k events through Base_Dao.
+
+"before" loads ORM instances and keeps their __dict__, the way every Base_Dao
+read used to. The others are Core selects of every column, as dicts, and of the
+three columns a listing needs, as dicts, Slots_Rows and tuples. "peak" is the
+tracemalloc peak while reading, "kept" what the returned rows still hold.
+"""
+
+import asyncio
+import time
+import tracemalloc
+
+from benchmarks import _setup
+
+from sqlalchemy import select
+
+from database import engine
+from modules.events.models import events_dao
+from shared.generic_enum import Row_Format_Enum
+
+EVENT_COUNT = 10_000
+ITERATIONS = 5
+LISTING_FIELDS = ["event_id", "event_name", "event_start_date_time"]
+
+
+async def orm_dicts():
+    async with events_dao.session() as db:
+        records = (await db.execute(select(events_dao.model))).scalars().all()
+
+        return [record.__dict__ for record in records]
+
+
+def core_rows(fields=None, row_format=Row_Format_Enum.DICT):
+    return lambda: events_dao.fetch_records_from_model(fields, row_format)
+
+
+async def measure(read):
+    started = time.perf_counter()
+
+    for _ in range(ITERATIONS):
+        async with _setup.request_scope():
+            await read()
+
+    elapsed = (time.perf_counter() - started) / ITERATIONS
+
+    tracemalloc.start()
+
+    async with _setup.request_scope():
+        rows = await read()
+
+    kept, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    assert len(rows) == EVENT_COUNT
+    del rows
+
+    return (
+        f"{elapsed * 1000:6.0f} ms  peak {peak / 1024 / 1024:6.1f} MiB  "
+        f"kept {kept / 1024 / 1024:6.1f} MiB"
+    )
+
+
+async def main():
+    await _setup.create_tables()
+    await _setup.seed_catalogue(EVENT_COUNT)
+
+    _setup.print_table(
+        f"{EVENT_COUNT} events per read",
+        [
+            ("before (ORM __dict__)", await measure(orm_dicts)),
+            ("all columns, dicts", await measure(core_rows())),
+            ("3 columns, dicts", await measure(core_rows(LISTING_FIELDS))),
+            (
+                "3 columns, Slots_Rows",
+                await measure(core_rows(LISTING_FIELDS, Row_Format_Enum.SLOTS)),
+            ),
+            (
+                "3 columns, tuples",
+                await measure(core_rows(LISTING_FIELDS, Row_Format_Enum.TUPLE)),
+            ),
+        ],
+    )
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
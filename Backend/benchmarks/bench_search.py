@@ -0,0 +1,108 @@
+"""Event text search over 100k synthetic events.
+
+Compares the inverted index behind GET /events/search with the only option the
+API had before: pulling every event and scanning its text.
+"""
+
+import random
+import string
+import time
+
+from benchmarks import _setup
+
+from modules.events.search_index import Inverted_Index
+
+EVENT_COUNT = 100_000
+VOCABULARY_SIZE = 20_000
+QUERY_COUNT = 200
+SEED = 7
+
+
+def build_vocabulary(rng: random.Random, size: int):
+    """Random words with Zipf-like frequencies, as in real event text."""
+    words = set()
+
+    while len(words) < size:
+        words.add("".join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 10))))
+
+    words = sorted(words, key=lambda _: rng.random())
+    weights = [1 / rank for rank in range(1, size + 1)]
+
+    return words, weights
+
+
+def synthetic_event(rng: random.Random, words: list, weights: list):
+    return {
+        "event_name": " ".join(rng.choices(words, weights, k=4)),
+        "event_description": " ".join(rng.choices(words, weights, k=40)),
+        "event_agenda": " ".join(rng.choices(words, weights, k=80)),
+    }
+
+
+def linear_scan(events: list, query: str, limit: int = 20):
+    words = query.lower().split()
+    matches = []
+
+    for event_id, event in enumerate(events):
+        text = " ".join(event.values()).lower()
+
+        if all(word in text for word in words):
+            matches.append(event_id)
+
+    return matches[:limit]
+
+
+def main():
+    rng = random.Random(SEED)
+    words, weights = build_vocabulary(rng, VOCABULARY_SIZE)
+    events = [synthetic_event(rng, words, weights) for _ in range(EVENT_COUNT)]
+
+    # Queries mix common and rare words, the last one often cut short as if typed
+    queries = [
+        " ".join(rng.choices(words[:2000], k=rng.randint(1, 2)))[: rng.randint(3, 14)]
+        for _ in range(QUERY_COUNT)
+    ]
+
+    started = time.perf_counter()
+
+    index = Inverted_Index()
+    index.add_documents(enumerate(events))
+
+    build_seconds = time.perf_counter() - started
+
+    index.search("warm up")  # builds the sorted term list and length norms
+
+    index_latencies = []
+
+    for query in queries:
+        started = time.perf_counter()
+        index.search(query, limit=20)
+        index_latencies.append(time.perf_counter() - started)
+
+    scan_latencies = []
+
+    for query in queries[:10]:
+        started = time.perf_counter()
+        linear_scan(events, query)
+        scan_latencies.append(time.perf_counter() - started)
+
+    _setup.print_table(
+        f"Search over {EVENT_COUNT} events",
+        [
+            ("index build", f"{build_seconds:.2f} s"),
+            (
+                "inverted index",
+                f"p50 {_setup.percentile(index_latencies, 50) * 1000:.2f} ms  "
+                f"p99 {_setup.percentile(index_latencies, 99) * 1000:.2f} ms",
+            ),
+            (
+                "linear scan",
+                f"p50 {_setup.percentile(scan_latencies, 50) * 1000:.2f} ms  "
+                f"p99 {_setup.percentile(scan_latencies, 99) * 1000:.2f} ms",
+            ),
+        ],
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""Serialization of a 10k event list response.
+
+"before" is how the list endpoints used to answer: one Event_Base_Response_Schema
+per row, then FastAPI's response_model pass and the stdlib JSON encoder. "after"
+returns the rows through Typed_JSON_Response, validated once and encoded by
+pydantic-core. Both routes are driven straight through ASGI.
+"""
+
+import asyncio
+import json
+import time
+from datetime import datetime, timedelta
+from decimal import Decimal
+from typing import List
+from uuid import uuid4
+
+from benchmarks import _setup
+
+from fastapi import FastAPI
+from pydantic import TypeAdapter
+
+from modules.events import schema
+from shared.json_response import Typed_JSON_Response
+
+EVENT_COUNT = 10_000
+ITERATIONS = 20
+
+
+def synthetic_rows():
+    now = datetime.now()
+
+    return [
+        {
+            "event_id": str(uuid4()),
+            "event_name": f"Benchmark event {index}",
+            "event_description": "An event seeded for benchmarking serialization",
+            "event_image_url": "https://example.com/event.png",
+            "event_agenda": "Talks, food and music",
+            "event_start_date_time": now + timedelta(days=1, minutes=index),
+            "event_end_date_time": now + timedelta(days=2, minutes=index),
+            "category_name": "Music",
+            "ticket_fare": Decimal("120.00"),
+            "ticket_type": "paid",
+            "total_tickets": 100,
+            "full_location": f"{index} Bench Street Chennai Tamil Nadu India",
+            "latitude": 13.08,
+            "longitude": 80.27,
+        }
+        for index in range(EVENT_COUNT)
+    ]
+
+
+def build_app(rows):
+    app = FastAPI()
+    events_adapter = TypeAdapter(List[schema.Event_Base_Response_Schema])
+
+    @app.get("/before", response_model=List[schema.Event_Base_Response_Schema])
+    async def before():
+        return [schema.Event_Base_Response_Schema(**row) for row in rows]
+
+    @app.get("/after", response_model=List[schema.Event_Base_Response_Schema])
+    async def after():
+        return Typed_JSON_Response(rows, events_adapter)
+
+    return app
+
+
+async def measure(app, path: str):
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"host", b"bench")],
+        "client": ("127.0.0.1", 1234),
+        "server": ("bench", 80),
+    }
+    body = bytearray()
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.body":
+            body.extend(message.get("body", b""))
+
+    latencies = []
+
+    for _ in range(ITERATIONS):
+        body.clear()
+        started = time.perf_counter()
+        await app(dict(scope), receive, send)
+        latencies.append(time.perf_counter() - started)
+
+    return latencies, json.loads(body)
+
+
+async def main():
+    app = build_app(synthetic_rows())
+
+    before, before_body = await measure(app, "/before")
+    after, after_body = await measure(app, "/after")
+
+    # Both paths must produce the same document
+    assert before_body == after_body
+
+    _setup.print_table(
+        f"List response of {EVENT_COUNT} events",
+        [
+            ("before", f"p50 {_setup.percentile(before, 50) * 1000:.1f} ms"),
+            ("after", f"p50 {_setup.percentile(after, 50) * 1000:.1f} ms"),
+        ],
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,146 @@
+"""Cost of serving and pre-generating booking tickets.
+
+"render per request" is what serving a ticket would cost without the disk cache:
+a QR render for every GET. "cached" is Ticket_Renderer.get_image once the image
+is on disk. Pre-generation compares rendering an event's tickets one after the
+other on the event loop's process with the process pool batches, and reports
+the longest the event loop went without running other requests.
+"""
+
+import asyncio
+import os
+import time
+
+from benchmarks import _setup
+
+from settings import settings
+from shared import generic_enum
+from shared.disk_cache import Disk_LRU_Cache
+from utils import qr_code
+from utils.ids import new_id
+
+REQUESTS = 500
+EVENT_BOOKINGS = 500
+TICK_SECONDS = 0.005
+IMAGE_FORMAT = generic_enum.Ticket_Format_Enum.PNG
+
+
+def new_renderer(name: str):
+    return qr_code.Ticket_Renderer(
+        Disk_LRU_Cache(os.path.join(_setup.BENCH_DIR, name), 1024 * 1024 * 1024),
+        max_workers=settings.TICKET_RENDER_WORKERS,
+        batch_size=settings.TICKET_RENDER_BATCH_SIZE,
+        scale=settings.TICKET_QR_SCALE,
+    )
+
+
+def ticket_payloads(count: int):
+    event_id = new_id()
+
+    return [qr_code.sign_ticket(new_id(), event_id) for _ in range(count)]
+
+
+async def serve_tickets():
+    renderer = new_renderer("served")
+    payload = ticket_payloads(1)[0]
+
+    started = time.perf_counter()
+
+    for _ in range(REQUESTS):
+        qr_code.render_qr(payload, IMAGE_FORMAT, settings.TICKET_QR_SCALE)
+
+    uncached = (time.perf_counter() - started) / REQUESTS
+
+    # The first call renders and starts the pool
+    await renderer.get_image(payload, IMAGE_FORMAT)
+
+    started = time.perf_counter()
+
+    for _ in range(REQUESTS):
+        await renderer.get_image(payload, IMAGE_FORMAT)
+
+    cached = (time.perf_counter() - started) / REQUESTS
+
+    await renderer.aclose()
+
+    return [
+        ("render per request", f"{uncached * 1000:8.3f} ms/request"),
+        ("cached", f"{cached * 1000:8.3f} ms/request"),
+    ]
+
+
+async def longest_stall(work):
+    """Runs work while a ticker measures the event loop's longest delay."""
+    stalls = [0.0]
+    running = True
+
+    async def ticker():
+        while running:
+            expected = time.perf_counter() + TICK_SECONDS
+
+            await asyncio.sleep(TICK_SECONDS)
+
+            stalls.append(time.perf_counter() - expected)
+
+    ticker_task = asyncio.create_task(ticker())
+
+    await asyncio.sleep(0)
+
+    started = time.perf_counter()
+
+    await work()
+
+    elapsed = time.perf_counter() - started
+    running = False
+
+    await ticker_task
+
+    return elapsed, max(stalls)
+
+
+async def pregenerate_tickets():
+    payloads = ticket_payloads(EVENT_BOOKINGS)
+
+    async def render_in_process():
+        for payload in payloads:
+            qr_code.render_qr(payload, IMAGE_FORMAT, settings.TICKET_QR_SCALE)
+
+    in_process, in_process_stall = await longest_stall(render_in_process)
+
+    renderer = new_renderer("pregenerated")
+
+    # Workers are started before timing, as they are in a running app
+    await renderer.get_image(ticket_payloads(1)[0], IMAGE_FORMAT)
+
+    pooled, pooled_stall = await longest_stall(
+        lambda: renderer.pregenerate(payloads, IMAGE_FORMAT)
+    )
+
+    started = time.perf_counter()
+
+    rendered_again = await renderer.pregenerate(payloads, IMAGE_FORMAT)
+
+    repeated = time.perf_counter() - started
+
+    await renderer.aclose()
+
+    return [
+        (
+            f"{EVENT_BOOKINGS} tickets, in process",
+            f"{in_process:6.2f} s  loop stalled {in_process_stall * 1000:8.1f} ms",
+        ),
+        (
+            f"{EVENT_BOOKINGS} tickets, {settings.TICKET_RENDER_WORKERS} processes",
+            f"{pooled:6.2f} s  loop stalled {pooled_stall * 1000:8.1f} ms",
+        ),
+        ("again, all cached", f"{repeated:6.2f} s  {rendered_again} rendered"),
+    ]
+
+
+async def main():
+    _setup.print_table("GET /events/bookings/{booking_id}/ticket", await serve_tickets())
+    _setup.print_table("Ticket pre-generation", await pregenerate_tickets())
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
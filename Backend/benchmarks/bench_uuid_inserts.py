@@ -0,0 +1,89 @@
+"""Insert throughput of random (uuid4) against time ordered (uuid7) primary keys.
+
+Both runs bulk insert ROW_COUNT rows, BATCH_SIZE per transaction, into a
+WITHOUT ROWID table keyed by a Binary_UUID. Like an InnoDB primary key, its
+rows live in the key's B-tree. Random keys land on random leaf pages, so every
+batch reads and splits pages all over the tree, while time ordered keys only
+append to the right-most ones. The gap widens once the table outgrows the page
+cache, compare the first and the last batch.
+"""
+
+import os
+import time
+from itertools import count
+from uuid import uuid4
+
+from benchmarks import _setup
+
+from sqlalchemy import Column, MetaData, String, Table, create_engine, insert, text
+
+from shared.column_types import Binary_UUID
+from utils.ids import new_id
+
+ROW_COUNT = 200_000
+BATCH_SIZE = 1_000
+CACHE_PAGES = 2_000
+
+
+def build_table():
+    metadata = MetaData()
+
+    table = Table(
+        "uuid_keys",
+        metadata,
+        Column("id", Binary_UUID, primary_key=True),
+        Column("payload", String(40), nullable=False),
+        sqlite_with_rowid=False,
+    )
+
+    return metadata, table
+
+
+_run = count()
+
+
+def measure(make_id):
+    engine = create_engine(
+        f"sqlite:///{os.path.join(_setup.BENCH_DIR, f'ids_{next(_run)}.sqlite')}"
+    )
+    metadata, table = build_table()
+
+    metadata.create_all(engine)
+
+    batch_times = []
+
+    with engine.connect() as connection:
+        connection.execute(text(f"PRAGMA cache_size = {CACHE_PAGES}"))
+
+        for _ in range(ROW_COUNT // BATCH_SIZE):
+            rows = [{"id": make_id(), "payload": "x" * 40} for _ in range(BATCH_SIZE)]
+
+            started = time.perf_counter()
+
+            connection.execute(insert(table), rows)
+            connection.commit()
+
+            batch_times.append(time.perf_counter() - started)
+
+    engine.dispose()
+
+    return (
+        f"{ROW_COUNT / sum(batch_times):9,.0f} rows/s  "
+        f"first batch {batch_times[0] * 1000:6.2f} ms  "
+        f"last batch {batch_times[-1] * 1000:6.2f} ms"
+    )
+
+
+def main():
+    _setup.print_table(
+        f"{ROW_COUNT:,} inserts into a Binary_UUID primary key, "
+        f"{BATCH_SIZE:,} per commit",
+        [
+            ("uuid4", measure(lambda: str(uuid4()))),
+            ("uuid7", measure(new_id)),
+        ],
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""Round trips and latency of single record writes through Base_Dao.
+
+"before" replays how create_record (INSERT, COMMIT, refresh SELECT) and
+update_record (SELECT, UPDATE, COMMIT, refresh SELECT) used to write. "after" is
+the INSERT ... RETURNING and UPDATE ... RETURNING paths, then the same writes
+with RETURNING turned off, which is what MySQL gets. The image URL update
+compares update_record with update_where, which reads nothing back. Statements
+and COMMITs each pay a fake DB_LATENCY_MS round trip.
+"""
+
+import asyncio
+import time
+
+from benchmarks import _setup
+
+from sqlalchemy import event, select
+
+from database import engine
+from modules.events.models import location_dao
+
+ITERATIONS = 200
+DB_LATENCY_MS = 1
+
+
+async def create_before(index):
+    async with location_dao.session() as db:
+        location = location_dao.model(
+            full_location=f"{index} Before Street", latitude=13.0, longitude=80.2
+        )
+
+        db.add(location)
+
+        await db.commit()
+
+        await db.refresh(location)
+
+        return location.__dict__
+
+
+async def create_after(index):
+    return await location_dao.create_record(
+        {"full_location": f"{index} After Street", "latitude": 13.0, "longitude": 80.2}
+    )
+
+
+async def update_before(index):
+    async with location_dao.session() as db:
+        stmt = (
+            select(location_dao.model)
+            .filter(location_dao.model.location_id == 1)
+            .limit(1)
+        )
+
+        location = (await db.execute(stmt)).scalars().first()
+        location.latitude = 13.0 + index / 10_000
+
+        await db.commit()
+
+        await db.refresh(location)
+
+        return location.__dict__
+
+
+async def update_after(index):
+    return await location_dao.update_record(
+        {"latitude": 13.0 + index / 10_000}, "location_id", 1
+    )
+
+
+async def update_where(index):
+    return await location_dao.update_where(
+        {"latitude": 13.0 + index / 10_000}, {"location_id": 1}
+    )
+
+
+def count_round_trips():
+    counter = _setup.count_statements(engine.sync_engine, DB_LATENCY_MS)
+
+    @event.listens_for(engine.sync_engine, "commit")
+    def _count_commit(conn):
+        counter["statements"] += 1
+
+        time.sleep(DB_LATENCY_MS / 1000)
+
+    return counter
+
+
+async def measure(write, counter, offset):
+    counter["statements"] = 0
+    started = time.perf_counter()
+
+    for index in range(offset, offset + ITERATIONS):
+        async with _setup.request_scope():
+            await write(index)
+
+    elapsed = time.perf_counter() - started
+
+    return (
+        f"{counter['statements'] / ITERATIONS:4.1f} round trips  "
+        f"{elapsed / ITERATIONS * 1000:6.2f} ms"
+    )
+
+
+def set_returning(enabled: bool):
+    dialect = engine.sync_engine.dialect
+    dialect.insert_returning = dialect.update_returning = enabled
+
+
+async def main():
+    await _setup.create_tables()
+    await _setup.seed_catalogue(1)
+
+    counter = count_round_trips()
+    rows = []
+
+    rows.append(("create, before", await measure(create_before, counter, 0)))
+    rows.append(("create, RETURNING", await measure(create_after, counter, 1000)))
+
+    set_returning(False)
+    rows.append(("create, no RETURNING", await measure(create_after, counter, 2000)))
+    set_returning(True)
+
+    rows.append(("update, before", await measure(update_before, counter, 0)))
+    rows.append(("update, RETURNING", await measure(update_after, counter, 0)))
+
+    set_returning(False)
+    rows.append(("update, no RETURNING", await measure(update_after, counter, 0)))
+    set_returning(True)
+
+    rows.append(("update_where", await measure(update_where, counter, 0)))
+
+    _setup.print_table(
+        f"Single record writes, {DB_LATENCY_MS} ms per round trip", rows
+    )
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,129 @@
+"""Load test for the registration pipeline behind POST /events/register.
+
+Fires ATTENDEES concurrent registrations (plus DUPLICATES repeated requests from
+attendees who already registered) at one event with TICKETS seats, then checks
+that the event was not oversold, that nobody holds two bookings and that
+tickets_sold matches event_bookings. Reports p50/p99 latency per registration.
+
+    python -m benchmarks.load_registration --attendees 2000 --tickets 500
+"""
+
+import argparse
+import asyncio
+import time
+from collections import Counter
+
+from benchmarks import _setup
+
+from fastapi import HTTPException
+from sqlalchemy import event, func, select
+
+from database import SessionLocal, engine
+from modules.events.models import Event_Bookings_Model, Events_Model
+from modules.events.service import bookings_service
+from modules.users.models import UsersModel
+
+
+def enable_sqlite_concurrency(sync_engine):
+    """WAL plus a busy timeout lets SQLite queue writers instead of failing fast."""
+
+    @event.listens_for(sync_engine, "connect")
+    def _configure(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA busy_timeout=60000")
+        cursor.close()
+
+
+async def register(event_id, attendee_id, latencies: list, outcomes: Counter):
+    started = time.perf_counter()
+
+    try:
+        async with _setup.request_scope():
+            booking = await bookings_service.register_attendee(event_id, attendee_id)
+
+        outcomes["booked" if booking["is_new_booking"] else "replayed"] += 1
+    except HTTPException as e:
+        outcomes[f"http {e.status_code}"] += 1
+    finally:
+        latencies.append(time.perf_counter() - started)
+
+
+async def main(attendees: int, tickets: int, duplicates: int):
+    enable_sqlite_concurrency(engine.sync_engine)
+
+    await _setup.create_tables()
+
+    # Seeding with bookings_per_event creates one user and profile per attendee
+    creator_id, (event_id,) = await _setup.seed_catalogue(1, attendees)
+
+    async with SessionLocal() as db:
+        await db.execute(Event_Bookings_Model.__table__.delete())
+        await db.execute(
+            Events_Model.__table__.update().values(
+                total_tickets=tickets, tickets_sold=0
+            )
+        )
+        attendee_ids = (
+            (
+                await db.execute(
+                    select(UsersModel.user_id).where(UsersModel.user_id != creator_id)
+                )
+            )
+            .scalars()
+            .all()
+        )
+        await db.commit()
+
+    requests = [*attendee_ids, *attendee_ids[:duplicates]]
+
+    latencies = []
+    outcomes = Counter()
+
+    started = time.perf_counter()
+    await asyncio.gather(
+        *(register(event_id, user_id, latencies, outcomes) for user_id in requests)
+    )
+    elapsed = time.perf_counter() - started
+
+    async with SessionLocal() as db:
+        bookings = (
+            await db.execute(
+                select(
+                    func.count(),
+                    func.count(Event_Bookings_Model.attendee_id.distinct()),
+                )
+            )
+        ).one()
+        tickets_sold = (
+            await db.execute(select(Events_Model.tickets_sold))
+        ).scalar_one()
+
+    booking_count, distinct_attendees = bookings
+
+    assert booking_count <= tickets, f"oversold: {booking_count} > {tickets}"
+    assert booking_count == distinct_attendees, "an attendee holds two bookings"
+    assert tickets_sold == booking_count, "tickets_sold drifted from event_bookings"
+
+    _setup.print_table(
+        f"{len(requests)} concurrent registrations for {tickets} seats",
+        [
+            ("outcomes", dict(outcomes)),
+            ("bookings", f"{booking_count} (tickets_sold {tickets_sold})"),
+            ("throughput", f"{len(requests) / elapsed:.1f} registrations/s"),
+            ("p50", f"{_setup.percentile(latencies, 50) * 1000:.1f} ms"),
+            ("p99", f"{_setup.percentile(latencies, 99) * 1000:.1f} ms"),
+        ],
+    )
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--attendees", type=int, default=2000)
+    parser.add_argument("--tickets", type=int, default=500)
+    parser.add_argument("--duplicates", type=int, default=200)
+    arguments = parser.parse_args()
+
+    asyncio.run(main(arguments.attendees, arguments.tickets, arguments.duplicates))
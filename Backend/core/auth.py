@@ -1,24 +1,85 @@
+import asyncio
 import jwt
+import time
 from settings import settings
 from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
 from passlib.context import CryptContext
 
 from fastapi import HTTPException, status
 
+from shared.cache import TTL_LRU_Cache
+from shared.metrics import metrics
+
 
 class Hashing:
-    pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+    """bcrypt on a bounded thread pool. bcrypt releases the GIL, so the event loop
+    keeps serving other requests while passwords are hashed.
+
+    PASSWORD_HASH_WORKERS hashes run at once and PASSWORD_HASH_MAX_PENDING more
+    may wait for a worker, further callers get a 503 instead of queueing.
+    """
+
+    # min_rounds marks hashes of a lower cost for verify_and_update to replace
+    pwd_context = CryptContext(
+        schemes=["bcrypt"],
+        deprecated="auto",
+        bcrypt__rounds=settings.BCRYPT_ROUNDS,
+        bcrypt__min_rounds=settings.BCRYPT_ROUNDS,
+    )
+    executor = ThreadPoolExecutor(
+        max_workers=settings.PASSWORD_HASH_WORKERS, thread_name_prefix="bcrypt"
+    )
+    in_flight = 0  # running and waiting hashes, only touched on the event loop
 
     @classmethod
-    def hash_data(cls, password: str) -> str:
-        return cls.pwd_context.hash(password)
+    async def _run(cls, function, *args):
+        if cls.in_flight >= (
+            settings.PASSWORD_HASH_WORKERS + settings.PASSWORD_HASH_MAX_PENDING
+        ):
+            metrics.increment("auth.hashing.rejected")
+
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Too many sign in attempts right now, try again shortly",
+                headers={"Retry-After": "1"},
+            )
+
+        cls.in_flight += 1
+        started = time.perf_counter()
+
+        try:
+            return await asyncio.get_running_loop().run_in_executor(
+                cls.executor, function, *args
+            )
+        finally:
+            cls.in_flight -= 1
+            metrics.observe("auth.hashing", time.perf_counter() - started)
 
     @classmethod
-    def verify_hash_data(cls, plain_password: str, hashed_password: str) -> bool:
-        return cls.pwd_context.verify(plain_password, hashed_password)
+    async def hash_data(cls, password: str) -> str:
+        return await cls._run(cls.pwd_context.hash, password)
+
+    @classmethod
+    async def verify_hash_data(cls, plain_password: str, hashed_password: str) -> bool:
+        return await cls._run(cls.pwd_context.verify, plain_password, hashed_password)
+
+    @classmethod
+    async def verify_and_update(cls, plain_password: str, hashed_password: str):
+        """Returns (is_matching, new_hash). new_hash is set when the password matched
+        a hash below BCRYPT_ROUNDS, it should replace the stored one."""
+        return await cls._run(
+            cls.pwd_context.verify_and_update, plain_password, hashed_password
+        )
+
+
+metrics.register_gauge("auth.hashing.in_flight", lambda: Hashing.in_flight)
 
 
 class Jwt_Token:
+    # token -> user_id of tokens which passed verification, each until its exp
+    verified_tokens = TTL_LRU_Cache(max_size=settings.JWT_CACHE_SIZE, ttl_seconds=0)
+
     # Create JWT Token
     @classmethod
     def create_access_token(cls, data: dict):
@@ -34,6 +95,11 @@ class Jwt_Token:
     # Decode JWT Token
     @classmethod
     def verify_access_token(cls, token: str):
+        user_id = cls.verified_tokens.get(token)
+
+        if user_id is not None:
+            return user_id
+
         try:
             payload = jwt.decode(
                 token, settings.JWT_SECRET_KEY, algorithms=[settings.ALGORITHM]
@@ -47,6 +113,11 @@ class Jwt_Token:
                     detail="Invalid Token : Sub is missing",
                 )
 
+            expires_in = payload.get("exp", 0) - time.time()
+
+            if expires_in > 0:
+                cls.verified_tokens.set(token, user_id, ttl_seconds=expires_in)
+
             return user_id
         except jwt.ExpiredSignatureError:
             raise HTTPException(
@@ -1,9 +1,143 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, declarative_base
+import time
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
+from sqlalchemy.orm import declarative_base
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 from settings import settings
+from shared.metrics import metrics
+
+
+class Metered_Queue_Pool(AsyncAdaptedQueuePool):
+    """Queue pool which records how long every connection checkout takes."""
+
+    def connect(self):
+        started_at = time.perf_counter()
+
+        try:
+            return super().connect()
+        finally:
+            metrics.observe("db.pool.checkout", time.perf_counter() - started_at)
+
+
+def _engine_options(database_url: str):
+    url = make_url(database_url)
+
+    options = {
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+    }
+
+    # In-memory SQLite runs on a single static connection, so there is no pool to size
+    if url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:"):
+        return options
 
-engine = create_engine(settings.DATABASE_URL)
-SessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False)
+    return {
+        **options,
+        "poolclass": Metered_Queue_Pool,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+    }
+
+
+# DATABASE_URL must use an async driver, eg: mysql+aiomysql://... or sqlite+aiosqlite:///...
+engine = create_async_engine(
+    settings.DATABASE_URL, **_engine_options(settings.DATABASE_URL)
+)
+SessionLocal = async_sessionmaker(
+    bind=engine, autoflush=False, expire_on_commit=False
+)
 
 Base = declarative_base()  # Base model
+
+
+if isinstance(engine.pool, Metered_Queue_Pool):
+    metrics.register_gauge("db.pool.checked_out", engine.pool.checkedout)
+    metrics.register_gauge("db.pool.checked_in", engine.pool.checkedin)
+    # QueuePool.overflow() counts down from -pool_size until the pool is full,
+    # the gauge only reports the connections opened beyond pool_size
+    metrics.register_gauge("db.pool.overflow", lambda: max(0, engine.pool.overflow()))
+
+
+# Session shared by every DAO call made while serving the current request
+_request_session: ContextVar[AsyncSession | None] = ContextVar(
+    "request_session", default=None
+)
+
+
+async def get_db():
+    """FastAPI dependency which opens one session per request.
+
+    DAOs pick the session up through session_scope(), so a request checks out a
+    single pooled connection no matter how many queries the services run.
+    """
+    async with SessionLocal() as session:
+        token = _request_session.set(session)
+
+        try:
+            yield session
+        finally:
+            _request_session.reset(token)
+
+
+@asynccontextmanager
+async def session_scope():
+    """Yields the request session when there is one, otherwise a short lived session."""
+    session = _request_session.get()
+
+    if session is not None:
+        yield session
+        return
+
+    async with SessionLocal() as session:
+        yield session
+
+
+# Set while a unit_of_work is open, DAO commits then wait for the unit's commit
+_unit_of_work: ContextVar[bool] = ContextVar("unit_of_work", default=False)
+
+
+def in_unit_of_work() -> bool:
+    return _unit_of_work.get()
+
+
+async def commit_session(session: AsyncSession):
+    """Commits the DAO's changes, or only flushes them inside a unit_of_work."""
+    if _unit_of_work.get():
+        await session.flush()
+    else:
+        await session.commit()
+
+
+@asynccontextmanager
+async def unit_of_work():
+    """Runs every DAO call made inside it in one transaction with one commit.
+
+    DAOs share the request session (or a new one outside a request) and their
+    commits only flush. Leaving the block commits, an exception rolls everything
+    back. A unit_of_work opened inside another one joins it. DAO methods which
+    roll back and carry on must re-raise inside a unit, see in_unit_of_work().
+    """
+    if _unit_of_work.get():
+        yield _request_session.get()
+        return
+
+    async with session_scope() as session:
+        session_token = _request_session.set(session)
+        unit_token = _unit_of_work.set(True)
+
+        try:
+            yield session
+
+            await session.commit()
+        except BaseException:
+            await session.rollback()
+
+            raise
+        finally:
+            _unit_of_work.reset(unit_token)
+            _request_session.reset(session_token)
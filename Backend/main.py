@@ -1,23 +1,47 @@
-from fastapi import FastAPI, HTTPException, Request, status
+import os
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Depends, HTTPException, Request, status
 from fastapi.responses import JSONResponse
 from sqlalchemy.exc import SQLAlchemyError
 from fastapi.middleware.cors import CORSMiddleware
-from starlette.middleware.base import BaseHTTPMiddleware
+from fastapi.staticfiles import StaticFiles
 
 from shared import response_schema
 
 import settings as app_settings
-from database import engine, Base
+from database import engine, Base, get_db
 from shared import response_schema
 from shared.generic_error_handling import Generic_Error_Handling
+from shared.metrics import metrics
+from middlewares.request_metrics import Request_Metrics_Middleware
 
 from modules.users.controller import users_router
 from modules.events.controller import events_router
+from modules.events.geocoding import geocoder
+from utils.upload_pipeline import upload_pipeline
+from utils.qr_code import ticket_renderer
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
 
-Base.metadata.create_all(bind=engine)
+    yield
 
+    await upload_pipeline.drain()
+    await ticket_renderer.aclose()
+    await geocoder.aclose()
+    await engine.dispose()
 
-app = FastAPI(title=app_settings.settings.APP_NAME)
+
+# get_db opens the single session that every DAO call of a request shares
+app = FastAPI(
+    title=app_settings.settings.APP_NAME,
+    lifespan=lifespan,
+    dependencies=[Depends(get_db)],
+)
 
 
 #  Enable CORS
@@ -30,37 +54,37 @@ app.add_middleware(
 )
 
 
-class Entry_Middleware(BaseHTTPMiddleware):
-    async def dispatch(self, request, call_next):
-        try:
-            response = await call_next(request)
-
-            if isinstance(response, JSONResponse):
-                # Only attempt model_dump if the response is a Pydantic model
-                if hasattr(response, "model_dump"):
-                    return response_schema.Success_Response_Schema(
-                        **response.model_dump()
-                    )
+app.add_middleware(Request_Metrics_Middleware)
 
-            return response
 
-        except SQLAlchemyError as e:
-            error_details = Generic_Error_Handling.db_exception_handling(e)
+@app.exception_handler(SQLAlchemyError)
+async def db_exception_handler(request: Request, e: SQLAlchemyError):
+    error_details = Generic_Error_Handling.db_exception_handling(e)
 
-            return JSONResponse(
-                status_code=500,
-                content=response_schema.Error_Response_Schema(
-                    details=error_details
-                ).model_dump(),
-            )
+    return JSONResponse(
+        status_code=500,
+        content=response_schema.Error_Response_Schema(details=error_details).model_dump(),
+    )
 
 
-app.add_middleware(Entry_Middleware)
-
 app.include_router(router=users_router, prefix="/users", tags=["users"])
 app.include_router(router=events_router, prefix="/events", tags=["events"])
 
+if app_settings.settings.UPLOAD_STORAGE == "local":
+    os.makedirs(app_settings.settings.UPLOAD_LOCAL_DIR, exist_ok=True)
+
+    app.mount(
+        "/media",
+        StaticFiles(directory=app_settings.settings.UPLOAD_LOCAL_DIR),
+        name="media",
+    )
+
 
 @app.get("/")
 async def read_root():
     return response_schema.Index_Response(message="Welcome Guys")
+
+
+@app.get("/metrics")
+async def read_metrics():
+    return metrics.snapshot()
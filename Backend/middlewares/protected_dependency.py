@@ -2,12 +2,10 @@ from fastapi import Request, HTTPException, status
 
 from core.auth import Jwt_Token
 
-from utils.binaryConversion import str_to_binary
-
 from modules.users.validator import general_user_validation
 
 
-def get_current_user(request: Request):
+async def get_current_user(request: Request):
     access_token = request.cookies.get("access_token")
 
     if not access_token:
@@ -17,8 +15,18 @@ def get_current_user(request: Request):
 
     user_id = Jwt_Token.verify_access_token(access_token)
 
-    user_binary_id = str_to_binary(user_id)
+    await general_user_validation.validate_user_exists(user_id)
+
+    return user_id
+
 
-    general_user_validation.validate_user_exists(user_binary_id)
+async def get_optional_user(request: Request):
+    """get_current_user for public endpoints: None instead of a 401 when the
+    caller is anonymous or their session is no longer valid."""
+    if not request.cookies.get("access_token"):
+        return None
 
-    return user_binary_id
+    try:
+        return await get_current_user(request)
+    except HTTPException:
+        return None
@@ -0,0 +1,34 @@
+import time
+
+from shared.metrics import metrics
+
+
+class Request_Metrics_Middleware:
+    """Pure ASGI middleware which times every HTTP request and counts responses
+    by status class. It only wraps send, so unlike BaseHTTPMiddleware it adds no
+    extra task or memory stream per request."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started_at = time.perf_counter()
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            metrics.observe("http.request", time.perf_counter() - started_at)
+            metrics.increment(f"http.responses.{status_code // 100}xx")
@@ -0,0 +1,391 @@
+import asyncio
+import csv
+import io
+import json
+import logging
+from datetime import datetime
+from itertools import islice
+
+from fastapi import HTTPException, UploadFile, status
+from pydantic import ValidationError
+from sqlalchemy.exc import SQLAlchemyError
+
+from . import models
+from . import schema as event_schema
+from . import validator
+from .service import location_service, search_service
+
+from settings import settings
+from shared import generic_enum
+from shared.generic_error_handling import Generic_Error_Handling
+from shared.generic_validation import event_request_validation
+from shared.response_cache import response_cache
+from utils import geohash, string_utils
+from utils.ids import new_id
+
+logger = logging.getLogger(__name__)
+
+IMPORT_FORMATS = {
+    ".csv": "csv",
+    ".jsonl": "jsonl",
+    ".ndjson": "jsonl",
+    "text/csv": "csv",
+    "application/jsonl": "jsonl",
+    "application/x-ndjson": "jsonl",
+}
+
+
+def detect_import_format(import_file: UploadFile) -> str:
+    extension = "." + (import_file.filename or "").rsplit(".", 1)[-1].lower()
+
+    import_format = IMPORT_FORMATS.get(extension) or IMPORT_FORMATS.get(
+        import_file.content_type
+    )
+
+    if not import_format:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail="Upload the events as a .csv or .jsonl file",
+        )
+
+    return import_format
+
+
+def read_rows(binary_file, import_format: str):
+    """Yields (line, row, parse_error) for every record of the file, reading it
+    incrementally. Empty CSV cells are read as missing values."""
+    text_file = io.TextIOWrapper(binary_file, encoding="utf-8-sig", newline="")
+
+    if import_format == "csv":
+        reader = csv.DictReader(text_file)
+
+        for row in reader:
+            yield reader.line_num, {
+                key: value for key, value in row.items() if key and value != ""
+            }, None
+
+        return
+
+    for line_number, line in enumerate(text_file, start=1):
+        if not line.strip():
+            continue
+
+        try:
+            row = json.loads(line)
+        except ValueError as e:
+            yield line_number, None, f"Invalid JSON: {e}"
+            continue
+
+        if isinstance(row, dict):
+            yield line_number, row, None
+        else:
+            yield line_number, None, "Every line must be a JSON object"
+
+
+def row_error(loc: str, msg: str, error_type: str = "value_error"):
+    return {"loc": ["body", loc], "msg": msg, "type": error_type}
+
+
+class Event_Import_Class:
+    """Creates events from an uploaded CSV or JSON Lines file, batch by batch.
+
+    Every batch is validated row by row, its categories and addresses are looked
+    up with one query each, unknown addresses are geocoded concurrently, and the
+    valid events are inserted in a single transaction. Rows which fail are
+    reported with their line instead of failing the import.
+    """
+
+    def __init__(
+        self,
+        event_dao,
+        category_dao,
+        location_dao,
+        location_service,
+        search_service,
+        creator_validator,
+        participant_validator,
+        response_cache,
+    ):
+        self.event_dao = event_dao
+        self.category_dao = category_dao
+        self.location_dao = location_dao
+        self.location_service = location_service
+        self.search_service = search_service
+        self.creator_validator = creator_validator
+        self.participant_validator = participant_validator
+        self.response_cache = response_cache
+
+    async def import_events(self, import_file: UploadFile, creator_id: str):
+        import_format = detect_import_format(import_file)
+
+        # Creators are booked into their free events, like create_event does
+        await self.participant_validator.check_profile_exists(creator_id)
+
+        try:
+            await self.creator_validator.is_merchant_id_exists(creator_id)
+            paid_events_error = None
+        except HTTPException as e:
+            paid_events_error = e.detail
+
+        summary = {"imported": 0, "failed": 0, "errors": []}
+        rows = read_rows(import_file.file, import_format)
+        limited_rows = islice(rows, settings.EVENT_IMPORT_MAX_ROWS)
+
+        while True:
+            # The file is read off the event loop, one batch at a time
+            batch = await asyncio.to_thread(
+                list, islice(limited_rows, settings.EVENT_IMPORT_BATCH_SIZE)
+            )
+
+            if not batch:
+                break
+
+            await self._import_batch(batch, creator_id, paid_events_error, summary)
+
+        skipped_row = await asyncio.to_thread(next, rows, None)
+
+        if skipped_row:
+            summary["errors"].append(
+                {
+                    "line": skipped_row[0],
+                    "errors": [
+                        row_error(
+                            "file",
+                            f"Only the first {settings.EVENT_IMPORT_MAX_ROWS} rows of a file are imported, this row and the rest were skipped",
+                        )
+                    ],
+                }
+            )
+
+        summary["errors"].sort(key=lambda row_errors: row_errors["line"])
+
+        if summary["imported"]:
+            await self.response_cache.invalidate("events")
+
+        return summary
+
+    @staticmethod
+    def _add_error(summary: dict, line: int, errors: list):
+        summary["errors"].append({"line": line, "errors": errors})
+        summary["failed"] += 1
+
+    def _validate_rows(self, batch: list, paid_events_error, summary: dict):
+        valid_rows = []
+
+        for line, row, parse_error in batch:
+            if parse_error:
+                self._add_error(summary, line, [row_error("row", parse_error)])
+                continue
+
+            try:
+                # Rows without an image show the placeholder until one is uploaded
+                event_row = event_schema.Event_Import_Row_Schema(
+                    **{
+                        "event_image_url": settings.PENDING_IMAGE_URL,
+                        **row,
+                    }
+                )
+            except ValidationError as e:
+                self._add_error(
+                    summary,
+                    line,
+                    e.errors(include_url=False, include_context=False, include_input=False),
+                )
+                continue
+
+            event_data = event_row.model_dump()
+            errors = event_request_validation.validate_data(event_data)
+
+            if paid_events_error and (
+                event_data["ticket_type"] == generic_enum.Ticket_Type_Enum.PAID
+            ):
+                errors.append(row_error("ticket_type", paid_events_error))
+
+            if errors:
+                self._add_error(summary, line, errors)
+                continue
+
+            valid_rows.append((line, event_data))
+
+        return valid_rows
+
+    async def _geocode(self, full_address: str, limiter: asyncio.Semaphore):
+        async with limiter:
+            try:
+                return await self.location_service.get_coords(full_address)
+            except HTTPException as e:
+                return e.detail
+
+    async def _resolve_locations(self, full_addresses: set):
+        """Returns {full_address: location or error message} for the batch."""
+        locations = await self.location_dao.get_locations_by_full_locations(
+            list(full_addresses)
+        )
+
+        missing_addresses = [
+            address for address in full_addresses if address not in locations
+        ]
+
+        if not missing_addresses:
+            return locations
+
+        limiter = asyncio.Semaphore(settings.EVENT_IMPORT_GEOCODE_CONCURRENCY)
+
+        coords_list = await asyncio.gather(
+            *(self._geocode(address, limiter) for address in missing_addresses)
+        )
+
+        new_locations = []
+
+        for address, coords in zip(missing_addresses, coords_list):
+            if not isinstance(coords, dict):
+                locations[address] = coords
+                continue
+
+            location_data = event_schema.Event_Location_Model_Schema(
+                **coords, full_location=address
+            )
+
+            new_locations.append(
+                {
+                    **location_data.model_dump(),
+                    "geohash": geohash.encode(
+                        location_data.latitude, location_data.longitude
+                    ),
+                }
+            )
+
+        if new_locations:
+            # Another import may save the same address meanwhile, keep its row
+            await self.location_dao.bulk_upsert(new_locations, ["full_location"])
+
+            locations.update(
+                await self.location_dao.get_locations_by_full_locations(
+                    [location["full_location"] for location in new_locations]
+                )
+            )
+
+        return locations
+
+    async def _import_batch(self, batch, creator_id, paid_events_error, summary):
+        valid_rows = self._validate_rows(batch, paid_events_error, summary)
+
+        if not valid_rows:
+            return
+
+        existing_category_ids = await self.category_dao.get_existing_category_ids(
+            list({event_data["category_id"] for _, event_data in valid_rows})
+        )
+
+        full_addresses = {
+            line: string_utils.create_full_address(
+                {
+                    "street_address": event_data["street_address"],
+                    "city": event_data["city"],
+                    "state": event_data["state"],
+                    "pin_code": event_data["pin_code"],
+                    "country": event_data["country"],
+                }
+            )
+            for line, event_data in valid_rows
+        }
+
+        locations = await self._resolve_locations(set(full_addresses.values()))
+
+        registered_at = datetime.now()
+        event_rows, booking_rows, imported_lines = [], [], []
+
+        for line, event_data in valid_rows:
+            if event_data["category_id"] not in existing_category_ids:
+                self._add_error(
+                    summary,
+                    line,
+                    [
+                        row_error(
+                            "category_id",
+                            f"The requested category {event_data['category_id']} id is not exists",
+                        )
+                    ],
+                )
+                continue
+
+            location = locations.get(full_addresses[line])
+
+            if not isinstance(location, dict):
+                self._add_error(
+                    summary,
+                    line,
+                    [row_error("full_location", str(location), "geocoding_error")],
+                )
+                continue
+
+            try:
+                event_model = event_schema.Event_Model_Schema(
+                    **event_data,
+                    address_id=location["location_id"],
+                    creator_id=creator_id,
+                    event_id=new_id(),
+                )
+            except ValidationError as e:
+                self._add_error(
+                    summary,
+                    line,
+                    e.errors(include_url=False, include_context=False, include_input=False),
+                )
+                continue
+
+            event_row = event_model.model_dump()
+            is_free = event_row["ticket_type"] == generic_enum.Ticket_Type_Enum.FREE
+
+            # Paid registration is not available yet, so only free events hold a seat
+            event_rows.append({**event_row, "tickets_sold": 1 if is_free else 0})
+            imported_lines.append(line)
+
+            if is_free:
+                booking_rows.append(
+                    {
+                        **event_schema.Booking_Model_Schema(
+                            event_id=event_row["event_id"],
+                            attendee_id=creator_id,
+                            booking_status=True,
+                            registered_at=registered_at,
+                        ).model_dump(),
+                        "booking_id": new_id(),
+                    }
+                )
+
+        if not event_rows:
+            return
+
+        try:
+            await self.event_dao.bulk_create_events(event_rows, booking_rows)
+        except SQLAlchemyError as e:
+            logger.exception("Saving a batch of imported events failed")
+
+            error_details = Generic_Error_Handling.db_exception_handling(e)
+
+            for line in imported_lines:
+                self._add_error(
+                    summary,
+                    line,
+                    [row_error("row", error_details["message"], "database_error")],
+                )
+
+            return
+
+        for event_row in event_rows:
+            self.search_service.index_event(event_row)
+
+        summary["imported"] += len(event_rows)
+
+
+event_import_service = Event_Import_Class(
+    event_dao=models.events_dao,
+    category_dao=models.category_dao,
+    location_dao=models.location_dao,
+    location_service=location_service,
+    search_service=search_service,
+    creator_validator=validator.creator_validator,
+    participant_validator=validator.participant_validator,
+    response_cache=response_cache,
+)
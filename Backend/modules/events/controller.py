@@ -1,39 +1,96 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import (
+    APIRouter,
+    Depends,
+    File,
+    HTTPException,
+    Path,
+    Query,
+    Request,
+    Response,
+    UploadFile,
+    status,
+)
 
 from . import schema
 
-from typing import List
+import json
+
+from typing import Annotated, List
 
-from utils import binaryConversion
+from uuid import UUID
 
 from .service import category_service, events_service, bookings_service, search_service
+from .bulk_import import event_import_service
+
+from .dependency import (
+    get_create_event_data,
+    get_update_event_data,
+    get_event_image,
+    get_event_image_update,
+)
 
-from .dependency import get_create_event_data, get_update_event_data
+from utils.upload_pipeline import Staged_Upload
+from utils import qr_code
 
-from middlewares.protected_dependency import get_current_user
+from middlewares.protected_dependency import get_current_user, get_optional_user
+
+from pydantic import TypeAdapter
+
+from shared import conditional, generic_enum
+from shared.streaming_export import export_response
+from shared.json_response import Typed_JSON_Response
+from shared.response_cache import response_cache
 
 events_router = APIRouter()
 
 
+# List endpoints validate their rows once through these adapters and answer with
+# Typed_JSON_Response, the response_model stays for the OpenAPI schema
+event_list_adapter = TypeAdapter(schema.Event_List_Response_Schema)
+event_card_list_adapter = TypeAdapter(schema.Event_Card_List_Response_Schema)
+event_search_adapter = TypeAdapter(schema.Event_Search_Response_Schema)
+event_nearby_adapter = TypeAdapter(schema.Event_Nearby_Response_Schema)
+events_adapter = TypeAdapter(List[schema.Event_Base_Response_Schema])
+user_bookings_adapter = TypeAdapter(List[schema.User_Bookings_Response_Schema])
+event_bookings_adapter = TypeAdapter(List[schema.Event_Bookings_Response_Schema])
+category_adapter = TypeAdapter(schema.Category_Response)
+
+
 @events_router.post("/", status_code=status.HTTP_201_CREATED, response_model=schema.Event_Response_Schema)
 async def create_event(
-    user_binary_id: bytes = Depends(get_current_user),
+    user_id: str = Depends(get_current_user),
     event_data: schema.Event_Request_Schema = Depends(get_create_event_data),
+    event_image: Staged_Upload = Depends(get_event_image),
 ):
-    event_create_response = events_service.create_event(
-        event_data.model_dump(), user_binary_id
+    event_create_response = await events_service.create_event(
+        event_data.model_dump(), user_id, event_image=event_image
     )
 
     return schema.Event_Response_Schema(**event_create_response)
 
 
+@events_router.post("/import", status_code=status.HTTP_200_OK, response_model=schema.Event_Import_Response_Schema)
+async def import_events(
+    import_file: UploadFile = File(..., description="Events as .csv or .jsonl, one per row"),
+    user_id: str = Depends(get_current_user),
+):
+    import_summary = await event_import_service.import_events(
+        import_file, creator_id=user_id
+    )
+
+    return schema.Event_Import_Response_Schema(**import_summary)
+
+
 @events_router.put("/", status_code=status.HTTP_200_OK, response_model=schema.Event_Update_Response_Schema)
 async def update_event_details(
-    user_binary_id: bytes = Depends(get_current_user),
+    user_id: str = Depends(get_current_user),
     update_data: schema.Event_Update_Request_Schema = Depends(get_update_event_data),
+    event_image: Staged_Upload | None = Depends(get_event_image_update),
 ):
-    updated_data = events_service.update_event(
-        update_data=update_data.model_dump(), creator_id=user_binary_id
+    updated_data = await events_service.update_event(
+        update_data=update_data.model_dump(),
+        creator_id=user_id,
+        event_image=event_image,
     )
 
     return schema.Event_Update_Response_Schema(**updated_data)
@@ -41,75 +98,147 @@ async def update_event_details(
 
 @events_router.patch("/", status_code=status.HTTP_200_OK, response_model=schema.Event_Update_Response_Schema)
 async def update_event_detail(
-    user_binary_id: bytes = Depends(get_current_user),
+    user_id: str = Depends(get_current_user),
     update_data: schema.Event_Update_Request_Schema = Depends(get_update_event_data),
+    event_image: Staged_Upload | None = Depends(get_event_image_update),
 ):
-    updated_data = events_service.update_event(
-        update_data=update_data.model_dump(), creator_id=user_binary_id
+    updated_data = await events_service.update_event(
+        update_data=update_data.model_dump(),
+        creator_id=user_id,
+        event_image=event_image,
     )
 
     return schema.Event_Update_Response_Schema(**updated_data)
 
 
-@events_router.get("/", status_code=status.HTTP_200_OK, response_model=List[schema.Event_Base_Response_Schema])
-async def get_events():
-    events_list = events_service.get_events_list()
+@events_router.get("/", status_code=status.HTTP_200_OK, response_model=schema.Event_Card_List_Response_Schema)
+async def get_events(
+    request: Request, filters: Annotated[schema.Event_Filter_Schema, Query()]
+):
+    filters_dict = filters.model_dump(exclude={"include_registration"})
+    cache_key = "list:" + json.dumps(filters_dict, sort_keys=True, default=str)
+
+    def load_events():
+        return events_service.get_events_list(filters_dict)
+
+    if filters.include_registration:
+        # The page is still the shared cached one, only the states are per caller
+        events_page = await response_cache.cached_json(
+            "events", cache_key, load_events, event_list_adapter
+        )
+
+        await bookings_service.add_registration_states(
+            events_page["events"], await get_optional_user(request)
+        )
+
+        return Typed_JSON_Response(
+            events_page,
+            event_card_list_adapter,
+            headers={"Cache-Control": conditional.PRIVATE_CACHE_CONTROL},
+        )
+
+    # Same for every caller, so served from the cache until an event is written
+    return await response_cache.json_response(
+        "events", cache_key, load_events, event_list_adapter, request=request
+    )
+
+
+@events_router.get("/search", status_code=status.HTTP_200_OK, response_model=schema.Event_Search_Response_Schema)
+async def search_events(search_query: Annotated[schema.Event_Search_Query_Schema, Query()]):
+    search_results = await search_service.search_events(
+        search_query.q, offset=search_query.offset, limit=search_query.limit
+    )
 
-    if events_list:
-        return [schema.Event_Base_Response_Schema(**event) for event in events_list]
+    return Typed_JSON_Response(search_results, event_search_adapter)
+
+
+@events_router.get("/nearby", status_code=status.HTTP_200_OK, response_model=schema.Event_Nearby_Response_Schema)
+async def get_nearby_events(nearby_query: Annotated[schema.Event_Nearby_Query_Schema, Query()]):
+    nearby_events = await events_service.get_nearby_events(
+        nearby_query.lat,
+        nearby_query.lon,
+        radius_km=nearby_query.radius_km,
+        limit=nearby_query.limit,
+    )
 
-    return []
+    return Typed_JSON_Response(nearby_events, event_nearby_adapter)
 
 
 @events_router.get("/created", status_code=status.HTTP_200_OK, response_model=List[schema.Event_Base_Response_Schema])
 async def get_created_events(
-    user_binary_id: bytes = Depends(get_current_user),
+    user_id: str = Depends(get_current_user),
 ):
-    created_events_list = events_service.get_created_events(creator_id=user_binary_id)
-
-    if created_events_list:
-        return [
-            schema.Event_Base_Response_Schema(**event) for event in created_events_list
-        ]
+    created_events_list = await events_service.get_created_events(
+        creator_id=user_id
+    )
 
-    return []
+    return Typed_JSON_Response(created_events_list or [], events_adapter)
 
 
 @events_router.post("/register",status_code=status.HTTP_201_CREATED, response_model=schema.User_Booking_Response_Schema)
-def register_attendee(
+async def register_attendee(
+    response: Response,
     event_data: schema.Booking_Request_Schema,
-    user_id: bytes = Depends(get_current_user),
+    user_id: str = Depends(get_current_user),
 ):
-    event_id = event_data.model_dump().get("event_id")
+    event_id = str(event_data.event_id)
 
-    binary_event_id = binaryConversion.str_to_binary(event_id)
-
-    attendee_details = bookings_service.register_attendee(
-        event_id=binary_event_id, attendee_id=user_id
+    attendee_details = await bookings_service.register_attendee(
+        event_id=event_id, attendee_id=user_id
     )
 
+    # Registering twice is idempotent and answers with the existing booking
+    if not attendee_details["is_new_booking"]:
+        response.status_code = status.HTTP_200_OK
+
     return schema.User_Booking_Response_Schema(**attendee_details)
 
 
 @events_router.get("/booked", status_code=status.HTTP_200_OK, response_model=List[schema.User_Bookings_Response_Schema])
 async def get_booked_events(
-    user_binary_id: bytes = Depends(get_current_user),
+    user_id: str = Depends(get_current_user),
+):
+    bookings_list = await bookings_service.get_attendee_bookings(
+        attendee_id=user_id
+    )
+
+    return Typed_JSON_Response(bookings_list or [], user_bookings_adapter)
+
+
+@events_router.get("/bookings/{booking_id}/ticket", status_code=status.HTTP_200_OK, response_class=Response)
+async def get_booking_ticket(
+    booking_id: UUID,
+    request: Request,
+    image_format: generic_enum.Ticket_Format_Enum = Query(
+        generic_enum.Ticket_Format_Enum.PNG, alias="format"
+    ),
+    user_id: str = Depends(get_current_user),
 ):
-    bookings_list = bookings_service.get_attendee_bookings(attendee_id=user_binary_id)
+    payload = await bookings_service.get_ticket_payload(str(booking_id), user_id)
 
-    if bookings_list:
-        return [
-            schema.User_Bookings_Response_Schema(**booking) for booking in bookings_list
-        ]
+    # The image only depends on the payload, a revalidation never touches it
+    etag = f'"{qr_code.ticket_renderer.cache_key(payload, image_format)}"'
 
-    return []
+    if conditional.is_not_modified(request, etag):
+        return conditional.not_modified_response(etag)
 
+    ticket_image = await qr_code.ticket_renderer.get_image(payload, image_format)
 
-@events_router.get("/category",status_code=status.HTTP_200_OK )
-async def get_categories():
-    category_list = category_service.get_categories()
+    return Response(
+        ticket_image,
+        media_type=qr_code.MEDIA_TYPES[image_format],
+        headers=conditional.validator_headers(etag),
+    )
 
-    return schema.Category_Response(category_list=category_list)
+
+@events_router.get("/category",status_code=status.HTTP_200_OK, response_model=schema.Category_Response)
+async def get_categories(request: Request):
+    async def load_categories():
+        return {"category_list": await category_service.get_categories()}
+
+    return await response_cache.json_response(
+        "categories", "list", load_categories, category_adapter, request=request
+    )
 
 
 @events_router.post(
@@ -117,53 +246,134 @@ async def get_categories():
     status_code=status.HTTP_201_CREATED,
     response_model=schema.Category_Response,
 )
-def create_category(
+async def create_category(
     category_data_list: List[schema.Category_Schema],
-    user_binary_id: bytes = Depends(get_current_user),
+    user_id: str = Depends(get_current_user),
 ):
-    new_category_list = category_service.create_category(category_data_list)
+    new_category_list = await category_service.create_category(category_data_list)
 
     return schema.Category_Response(category_list=new_category_list)
 
 
 @events_router.get(
-    "/category/{category_id}",status_code=status.HTTP_200_OK, response_model=List[schema.Event_Base_Response_Schema]
+    "/category/{category_id}",status_code=status.HTTP_200_OK, response_model=schema.Event_Card_List_Response_Schema
 )
 async def get_events_by_category(
-    category_id: int,
-    user_binary_id: bytes = Depends(get_current_user),
+    request: Request,
+    category_id: int = Path(..., gt=0),
+    user_id: str = Depends(get_current_user),
+    cursor: str = Query(None, description="next_cursor of the previous page"),
+    limit: int = Query(20, ge=1, le=100),
+    include_registration: bool = Query(
+        False,
+        description="Adds the caller's register_state and the live available_tickets to every event",
+    ),
 ):
-    events_list = search_service.get_events_by_category_id(category_id=category_id)
-
-    if events_list:
-        return [schema.Event_Base_Response_Schema(**event) for event in events_list]
-    return []
+    # The upcoming events of the category, paged like GET /events?category_id=
+    filters_dict = schema.Event_Filter_Schema(
+        category_id=category_id, cursor=cursor, limit=limit
+    ).model_dump(exclude={"include_registration"})
+    cache_key = "list:" + json.dumps(filters_dict, sort_keys=True, default=str)
+
+    def load_events():
+        return events_service.get_events_list(filters_dict)
+
+    if include_registration:
+        events_page = await response_cache.cached_json(
+            "events", cache_key, load_events, event_list_adapter
+        )
+
+        await bookings_service.add_registration_states(events_page["events"], user_id)
+
+        return Typed_JSON_Response(
+            events_page,
+            event_card_list_adapter,
+            headers={"Cache-Control": conditional.PRIVATE_CACHE_CONTROL},
+        )
+
+    return await response_cache.json_response(
+        "events",
+        cache_key,
+        load_events,
+        event_list_adapter,
+        request=request,
+        cache_control=conditional.PRIVATE_CACHE_CONTROL,
+    )
 
 
 @events_router.get("/{event_id}",status_code=status.HTTP_200_OK, response_model=schema.Event_Response_Schema)
 async def get_event_by_id(
-    event_id: str, user_binary_id: bytes = Depends(get_current_user)
+    event_id: UUID,
+    request: Request,
+    response: Response,
+    user_id: str = Depends(get_current_user),
 ):
-    binary_event_id = binaryConversion.str_to_binary(event_id)
+    event_id = str(event_id)
+
+    # Revalidating only reads the event's version, the detail is built on a change
+    if conditional.has_preconditions(request):
+        validators = await events_service.get_event_validators(
+            event_id, user_id
+        )
 
-    event_data = events_service.get_event_by_id(
-        byte_event_id=binary_event_id, byte_user_id=user_binary_id
+        if validators and conditional.is_not_modified(request, *validators):
+            return conditional.not_modified_response(*validators)
+
+    event_data = await events_service.get_event_by_id(
+        event_id=event_id, user_id=user_id
+    )
+
+    response.headers.update(
+        conditional.validator_headers(*events_service.event_validators(event_data))
     )
 
     return schema.Event_Response_Schema(**event_data)
 
 
 @events_router.get("/{event_id}/bookings",status_code=status.HTTP_200_OK,response_model=List[schema.Event_Bookings_Response_Schema])
-def get_event_bookings(event_id: str, creator_id: bytes = Depends(get_current_user)):
+async def get_event_bookings(event_id: UUID, creator_id: str = Depends(get_current_user)):
     
-    event_id = binaryConversion.str_to_binary(event_id)
+    event_id = str(event_id)
     
-    event_bookings = bookings_service.get_event_booking_data(
+    event_bookings = await bookings_service.get_event_booking_data(
         event_id=event_id, creator_id=creator_id
     )
     
-    if not event_bookings:
-        return []
-    
+    return Typed_JSON_Response(event_bookings or [], event_bookings_adapter)
+
 
-    return [schema.Event_Bookings_Response_Schema(**booking_data) for booking_data in event_bookings]
+@events_router.post("/{event_id}/tickets", status_code=status.HTTP_202_ACCEPTED, response_model=schema.Ticket_Pregeneration_Response_Schema)
+async def pregenerate_event_tickets(
+    event_id: UUID, creator_id: str = Depends(get_current_user)
+):
+    event_id = str(event_id)
+
+    booking_count = await bookings_service.pregenerate_event_tickets(
+        event_id=event_id, creator_id=creator_id
+    )
+
+    return schema.Ticket_Pregeneration_Response_Schema(
+        event_id=event_id, bookings=booking_count
+    )
+
+
+@events_router.get("/{event_id}/bookings/export", status_code=status.HTTP_200_OK)
+async def export_event_bookings(
+    event_id: UUID,
+    export_format: generic_enum.Export_Format_Enum = Query(
+        generic_enum.Export_Format_Enum.CSV, alias="format"
+    ),
+    creator_id: str = Depends(get_current_user),
+):
+    event_id = str(event_id)
+
+    booking_batches = await bookings_service.export_event_bookings(
+        event_id=event_id, creator_id=creator_id
+    )
+
+    return export_response(
+        export_format,
+        bookings_service.BOOKING_EXPORT_COLUMNS,
+        booking_batches,
+        filename=f"event-{event_id}-attendees",
+    )
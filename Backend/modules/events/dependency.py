@@ -1,10 +1,12 @@
 from fastapi import Form
 from datetime import datetime, date
 from typing import Optional
-from utils.cloudinary_util import upload_file
 from fastapi import File, UploadFile, HTTPException
 from pydantic import ValidationError
 
+from settings import settings
+from utils.upload_pipeline import stage_upload
+
 from modules.events.schema import (
     Event_Request_Schema,
     Event_Update_Request_Schema,
@@ -13,7 +15,6 @@ from modules.events.schema import (
 
 def get_create_event_data(
     event_name: str = Form(...),
-    image_file: UploadFile = File(...),
     event_description: str = Form(...),
     event_agenda: str = Form(...),
     event_start_date_time: datetime = Form(...),
@@ -34,26 +35,17 @@ def get_create_event_data(
     participant_type: str = Form(...),
     participant_count: int = Form(...),
 ) -> Event_Request_Schema:
-    """Extracts form data and returns an Event_Request_Schema object"""
-
-
-                            
-
-    allowed_extensions = {"image/jpeg", "image/png", "image/jpg"}
-    
-    if image_file.content_type not in allowed_extensions:
-        raise HTTPException(
-            status_code=400,
-            detail=f"Invalid file type. Only JPG and PNG images are allowed. You uploaded {image_file.content_type}.",
-        )
+    """Extracts form data and returns an Event_Request_Schema object.
 
-    event_image_url = upload_file(image_file)
+    The image is staged by get_event_image and stored once the event is saved, so
+    the event starts with the pending image URL.
+    """
 
     # Return Event Schema
     try:
         return Event_Request_Schema(
         event_name=event_name,
-        event_image_url=event_image_url,
+        event_image_url=settings.PENDING_IMAGE_URL,
         event_description=event_description,
         event_agenda=event_agenda,
         event_start_date_time=event_start_date_time,
@@ -79,20 +71,14 @@ def get_update_event_data(
     event_name: str = Form(None),
     event_description: str = Form(None),
     event_agenda: str = Form(None),
+    total_tickets: int = Form(None),
     image_file: UploadFile = File(None),
 ):
-    event_image_url= None
-                            
-    if image_file and image_file.filename:
-        allowed_extensions = {"image/jpeg", "image/png", "image/jpg"}
-        
-        if image_file.content_type not in allowed_extensions:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Invalid file type. Only JPG and PNG images are allowed. You uploaded {image_file.content_type}.",
-            )
+    event_image_url = None
 
-        event_image_url = upload_file(image_file)
+    # The new image is stored in the background, see get_event_image_update
+    if image_file and image_file.filename:
+        event_image_url = settings.PENDING_IMAGE_URL
 
     update_data = {
         "event_id": event_id,
@@ -100,6 +86,7 @@ def get_update_event_data(
         "event_description": event_description,
         "event_agenda": event_agenda,
         "event_image_url": event_image_url,
+        "total_tickets": total_tickets,
     }
 
     filtered_data = {
@@ -110,3 +97,26 @@ def get_update_event_data(
         return Event_Update_Request_Schema(**filtered_data)
     except ValidationError as e:
         raise HTTPException(status_code=422, detail=e.errors())
+
+
+async def get_event_image(image_file: UploadFile = File(...)):
+    staged_image = await stage_upload(image_file)
+
+    try:
+        yield staged_image
+    finally:
+        # Removed unless the request handed it to the upload pipeline
+        staged_image.discard()
+
+
+async def get_event_image_update(image_file: UploadFile = File(None)):
+    if not (image_file and image_file.filename):
+        yield None
+        return
+
+    staged_image = await stage_upload(image_file)
+
+    try:
+        yield staged_image
+    finally:
+        staged_image.discard()
@@ -0,0 +1,181 @@
+import asyncio
+import re
+from abc import ABC, abstractmethod
+import time
+from datetime import datetime, timedelta
+
+import httpx
+
+from fastapi import HTTPException, status
+
+from settings import settings
+from shared.cache import Single_Flight, TTL_LRU_Cache
+from shared.metrics import metrics
+
+from .models import geocode_cache_dao
+
+
+def normalize_address(address: str) -> str:
+    """Lower cases the address and drops punctuation and repeated spaces, so
+    "12, Gandhi St." and "12 gandhi st" share one cache entry."""
+    return " ".join(re.sub(r"[^\w\s]", " ", address.lower()).split())[:255]
+
+
+class Geocoding_Unavailable(Exception):
+    """The provider could not be reached or kept failing."""
+
+
+class Geocoding_Provider(ABC):
+    """Turns an address into {"latitude", "longitude"} or None when not found.
+
+    Providers get the shared httpx client, so a stub provider or a local stub
+    server (through GEOCODING_BASE_URL) can stand in for the real service.
+    """
+
+    @abstractmethod
+    async def geocode(self, client: httpx.AsyncClient, address: str):
+        """Looks the address up, called for every cache miss."""
+
+
+class Geoapify_Provider(Geocoding_Provider):
+    def __init__(self, base_url: str, api_key: str):
+        self.base_url = base_url
+        self.api_key = api_key
+
+    async def geocode(self, client: httpx.AsyncClient, address: str):
+        api_response = await client.get(
+            self.base_url, params={"text": address, "apiKey": self.api_key}
+        )
+        api_response.raise_for_status()
+
+        features = api_response.json().get("features")
+
+        if not features:
+            return None
+
+        lon, lat = features[0]["geometry"]["coordinates"]
+
+        return {"latitude": lat, "longitude": lon}
+
+
+class Geocoder:
+    """Cached geocoding: memory, then the geocode_cache table, then the provider.
+
+    Concurrent lookups of one address share a single flight, which also does the
+    database lookup so a burst of identical addresses costs one query.
+    """
+
+    RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+    def __init__(self, provider: Geocoding_Provider, cache_dao):
+        self.provider = provider
+        self.cache_dao = cache_dao
+        self.memory_cache = TTL_LRU_Cache(
+            max_size=settings.GEOCODING_CACHE_SIZE,
+            ttl_seconds=settings.GEOCODING_CACHE_TTL_SECONDS,
+        )
+        self.lookups = Single_Flight()
+        self._client = None
+
+    @property
+    def client(self):
+        # Created lazily so it binds to the running event loop
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                timeout=httpx.Timeout(
+                    settings.GEOCODING_TIMEOUT_SECONDS,
+                    connect=settings.GEOCODING_CONNECT_TIMEOUT_SECONDS,
+                ),
+                limits=httpx.Limits(
+                    max_connections=settings.GEOCODING_MAX_CONNECTIONS,
+                    max_keepalive_connections=settings.GEOCODING_MAX_CONNECTIONS,
+                ),
+            )
+
+        return self._client
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def get_coords(self, address: str):
+        normalized_address = normalize_address(address)
+
+        coords = self.memory_cache.get(normalized_address)
+
+        if coords is not None:
+            metrics.increment("geocoding.cache.memory_hit")
+            return coords
+
+        try:
+            coords = await self.lookups.run(
+                normalized_address, lambda: self._lookup(normalized_address)
+            )
+        except Geocoding_Unavailable:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Address lookup is unavailable, please try again later",
+            )
+
+        if coords is None:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail="The address could not be located",
+            )
+
+        return coords
+
+    async def _lookup(self, normalized_address: str):
+        fresh_after = datetime.now() - timedelta(
+            days=settings.GEOCODING_DB_CACHE_TTL_DAYS
+        )
+
+        coords = await self.cache_dao.get_coords(normalized_address, fresh_after)
+
+        if coords is not None:
+            metrics.increment("geocoding.cache.db_hit")
+        else:
+            metrics.increment("geocoding.cache.miss")
+
+            coords = await self._geocode(normalized_address)
+
+            if coords is None:
+                return None
+
+            await self.cache_dao.save_coords(normalized_address, coords)
+
+        self.memory_cache.set(normalized_address, coords)
+
+        return coords
+
+    async def _geocode(self, address: str):
+        attempts = settings.GEOCODING_MAX_RETRIES + 1
+
+        for attempt in range(attempts):
+            started_at = time.perf_counter()
+
+            try:
+                return await self.provider.geocode(self.client, address)
+
+            except httpx.HTTPStatusError as e:
+                if e.response.status_code not in self.RETRY_STATUS_CODES:
+                    raise Geocoding_Unavailable(str(e)) from e
+                error = e
+
+            except httpx.TransportError as e:  # timeouts and connection errors
+                error = e
+
+            finally:
+                metrics.observe("geocoding.request", time.perf_counter() - started_at)
+
+            if attempt + 1 < attempts:
+                await asyncio.sleep(settings.GEOCODING_RETRY_BACKOFF_SECONDS * 2**attempt)
+
+        raise Geocoding_Unavailable(str(error)) from error
+
+
+geocoder = Geocoder(
+    Geoapify_Provider(settings.GEOCODING_BASE_URL, settings.GEOCODING_API_KEY),
+    geocode_cache_dao,
+)
@@ -0,0 +1,47 @@
+"""Maintenance jobs for the events module.
+
+Run from the Backend folder, eg: python -m modules.events.jobs
+
+Databases created before events.tickets_sold existed need the column first:
+    ALTER TABLE events ADD COLUMN tickets_sold INT NOT NULL DEFAULT 0;
+and then one run of this job to fill it from event_bookings.
+
+Likewise event_location.geohash, used by GET /events/nearby:
+    ALTER TABLE event_location ADD COLUMN geohash VARCHAR(12) NULL;
+    CREATE INDEX ix_event_location_geohash ON event_location (geohash);
+"""
+
+import asyncio
+
+from database import engine
+
+from utils import geohash
+
+from .models import events_dao, location_dao
+
+
+async def reconcile_ticket_inventory(event_id=None):
+    """Rebuilds events.tickets_sold from event_bookings."""
+    return await events_dao.reconcile_tickets_sold(event_id)
+
+
+async def backfill_location_geohashes():
+    """Fills event_location.geohash for locations saved before the column existed."""
+    return await location_dao.fill_missing_geohashes(geohash.encode)
+
+
+async def main():
+    try:
+        reconciled_events = await reconcile_ticket_inventory()
+
+        print(f"Reconciled ticket inventory of {reconciled_events} event(s)")
+
+        geohashed_locations = await backfill_location_geohashes()
+
+        print(f"Filled the geohash of {geohashed_locations} location(s)")
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,4 +1,4 @@
-from database import Base
+from database import Base, SessionLocal, in_unit_of_work
 
 from datetime import datetime
 
@@ -15,15 +15,22 @@ from sqlalchemy import (
     ForeignKey,
     Enum,
     CheckConstraint,
-    BINARY,
     UniqueConstraint,
     BOOLEAN,
+    Index,
+    and_,
+    insert,
+    literal_column,
+    or_,
     select,
+    update,
 )
-from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 from sqlalchemy.sql import func
 
+from shared.column_types import Binary_UUID
 from shared.generic_dao import Base_Dao
+from utils.ids import new_id
 
 from modules.users.models import ProfileModel
 
@@ -31,7 +38,7 @@ from modules.users.models import ProfileModel
 class Event_Category_Model(Base):
     __tablename__ = "event_categories"
 
-    category_id = Column(Integer, autoincrement=True, nullable=True, primary_key=True)
+    category_id = Column(Integer, autoincrement=True, nullable=False, primary_key=True)
     category_name = Column(String(255), nullable=False)
     category_image_url = Column(String(255), nullable=False)
     created_at = Column(TIMESTAMP, nullable=False, server_default=func.now())
@@ -48,13 +55,25 @@ class Event_Location_Model(Base):
 
     latitude = Column(Float, nullable=False)
     longitude = Column(Float, nullable=False)
+    # utils.geohash cell of (latitude, longitude), searched by GET /events/nearby
+    geohash = Column(String(12), nullable=True, index=True)
     created_at = Column(TIMESTAMP, nullable=False, server_default=func.now())
 
 
+class Geocode_Cache_Model(Base):
+    __tablename__ = "geocode_cache"
+
+    # Address as normalized by geocoding.normalize_address
+    normalized_address = Column(String(255), primary_key=True)
+    latitude = Column(Float, nullable=False)
+    longitude = Column(Float, nullable=False)
+    geocoded_at = Column(DateTime, nullable=False)
+
+
 class Events_Model(Base):
     __tablename__ = "events"
 
-    event_id = Column(BINARY(16), nullable=True, primary_key=True)
+    event_id = Column(Binary_UUID, nullable=True, primary_key=True, default=new_id)
     event_name = Column(String(255), nullable=False)
     event_description = Column(Text, nullable=False)
     event_image_url = Column(String(255), nullable=False)
@@ -66,14 +85,29 @@ class Events_Model(Base):
     ticket_type = Column(Enum(generic_enum.Ticket_Type_Enum), nullable=False)
     ticket_fare = Column(DECIMAL(10, 2), nullable=True)
     total_tickets = Column(Integer, nullable=False)
+    # Kept in step with event_bookings by Event_Bookings_Dao.reserve_booking
+    tickets_sold = Column(Integer, nullable=False, default=0, server_default="0")
 
     participant_type = Column(Enum(generic_enum.Participant_Enum), nullable=False)
     participant_count = Column(Integer, nullable=True)
 
     created_at = Column(TIMESTAMP, nullable=False, server_default=func.now())
     updated_at = Column(
-        TIMESTAMP, nullable=True, onupdate=func.now(), server_default=func.now()
+        TIMESTAMP,
+        nullable=True,
+        onupdate=func.now(),
+        server_default=func.now(),
+        index=True,  # the search index pulls changed events by updated_at
     )  # Updates on modification
+    # Bumped by every UPDATE of the row, booking a seat included. ETags of
+    # GET /events/{event_id} are built from it, updated_at only has seconds
+    version = Column(
+        Integer,
+        nullable=False,
+        default=1,
+        server_default="1",
+        onupdate=literal_column("version") + 1,
+    )
 
     category_id = Column(
         Integer, ForeignKey("event_categories.category_id"), nullable=False, index=True
@@ -82,7 +116,7 @@ class Events_Model(Base):
         Integer, ForeignKey("event_location.location_id"), nullable=False, index=True
     )
     creator_id = Column(
-        BINARY(16), ForeignKey("users.user_id"), nullable=False, index=True
+        Binary_UUID, ForeignKey("users.user_id"), nullable=False, index=True
     )
 
     __table_args__ = (
@@ -92,21 +126,39 @@ class Events_Model(Base):
         CheckConstraint(
             "participant_count > 0", name="check_participant_count_positive"
         ),  # Ensures at least 1 ticket
+        CheckConstraint(
+            "tickets_sold >= 0 AND tickets_sold <= total_tickets",
+            name="check_tickets_sold_within_total",
+        ),  # Ensures an event is never oversold
+        # Keyset pagination of GET /events walks (event_start_date_time, event_id)
+        Index("ix_events_start_id", "event_start_date_time", "event_id"),
+        Index(
+            "ix_events_category_start_id",
+            "category_id",
+            "event_start_date_time",
+            "event_id",
+        ),
+        Index(
+            "ix_events_ticket_type_start_fare",
+            "ticket_type",
+            "event_start_date_time",
+            "ticket_fare",
+        ),
     )
 
 
 class Event_Bookings_Model(Base):
     __tablename__ = "event_bookings"
 
-    booking_id = Column(String(50), primary_key=True)
+    booking_id = Column(Binary_UUID, primary_key=True, default=new_id)
     event_id = Column(
-        BINARY(16),
+        Binary_UUID,
         ForeignKey("events.event_id", ondelete="CASCADE"),
         nullable=False,
         index=True,
     )
     attendee_id = Column(
-        BINARY(16),
+        Binary_UUID,
         ForeignKey("users.user_id", ondelete="CASCADE"),
         nullable=False,
         index=True,
@@ -118,18 +170,26 @@ class Event_Bookings_Model(Base):
 
     __table_args__ = (
         UniqueConstraint("attendee_id", "event_id", name="uq_user_event"),
+        # Covers the registration states of list views, no table reads needed
+        Index(
+            "ix_bookings_attendee_event_status",
+            "attendee_id",
+            "event_id",
+            "booking_status",
+        ),
     )
 
 
 class Event_Dao(Base_Dao):
-    def __init__(self, event_model, location_model, category_model):
+    def __init__(self, event_model, location_model, category_model, bookings_model):
         super().__init__(event_model)
         self.location_model = location_model
         self.category_model = category_model
+        self.bookings_model = bookings_model
 
-    def get_created_events(self, creator_id):
+    async def get_created_events(self, creator_id):
         try:
-            with Base_Dao.session() as db:
+            async with Base_Dao.session() as db:
                 stmt = (
                     select(
                         self.model.event_name,
@@ -159,7 +219,7 @@ class Event_Dao(Base_Dao):
                     .order_by(self.model.event_start_date_time.desc())
                 )
 
-                records_object_tuple = db.execute(stmt).mappings().all()
+                records_object_tuple = (await db.execute(stmt)).mappings().all()
 
                 if not records_object_tuple:
                     return []
@@ -170,14 +230,32 @@ class Event_Dao(Base_Dao):
         except SQLAlchemyError as e:
             raise e
 
-    def get_event_data_by_id(self, event_id):
+    async def get_event_data_by_id(self, event_id, attendee_id):
+        """Fetches the event with its location, category and the attendee's
+        registration status in a single round trip."""
+
+        is_registered = (
+            select(self.bookings_model.booking_id)
+            .where(
+                self.bookings_model.event_id == self.model.event_id,
+                self.bookings_model.attendee_id == attendee_id,
+            )
+            .correlate(self.model)
+            .exists()
+        )
+
         try:
-            with Base_Dao.session() as db:
-                event_data_tuple = (
-                    db.query(
-                        self.model,
-                        self.location_model,
+            async with Base_Dao.session() as db:
+                stmt = (
+                    select(
+                        *self._columns(),
+                        self.location_model.location_id,
+                        self.location_model.full_location,
+                        self.location_model.latitude,
+                        self.location_model.longitude,
+                        self.location_model.geohash,
                         self.category_model.category_name,
+                        is_registered.label("is_registered"),
                     )
                     .join(
                         self.location_model,
@@ -188,21 +266,98 @@ class Event_Dao(Base_Dao):
                         self.model.category_id == self.category_model.category_id,
                     )
                     .filter(self.model.event_id == event_id)
-                    .first()
+                    .limit(1)
                 )
 
-                return {
-                    **event_data_tuple[0].__dict__,
-                    **event_data_tuple[1].__dict__,
-                    "category_name": event_data_tuple[2],
-                }
+                event_data = (await db.execute(stmt)).mappings().first()
+
+                return dict(event_data) if event_data else None
 
         except SQLAlchemyError as e:
             raise e
 
-    def get_events(self):
+    async def get_event_version(self, event_id, attendee_id):
+        """Fetches only what the ETag of an event's detail depends on: its version,
+        updated_at and whether the attendee is registered."""
+
+        is_registered = (
+            select(self.bookings_model.booking_id)
+            .where(
+                self.bookings_model.event_id == self.model.event_id,
+                self.bookings_model.attendee_id == attendee_id,
+            )
+            .correlate(self.model)
+            .exists()
+        )
+
         try:
-            with Base_Dao.session() as db:
+            async with Base_Dao.session() as db:
+                stmt = (
+                    select(
+                        self.model.version,
+                        self.model.updated_at,
+                        is_registered.label("is_registered"),
+                    )
+                    .filter(self.model.event_id == event_id)
+                    .limit(1)
+                )
+
+                version_data = (await db.execute(stmt)).mappings().first()
+
+                return dict(version_data) if version_data else None
+
+        except SQLAlchemyError as e:
+            raise e
+
+    async def get_events(self, filters: dict, cursor: tuple = None, limit: int = 20):
+        """Returns one page of upcoming events ordered by (start time, event_id).
+
+        Args:
+            filters (dict): category_id, starts_after, starts_before, ticket_type,
+                min_fare and max_fare; None values are ignored
+            cursor (tuple): (event_start_date_time, event_id) of the previous page's
+                last row
+            limit (int): page size, one extra row is read to detect a next page
+
+        Returns:
+            tuple: (records_list, has_next_page)
+        """
+
+        starts_after = datetime.now()
+
+        if filters.get("starts_after"):
+            starts_after = max(starts_after, filters["starts_after"])
+
+        conditions = [self.model.event_start_date_time > starts_after]
+
+        if filters.get("starts_before"):
+            conditions.append(
+                self.model.event_start_date_time < filters["starts_before"]
+            )
+        if filters.get("category_id"):
+            conditions.append(self.model.category_id == filters["category_id"])
+        if filters.get("ticket_type"):
+            conditions.append(self.model.ticket_type == filters["ticket_type"])
+        if filters.get("min_fare") is not None:
+            conditions.append(self.model.ticket_fare >= filters["min_fare"])
+        if filters.get("max_fare") is not None:
+            conditions.append(self.model.ticket_fare <= filters["max_fare"])
+
+        if cursor:
+            cursor_start, cursor_event_id = cursor
+
+            conditions.append(
+                or_(
+                    self.model.event_start_date_time > cursor_start,
+                    and_(
+                        self.model.event_start_date_time == cursor_start,
+                        self.model.event_id > cursor_event_id,
+                    ),
+                )
+            )
+
+        try:
+            async with Base_Dao.session() as db:
                 stmt = (
                     select(
                         self.model.event_name,
@@ -228,20 +383,130 @@ class Event_Dao(Base_Dao):
                         self.category_model,
                         self.model.category_id == self.category_model.category_id,
                     )
-                    .filter(self.model.event_start_date_time > datetime.now())
+                    .filter(*conditions)
+                    .order_by(self.model.event_start_date_time, self.model.event_id)
+                    .limit(limit + 1)
                 )
 
-                records_object_tuple = db.execute(stmt).mappings().all()
-
-                if not records_object_tuple:
-                    return []
+                records_object_tuple = (await db.execute(stmt)).mappings().all()
 
                 records_list = [dict(record) for record in records_object_tuple]
 
-                return records_list
+                return records_list[:limit], len(records_list) > limit
         except SQLAlchemyError as e:
             raise e
 
+    async def get_events_in_cells(self, geohash_cells: list):
+        """Returns upcoming events whose location lies in any of the geohash cells.
+
+        Every cell is a prefix range scan over the indexed event_location.geohash.
+        """
+
+        cell_conditions = [
+            and_(
+                self.location_model.geohash >= cell,
+                self.location_model.geohash < cell + "~",
+            )
+            for cell in geohash_cells
+        ]
+
+        try:
+            async with Base_Dao.session() as db:
+                stmt = (
+                    select(
+                        self.model.event_name,
+                        self.model.event_description,
+                        self.model.event_id,
+                        self.model.event_image_url,
+                        self.model.event_agenda,
+                        self.category_model.category_name,
+                        self.model.event_start_date_time,
+                        self.model.event_end_date_time,
+                        self.model.ticket_fare,
+                        self.model.ticket_type,
+                        self.model.total_tickets,
+                        self.location_model.full_location,
+                        self.location_model.latitude,
+                        self.location_model.longitude,
+                    )
+                    .join(
+                        self.location_model,
+                        self.model.address_id == self.location_model.location_id,
+                    )
+                    .join(
+                        self.category_model,
+                        self.model.category_id == self.category_model.category_id,
+                    )
+                    .filter(
+                        or_(*cell_conditions),
+                        self.model.event_start_date_time > datetime.now(),
+                    )
+                )
+
+                records_object_tuple = (await db.execute(stmt)).mappings().all()
+
+                return [dict(record) for record in records_object_tuple]
+        except SQLAlchemyError as e:
+            raise e
+
+    async def bulk_create_events(self, event_rows: list, booking_rows: list):
+        """Inserts imported events together with their creators' bookings in one
+        transaction, so tickets_sold always matches the bookings saved."""
+
+        async with Base_Dao.session() as db:
+            try:
+                await db.execute(insert(self.model), event_rows)
+
+                if booking_rows:
+                    await db.execute(insert(self.bookings_model), booking_rows)
+
+                await self.commit(db)
+
+                return len(event_rows)
+
+            except SQLAlchemyError as e:
+                await db.rollback()
+
+                raise e
+
+    async def reconcile_tickets_sold(self, event_id=None):
+        """Rebuilds tickets_sold from event_bookings, for every event or just one.
+
+        Returns the number of events whose counter was rewritten.
+        """
+
+        bookings_count = (
+            select(func.count(self.bookings_model.booking_id))
+            .where(
+                self.bookings_model.event_id == self.model.event_id,
+                self.bookings_model.booking_status == True,
+            )
+            .correlate(self.model)
+            .scalar_subquery()
+        )
+
+        async with Base_Dao.session() as db:
+            try:
+                stmt = (
+                    update(self.model)
+                    .where(self.model.tickets_sold != bookings_count)
+                    .values(tickets_sold=bookings_count)
+                )
+
+                if event_id is not None:
+                    stmt = stmt.where(self.model.event_id == event_id)
+
+                result = await db.execute(stmt)
+
+                await self.commit(db)
+
+                return result.rowcount
+
+            except SQLAlchemyError as e:
+                await db.rollback()
+
+                raise e
+
 
 class Event_Bookings_Dao(Base_Dao):
     def __init__(self, bookings_model, event_model, profile_model):
@@ -249,19 +514,19 @@ class Event_Bookings_Dao(Base_Dao):
         self.event_model = event_model
         self.profile_model = profile_model
 
-    def get_user_bookings_by_event_ids(
+    async def get_user_bookings_by_event_ids(
         self, attendee_id, event_id_list: list
     ):  # This is used for searching bookings by event_id list
         if not event_id_list:
             return []
         try:
-            with Base_Dao.session() as db:
+            async with Base_Dao.session() as db:
                 stmt = (
                     select(
                         self.model.booking_id,
                         self.event_model.event_id,
                         self.event_model.event_name,
-                        self.event_model.event_image,
+                        self.event_model.event_image_url,
                         self.event_model.event_start_date_time,
                         self.event_model.event_end_date_time,
                         self.event_model.ticket_fare,
@@ -277,7 +542,7 @@ class Event_Bookings_Dao(Base_Dao):
                     )
                 )
 
-                bookings_tuple = db.execute(stmt).mappings().all()
+                bookings_tuple = (await db.execute(stmt)).mappings().all()
 
                 if not bookings_tuple:
                     return []
@@ -287,9 +552,52 @@ class Event_Bookings_Dao(Base_Dao):
         except SQLAlchemyError as e:
             raise e
 
-    def get_user_bookings_data(self, attendee_id):
+    async def get_registration_states(self, event_id_list: list, attendee_id=None):
+        """Seats left and the attendee's booking status of every listed event in
+        one query, the bookings are read from ix_bookings_attendee_event_status.
+
+        Returns:
+            dict: {event_id: {"available_tickets", "booking_status"}}, the status is
+            None when the attendee (or an anonymous caller) holds no booking
+        """
+
+        if not event_id_list:
+            return {}
+
+        columns = [
+            self.event_model.event_id,
+            (self.event_model.total_tickets - self.event_model.tickets_sold).label(
+                "available_tickets"
+            ),
+        ]
+
         try:
-            with Base_Dao.session() as db:
+            async with Base_Dao.session() as db:
+                if attendee_id is None:
+                    stmt = select(
+                        *columns, literal_column("NULL").label("booking_status")
+                    )
+                else:
+                    stmt = select(*columns, self.model.booking_status).outerjoin(
+                        self.model,
+                        (self.model.attendee_id == attendee_id)
+                        & (self.model.event_id == self.event_model.event_id),
+                    )
+
+                stmt = stmt.where(self.event_model.event_id.in_(event_id_list))
+
+                states = self._rows(
+                    await db.execute(stmt), generic_enum.Row_Format_Enum.SLOTS
+                )
+
+                return {state["event_id"]: state for state in states}
+
+        except SQLAlchemyError as e:
+            raise e
+
+    async def get_user_bookings_data(self, attendee_id):
+        try:
+            async with Base_Dao.session() as db:
                 stmt = (
                     select(
                         self.model.booking_id,
@@ -311,7 +619,7 @@ class Event_Bookings_Dao(Base_Dao):
                     )
                 )
 
-                bookings_tuple = db.execute(stmt).mappings().all()
+                bookings_tuple = (await db.execute(stmt)).mappings().all()
 
                 if not bookings_tuple:
                     return []
@@ -321,9 +629,9 @@ class Event_Bookings_Dao(Base_Dao):
         except SQLAlchemyError as e:
             raise e
 
-    def get_event_booking_data(self, event_id):
+    async def get_event_booking_data(self, event_id):
         try:
-            with Base_Dao.session() as db:
+            async with Base_Dao.session() as db:
                 stmt = (
                     select(
                         self.model.booking_id,
@@ -341,7 +649,7 @@ class Event_Bookings_Dao(Base_Dao):
                     )
                 )
 
-                bookings_tuple = db.execute(stmt).mappings().all()
+                bookings_tuple = (await db.execute(stmt)).mappings().all()
 
                 if not bookings_tuple:
                     return []
@@ -351,40 +659,176 @@ class Event_Bookings_Dao(Base_Dao):
         except SQLAlchemyError as e:
             raise e
 
-    def get_user_booking(self, event_id, attendee_id):
+    async def stream_event_bookings(self, event_id, batch_size: int = 1000):
+        """Yields the confirmed bookings of an event as lists of at most batch_size
+        rows, read from a server-side cursor so memory use does not grow with the
+        attendee count.
+
+        The rows are read while the response streams, after the request's session
+        has been closed, so this uses a session of its own for the whole export.
+        """
+
+        stmt = (
+            select(
+                self.model.booking_id,
+                self.profile_model.profile_id,
+                self.profile_model.first_name,
+                self.profile_model.last_name,
+                self.model.registered_at,
+                self.model.scanned_at,
+            )
+            .join(
+                self.profile_model,
+                self.model.attendee_id == self.profile_model.user_id,
+            )
+            .where(
+                self.model.event_id == event_id,
+                self.model.booking_status == True,
+            )
+            .order_by(self.model.registered_at, self.model.booking_id)
+            .execution_options(yield_per=batch_size)
+        )
+
+        try:
+            async with SessionLocal() as db:
+                bookings_stream = await db.stream(stmt)
+
+                async for bookings_batch in bookings_stream.mappings().partitions():
+                    yield bookings_batch
+
+        except SQLAlchemyError as e:
+            raise e
+
+    async def get_user_booking(self, event_id, attendee_id):
         try:
-            with Base_Dao.session() as db:
-                booking_data = (
-                    db.query(self.model)
+            async with Base_Dao.session() as db:
+                stmt = (
+                    select(*self._columns())
                     .filter(
                         self.model.event_id == event_id,
                         self.model.attendee_id == attendee_id,
                     )
-                    .first()
+                    .limit(1)
+                )
+
+                booking_data = (await db.execute(stmt)).mappings().first()
+
+                return dict(booking_data) if booking_data else None
+
+        except SQLAlchemyError as e:
+            raise e
+
+    async def reserve_booking(self, booking_data: dict, registration_time: datetime):
+        """Registration fast path: takes a seat and inserts the booking in one
+        transaction, with no reads before the write.
+
+        The seat is taken by a single conditional UPDATE which only matches a free
+        event that has not started, still has tickets and has no booking for this
+        attendee, so concurrent requests can never oversell. The uq_user_event
+        constraint backs the duplicate check when the same attendee races itself.
+
+        Returns None when nothing was reserved; the caller works out why.
+        """
+
+        event_id = booking_data["event_id"]
+        attendee_id = booking_data["attendee_id"]
+
+        already_booked = (
+            select(self.model.booking_id)
+            .where(
+                self.model.event_id == event_id,
+                self.model.attendee_id == attendee_id,
+            )
+            .exists()
+        )
+
+        async with Base_Dao.session() as db:
+            try:
+                seat_reserved = await db.execute(
+                    update(self.event_model)
+                    .where(
+                        self.event_model.event_id == event_id,
+                        self.event_model.ticket_type
+                        == generic_enum.Ticket_Type_Enum.FREE,
+                        self.event_model.event_start_date_time > registration_time,
+                        self.event_model.tickets_sold
+                        < self.event_model.total_tickets,
+                        ~already_booked,
+                    )
+                    .values(tickets_sold=self.event_model.tickets_sold + 1)
                 )
 
-                if not booking_data:
+                if seat_reserved.rowcount == 0:
+                    # Nothing was written, a unit of work carries on with its own
+                    if not in_unit_of_work():
+                        await db.rollback()
+
                     return None
 
-                return booking_data.__dict__
+                try:
+                    await db.execute(insert(self.model.__table__).values(**booking_data))
+
+                    await self.commit(db)
+                except IntegrityError:
+                    # The rollback would also discard the rest of a unit of work
+                    if in_unit_of_work():
+                        raise
+
+                    # The same attendee won a concurrent request, keep that booking
+                    await db.rollback()
+
+                    return None
+
+                return dict(booking_data)
+
+            except SQLAlchemyError as e:
+                await db.rollback()
+
+                raise e
+
+    async def get_registration_state(self, event_id, attendee_id):
+        """Fetches what decides a registration (the event's window, type and seats
+        plus the attendee's booking) in one query."""
+
+        try:
+            async with Base_Dao.session() as db:
+                stmt = (
+                    select(
+                        self.event_model.event_start_date_time,
+                        self.event_model.ticket_type,
+                        self.event_model.total_tickets,
+                        self.event_model.tickets_sold,
+                        self.model.booking_id,
+                        self.model.booking_status,
+                    )
+                    .outerjoin(
+                        self.model,
+                        (self.model.event_id == self.event_model.event_id)
+                        & (self.model.attendee_id == attendee_id),
+                    )
+                    .where(self.event_model.event_id == event_id)
+                    .limit(1)
+                )
+
+                registration_state = (await db.execute(stmt)).mappings().first()
+
+                return dict(registration_state) if registration_state else None
 
         except SQLAlchemyError as e:
             raise e
 
-    def get_event_bookings_count(
+    async def get_event_bookings_count(
         self, event_id
     ):  # This is to find the count of total bookings
         try:
-            with Base_Dao.session() as db:
-                bookings_count = (
-                    db.query(func.count(self.model.booking_id))
-                    .filter(
-                        self.model.event_id == event_id,
-                        self.model.booking_status == True,
-                    )
-                    .scalar()
+            async with Base_Dao.session() as db:
+                stmt = select(func.count(self.model.booking_id)).filter(
+                    self.model.event_id == event_id,
+                    self.model.booking_status == True,
                 )
 
+                bookings_count = (await db.execute(stmt)).scalar()
+
                 return bookings_count
 
         except SQLAlchemyError as e:
@@ -395,23 +839,145 @@ class Category_Dao(Base_Dao):
     def __init__(self, model):
         super().__init__(model)
 
-    def create_category_by_list(self, category_dict_list):
-        with Base_Dao.session() as db:
-            new_categories = [self.model(**data) for data in category_dict_list]
+    async def create_category_by_list(self, category_dict_list):
+        return await self.create_records(category_dict_list)
+
+    async def get_existing_category_ids(self, category_ids: list):
+        """Returns the subset of category_ids which exist, in one query."""
 
-            db.add_all(new_categories)
-            db.commit()
+        if not category_ids:
+            return set()
 
-            for category in new_categories:
-                db.refresh(category)
+        try:
+            async with Base_Dao.session() as db:
+                stmt = select(self.model.category_id).where(
+                    self.model.category_id.in_(category_ids)
+                )
 
-            return [category.__dict__ for category in new_categories]
+                return set((await db.execute(stmt)).scalars().all())
+        except SQLAlchemyError as e:
+            raise e
 
 
 class Location_Dao(Base_Dao):
     def __init__(self, model):
         super().__init__(model)
 
+    async def get_locations_by_full_locations(self, full_locations: list):
+        """Returns {full_location: location} for the given addresses which are
+        saved, in one query."""
+
+        if not full_locations:
+            return {}
+
+        try:
+            async with Base_Dao.session() as db:
+                stmt = select(
+                    self.model.location_id,
+                    self.model.full_location,
+                    self.model.latitude,
+                    self.model.longitude,
+                ).where(self.model.full_location.in_(full_locations))
+
+                return {
+                    location["full_location"]: dict(location)
+                    for location in (await db.execute(stmt)).mappings().all()
+                }
+        except SQLAlchemyError as e:
+            raise e
+
+    async def fill_missing_geohashes(self, encode, batch_size: int = 1000):
+        """Sets geohash on locations saved before the column existed.
+
+        Returns the number of locations updated.
+        """
+
+        updated_count = 0
+
+        async with Base_Dao.session() as db:
+            try:
+                while True:
+                    stmt = (
+                        select(
+                            self.model.location_id,
+                            self.model.latitude,
+                            self.model.longitude,
+                        )
+                        .where(self.model.geohash.is_(None))
+                        .limit(batch_size)
+                    )
+
+                    locations = (await db.execute(stmt)).all()
+
+                    if not locations:
+                        return updated_count
+
+                    await db.execute(
+                        update(self.model),
+                        [
+                            {
+                                "location_id": location.location_id,
+                                "geohash": encode(location.latitude, location.longitude),
+                            }
+                            for location in locations
+                        ],
+                    )
+
+                    await self.commit(db)
+
+                    updated_count += len(locations)
+
+            except SQLAlchemyError as e:
+                await db.rollback()
+
+                raise e
+
+
+class Geocode_Cache_Dao(Base_Dao):
+    def __init__(self, model):
+        super().__init__(model)
+
+    async def get_coords(self, normalized_address: str, geocoded_after: datetime):
+        try:
+            async with Base_Dao.session() as db:
+                stmt = select(self.model.latitude, self.model.longitude).where(
+                    self.model.normalized_address == normalized_address,
+                    self.model.geocoded_at > geocoded_after,
+                )
+
+                record = (await db.execute(stmt)).mappings().first()
+
+                return dict(record) if record else None
+        except SQLAlchemyError as e:
+            raise e
+
+    async def save_coords(self, normalized_address: str, coords: dict):
+        """Inserts or refreshes the cached coordinates of an address."""
+
+        values = {**coords, "geocoded_at": datetime.now()}
+
+        async with Base_Dao.session() as db:
+            try:
+                result = await db.execute(
+                    update(self.model)
+                    .where(self.model.normalized_address == normalized_address)
+                    .values(**values)
+                )
+
+                if result.rowcount == 0:
+                    db.add(self.model(normalized_address=normalized_address, **values))
+
+                await self.commit(db)
+
+            except IntegrityError:
+                # Another worker cached the same address first
+                await db.rollback()
+
+            except SQLAlchemyError as e:
+                await db.rollback()
+
+                raise e
+
 
 class Search_Dao(Base_Dao):
     def __init__(self, events_model, category_model, location_model):
@@ -419,9 +985,35 @@ class Search_Dao(Base_Dao):
         self.category_model = category_model
         self.location_model = location_model
 
-    def fetch_events_by_category_id(self, category_id):
+    async def fetch_search_documents(self, updated_after=None):
+        """Fetches the searchable text of events, only those changed at or after
+        updated_after when it is given."""
+
+        try:
+            async with Base_Dao.session() as db:
+                stmt = select(
+                    self.events_model.event_id,
+                    self.events_model.event_name,
+                    self.events_model.event_description,
+                    self.events_model.event_agenda,
+                    self.events_model.updated_at,
+                )
+
+                if updated_after is not None:
+                    stmt = stmt.filter(self.events_model.updated_at >= updated_after)
+
+                records_object_tuple = (await db.execute(stmt)).mappings().all()
+
+                return [dict(record) for record in records_object_tuple]
+        except SQLAlchemyError as e:
+            raise e
+
+    async def fetch_events_by_ids(self, event_id_list: list):
+        if not event_id_list:
+            return []
+
         try:
-            with Base_Dao.session() as db:
+            async with Base_Dao.session() as db:
                 stmt = (
                     select(
                         self.events_model.event_name,
@@ -448,20 +1040,12 @@ class Search_Dao(Base_Dao):
                         self.events_model.category_id
                         == self.category_model.category_id,
                     )
-                    .filter(
-                        self.events_model.event_start_date_time > datetime.now(),
-                        self.events_model.category_id == category_id,
-                    )
+                    .filter(self.events_model.event_id.in_(event_id_list))
                 )
 
-                records_object_tuple = db.execute(stmt).mappings().all()
+                records_object_tuple = (await db.execute(stmt)).mappings().all()
 
-                if not records_object_tuple:
-                    return []
-
-                records_list = [dict(record) for record in records_object_tuple]
-
-                return records_list
+                return [dict(record) for record in records_object_tuple]
         except SQLAlchemyError as e:
             raise e
 
@@ -473,5 +1057,8 @@ search_dao = Search_Dao(
 )
 category_dao = Category_Dao(Event_Category_Model)
 location_dao = Location_Dao(Event_Location_Model)
-events_dao = Event_Dao(Events_Model, Event_Location_Model, Event_Category_Model)
+geocode_cache_dao = Geocode_Cache_Dao(Geocode_Cache_Model)
+events_dao = Event_Dao(
+    Events_Model, Event_Location_Model, Event_Category_Model, Event_Bookings_Model
+)
 bookings_dao = Event_Bookings_Dao(Event_Bookings_Model, Events_Model, ProfileModel)
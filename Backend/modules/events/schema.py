@@ -1,9 +1,17 @@
-from pydantic import BaseModel, Field, model_validator, ConfigDict, ValidationError
-from typing import List
-from datetime import date, datetime
+from pydantic import (
+    BaseModel,
+    Field,
+    model_validator,
+    field_validator,
+    ConfigDict,
+    ValidationError,
+)
+from typing import Any, List
+from datetime import date, datetime, timezone
 from typing import Optional
 
 from decimal import Decimal
+from uuid import UUID
 
 from shared.generic_validation import Schema_Validation, event_request_validation
 
@@ -113,7 +121,7 @@ class Event_Request_Schema(
 
 
 class Event_Update_Request_Schema(BaseModel):
-    event_id: str = Field(...)
+    event_id: UUID = Field(...)
     event_name: str = Field(
         None,
         min_length=3,
@@ -134,23 +142,55 @@ class Event_Update_Request_Schema(BaseModel):
         pattern=r"^(http|https)://.*\.(jpg|jpeg|png|gif)$",
         description="Must be a valid image URL",
     )
+    total_tickets: int = Field(
+        None, gt=0, description="Can not be lower than the tickets already booked"
+    )
 
     @model_validator(mode="after")
     def check_at_least_one_field(self):
         return Schema_Validation.check_at_least_one_field(self)
 
 
+# Bulk import (POST /events/import) schemas
+
+# One CSV / JSON Lines row. Unlike Event_Request_Schema the values are parsed
+# first, event_request_validation then checks the whole batch
+
+
+class Event_Import_Row_Schema(
+    Event_Base_Schema, Address_Schema, Ticket_Schema, Participant_Schema
+):
+    category_id: int = Field(..., gt=0)
+
+    @field_validator("event_start_date_time", "event_end_date_time")
+    @classmethod
+    def assume_utc(cls, value: datetime):
+        # Exports often carry no offset, the validation compares against UTC now
+        return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+class Event_Import_Error_Schema(BaseModel):
+    line: int = Field(..., description="Line of the row in the uploaded file")
+    errors: List[Any] = Field(...)
+
+
+class Event_Import_Response_Schema(BaseModel):
+    imported: int
+    failed: int
+    errors: List[Event_Import_Error_Schema] = Field(default_factory=list)
+
+
 # Event table schema
 
 
 class Event_Model_Schema(Event_Base_Schema, Participant_Schema, Ticket_Schema):
-    event_id: bytes = Field(...)
+    event_id: str = Field(...)
     landmark: Optional[str] = Field(
         None, min_length=5, max_length=100, example="Near Bus Stand"
     )
     category_id: int = Field(..., gt=0)
     address_id: int = Field(..., gt=0)
-    creator_id: bytes = Field(...)
+    creator_id: str = Field(...)
 
     model_config = ConfigDict(extra="ignore")
 
@@ -175,8 +215,8 @@ class Event_Category_Model_Schema(Category_Schema):
 
 
 class Booking_Model_Schema(BaseModel):
-    event_id: bytes = Field(..., description="binary id of the event.")
-    attendee_id: bytes = Field(..., description="binary id of the attendee.")
+    event_id: str = Field(..., description="id of the event.")
+    attendee_id: str = Field(..., description="id of the attendee.")
     booking_status: bool = Field(
         ..., description="True if the attendee is confirmed, False otherwise."
     )
@@ -214,6 +254,95 @@ class Event_Base_Response_Schema(Event_Base_Schema):
     model_config = ConfigDict(extra="ignore")
 
 
+# Query parameters of GET /events
+
+
+class Event_Filter_Schema(BaseModel):
+    cursor: Optional[str] = Field(None, description="next_cursor of the previous page")
+    limit: int = Field(20, ge=1, le=100)
+    category_id: Optional[int] = Field(None, gt=0)
+    starts_after: Optional[datetime] = None
+    starts_before: Optional[datetime] = None
+    ticket_type: Optional[generic_enum.Ticket_Type_Enum] = None
+    min_fare: Optional[Decimal] = Field(None, ge=0)
+    max_fare: Optional[Decimal] = Field(None, ge=0)
+    include_registration: bool = Field(
+        False,
+        description="Adds the caller's register_state and the live available_tickets to every event",
+    )
+
+    @field_validator("starts_after", "starts_before")
+    @classmethod
+    def to_naive_local_time(cls, value: Optional[datetime]):
+        # Event times are compared with naive local timestamps in the database
+        if value and value.tzinfo:
+            return value.astimezone().replace(tzinfo=None)
+        return value
+
+
+class Event_List_Response_Schema(BaseModel):
+    events: List[Event_Base_Response_Schema] = Field(default_factory=list)
+    next_cursor: Optional[str] = Field(
+        None, description="Cursor of the next page, null on the last page"
+    )
+
+
+# List cards with the caller's registration, sent for include_registration=true
+
+
+class Event_Card_Schema(Event_Base_Response_Schema):
+    register_state: Optional[generic_enum.Registration_Status_Enum] = Field(
+        None, description="Only with include_registration=true"
+    )
+    available_tickets: Optional[int] = Field(
+        None, description="Only with include_registration=true, read live"
+    )
+
+
+class Event_Card_List_Response_Schema(BaseModel):
+    events: List[Event_Card_Schema] = Field(default_factory=list)
+    next_cursor: Optional[str] = Field(
+        None, description="Cursor of the next page, null on the last page"
+    )
+
+
+# Query parameters and response of GET /events/nearby
+
+
+class Event_Nearby_Query_Schema(BaseModel):
+    lat: float = Field(..., ge=-90, le=90)
+    lon: float = Field(..., ge=-180, le=180)
+    radius_km: float = Field(10, gt=0, le=500)
+    limit: int = Field(20, ge=1, le=100)
+
+
+class Event_Nearby_Schema(Event_Base_Response_Schema):
+    distance_km: float = Field(..., description="Distance from (lat, lon) in km")
+
+
+class Event_Nearby_Response_Schema(BaseModel):
+    events: List[Event_Nearby_Schema] = Field(
+        default_factory=list, description="Nearest first"
+    )
+
+
+# Query parameters and response of GET /events/search
+
+
+class Event_Search_Query_Schema(BaseModel):
+    q: str = Field(..., min_length=1, max_length=100, description="Search text")
+    offset: int = Field(0, ge=0)
+    limit: int = Field(20, ge=1, le=50)
+
+
+class Event_Search_Response_Schema(BaseModel):
+    events: List[Event_Base_Response_Schema] = Field(default_factory=list)
+    total: int = Field(..., description="Number of matching events")
+    next_offset: Optional[int] = Field(
+        None, description="Offset of the next page, null on the last page"
+    )
+
+
 # Event Response Schema
 
 # This is for the event response schema after login and to event details page
@@ -242,7 +371,7 @@ class Event_Update_Response_Schema(Event_Base_Schema):
 
 
 class Booking_Request_Schema(BaseModel):
-    event_id: str
+    event_id: UUID
 
 
 class Booing_Response_Schema(BaseModel):
@@ -261,12 +390,19 @@ class User_Bookings_Response_Schema(BaseModel):
     event_end_date_time: datetime
     ticket_type: generic_enum.Ticket_Type_Enum
     ticket_fare: Decimal
+    ticket_url: str
     
 # This is the schema after event registration
     
 class User_Booking_Response_Schema(BaseModel):
     booking_id : str
     register_state : generic_enum.Registration_Status_Enum
+    ticket_url : str
+
+
+class Ticket_Pregeneration_Response_Schema(BaseModel):
+    event_id: str
+    bookings: int
 
 
 class Event_Bookings_Response_Schema(BaseModel):
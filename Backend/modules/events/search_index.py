@@ -0,0 +1,206 @@
+import heapq
+import math
+import re
+from bisect import bisect_left
+from collections import Counter
+
+
+class Inverted_Index:
+    """In-process inverted index over event text, ranked with BM25.
+
+    Every field is tokenized separately and weighted, so a hit in the event name
+    counts more than one in the agenda. The last query word is also matched as a
+    prefix, which gives search-as-you-type results.
+    """
+
+    FIELD_WEIGHTS = {"event_name": 3.0, "event_description": 1.0, "event_agenda": 0.5}
+
+    # BM25 tuning constants
+    K1 = 1.2
+    B = 0.75
+
+    MAX_PREFIX_EXPANSIONS = 50
+    PREFIX_MATCH_WEIGHT = 0.8
+
+    token_pattern = re.compile(r"\w+")
+
+    def __init__(self):
+        self._postings = {}  # term -> {doc_id: weighted frequency}
+        self._doc_terms = {}  # doc_id -> terms, used to remove a document
+        self._doc_lengths = {}
+        self._total_length = 0.0
+        self._sorted_terms = []
+        self._sorted_terms_stale = False
+        self._length_norms = None  # doc_id -> K1 * length norm, rebuilt on change
+
+    def __len__(self):
+        return len(self._doc_lengths)
+
+    @classmethod
+    def tokenize(cls, text: str):
+        return cls.token_pattern.findall(text.lower()) if text else []
+
+    def add_document(self, doc_id, fields: dict):
+        """Indexes a document, replacing any previous version of it."""
+        self.remove_document(doc_id)
+
+        frequencies = Counter()
+
+        for field_name, weight in self.FIELD_WEIGHTS.items():
+            for token, count in Counter(self.tokenize(fields.get(field_name))).items():
+                frequencies[token] += count * weight
+
+        for term, frequency in frequencies.items():
+            postings = self._postings.get(term)
+
+            if postings is None:
+                postings = self._postings[term] = {}
+                self._sorted_terms_stale = True
+
+            postings[doc_id] = frequency
+
+        document_length = sum(frequencies.values())
+
+        self._doc_terms[doc_id] = tuple(frequencies)
+        self._doc_lengths[doc_id] = document_length
+        self._total_length += document_length
+        self._length_norms = None
+
+    def add_documents(self, documents):
+        for doc_id, fields in documents:
+            self.add_document(doc_id, fields)
+
+    def remove_document(self, doc_id):
+        terms = self._doc_terms.pop(doc_id, None)
+
+        if terms is None:
+            return
+
+        for term in terms:
+            postings = self._postings[term]
+            postings.pop(doc_id, None)
+
+            if not postings:
+                del self._postings[term]
+                self._sorted_terms_stale = True
+
+        self._total_length -= self._doc_lengths.pop(doc_id)
+        self._length_norms = None
+
+    def expand_prefix(self, prefix: str):
+        if self._sorted_terms_stale:
+            self._sorted_terms = sorted(self._postings)
+            self._sorted_terms_stale = False
+
+        expansions = []
+        position = bisect_left(self._sorted_terms, prefix)
+
+        while (
+            position < len(self._sorted_terms)
+            and len(expansions) < self.MAX_PREFIX_EXPANSIONS
+            and self._sorted_terms[position].startswith(prefix)
+        ):
+            expansions.append(self._sorted_terms[position])
+            position += 1
+
+        return expansions
+
+    def length_norms(self):
+        # Depends on the average length, so it is computed once per index change
+        # rather than for every posting of every query
+        if self._length_norms is None:
+            average_length = self._total_length / len(self._doc_lengths)
+
+            self._length_norms = {
+                doc_id: self.K1 * (1 - self.B + self.B * length / average_length)
+                for doc_id, length in self._doc_lengths.items()
+            }
+
+        return self._length_norms
+
+    def search(self, query: str, offset: int = 0, limit: int = 20):
+        """Returns (page of (doc_id, score) pairs best first, total matches).
+
+        A document matches when it has every query word, the last one as a prefix.
+        """
+        tokens = list(dict.fromkeys(self.tokenize(query)))
+
+        if not tokens or not self._doc_lengths:
+            return [], 0
+
+        # Each group lists the (term, match weight) pairs which satisfy one query
+        # word, exact words win over prefix expansions
+        groups = [[(token, 1.0)] for token in tokens[:-1]]
+        last_group = [(tokens[-1], 1.0)]
+
+        for term in self.expand_prefix(tokens[-1]):
+            if term != tokens[-1]:
+                last_group.append((term, self.PREFIX_MATCH_WEIGHT))
+
+        groups.append(last_group)
+
+        group_postings = []
+
+        for group in groups:
+            postings = [
+                (self._postings[term], match_weight)
+                for term, match_weight in group
+                if term in self._postings
+            ]
+
+            if not postings:
+                return [], 0
+
+            group_postings.append(postings)
+
+        # Intersect starting from the rarest word so the candidate set stays small
+        group_postings.sort(key=lambda postings: sum(len(p) for p, _ in postings))
+
+        candidates = None
+
+        for postings in group_postings:
+            matched = set().union(*(p.keys() for p, _ in postings))
+            candidates = matched if candidates is None else candidates & matched
+
+            if not candidates:
+                return [], 0
+
+        document_count = len(self._doc_lengths)
+        length_norms = self.length_norms()
+        scores = dict.fromkeys(candidates, 0.0)
+
+        for postings in group_postings:
+            for term_postings, match_weight in postings:
+                idf = math.log(
+                    1
+                    + (document_count - len(term_postings) + 0.5)
+                    / (len(term_postings) + 0.5)
+                )
+                weight = match_weight * idf * (self.K1 + 1)
+
+                if len(term_postings) <= len(scores):
+                    matches = (
+                        (doc_id, frequency)
+                        for doc_id, frequency in term_postings.items()
+                        if doc_id in scores
+                    )
+                else:
+                    matches = (
+                        (doc_id, term_postings[doc_id])
+                        for doc_id in scores
+                        if doc_id in term_postings
+                    )
+
+                for doc_id, frequency in matches:
+                    scores[doc_id] += (
+                        weight * frequency / (frequency + length_norms[doc_id])
+                    )
+
+        ranked = heapq.nlargest(
+            offset + limit, scores.items(), key=lambda item: item[1]
+        )
+
+        return ranked[offset:], len(scores)
+
+
+event_search_index = Inverted_Index()
@@ -1,8 +1,10 @@
 from . import models
 
-from uuid import uuid4
+import asyncio
+import time
+
+import numpy as np
 
-import requests
 
 from fastapi import HTTPException, status
 
@@ -10,33 +12,53 @@ from . import schema as event_schema
 
 from . import validator
 
-from shared import generic_enum
+from .geocoding import geocoder
+from .search_index import event_search_index
+
+from shared import conditional, generic_enum
 
-from utils import string_utils, binaryConversion
+from utils import string_utils
+from utils import cursor as cursor_utils
+from utils import geohash
+from utils.upload_pipeline import upload_pipeline
+from utils.ids import new_id
+from utils import qr_code
 
+from database import unit_of_work
 from settings import settings
+from shared.response_cache import response_cache
 
 from datetime import datetime
 
 
 class Category_Class:
-    def __init__(self, category_dao):
+    def __init__(self, category_dao, response_cache):
         self.category_dao = category_dao
+        self.response_cache = response_cache
 
-    def create_category(self, category_data_list: list):
+    async def create_category(self, category_data_list: list):
         category_dict_list = [
             category_data.model_dump() for category_data in category_data_list
         ]
 
-        return self.category_dao.create_category_by_list(category_dict_list)
+        new_category_list = await self.category_dao.create_category_by_list(
+            category_dict_list
+        )
 
-    def get_categories(self):
-        category_list = self.category_dao.fetch_records_from_model()
+        await self.response_cache.invalidate("categories")
+
+        return new_category_list
+
+    async def get_categories(self):
+        category_list = await self.category_dao.fetch_records_from_model(
+            fields=["category_id", "category_name", "category_image_url"],
+            row_format=generic_enum.Row_Format_Enum.SLOTS,
+        )
 
         return category_list
 
-    def get_category_by_id(self, category_id: int):
-        category_data = self.category_dao.fetch_record(
+    async def get_category_by_id(self, category_id: int):
+        category_data = await self.category_dao.fetch_record(
             field_name="category_id", field_value=category_id
         )
 
@@ -47,48 +69,39 @@ class Category_Class:
 
 
 class Location_Class:
-    def __init__(self, location_schema, location_dao):
+    def __init__(self, location_schema, location_dao, geocoder):
         self.location_schema = location_schema
         self.location_dao = location_dao
+        self.geocoder = geocoder
 
-    def get_coords(self, address: str):
-        api_key = settings.GEOCODING_API_KEY
-
-        api_url = f"https://api.geoapify.com/v1/geocode/search?text={address}&apiKey={api_key}"
-
-        try:
-            api_response = requests.get(api_url)
-            api_response.raise_for_status()
-
-            response_dict = api_response.json()
+    async def get_coords(self, address: str):
+        return await self.geocoder.get_coords(address)
 
-            lon, lat = response_dict["features"][0]["geometry"]["coordinates"]
-
-            return {"latitude": lat, "longitude": lon}
-
-        except requests.exceptions.HTTPError as http_err:
-            print(f"HTTP error occurred: {http_err}")  # Catches 4xx/5xx errors
-        except requests.exceptions.RequestException as err:
-            print(f"Request failed: {err}")  # Catches other request errors
-
-    def create_location_data(self, full_location: str):
-        coords = self.get_coords(full_location)
+    async def create_location_data(self, full_location: str):
+        coords = await self.get_coords(full_location)
 
         location_data = self.location_schema(**coords, full_location=full_location)
 
-        inserted_data = self.location_dao.create_record(location_data.model_dump())
+        inserted_data = await self.location_dao.create_record(
+            {
+                **location_data.model_dump(),
+                "geohash": geohash.encode(
+                    location_data.latitude, location_data.longitude
+                ),
+            }
+        )
 
         return inserted_data
 
-    def get_location_by_name(self, location_name):
-        location_data = self.location_dao.fetch_record(
+    async def get_location_by_name(self, location_name):
+        location_data = await self.location_dao.fetch_record(
             field_name="full_location", field_value=location_name
         )
 
         return location_data
 
-    def get_location_by_id(self, location_id):
-        location_data = self.location_dao.fetch_record(
+    async def get_location_by_id(self, location_id):
+        location_data = await self.location_dao.fetch_record(
             field_name="location_id", field_value=location_id
         )
 
@@ -96,134 +109,238 @@ class Location_Class:
 
 
 class Bookings_Class:
-    def __init__(self, bookings_dao, event_dao, time_validator):
+    def __init__(self, bookings_dao, event_dao, time_validator, ticket_renderer):
         self.bookings_dao = bookings_dao
         self.event_dao = event_dao
         self.time_validator = time_validator
+        self.ticket_renderer = ticket_renderer
 
-    def get_attendee_bookings_by_event_list(
+    async def get_attendee_bookings_by_event_list(
         self, event_id_list, attendee_id
     ):  # This is used for searching bookings by event name or event_id
-        attendee_bookings_list = self.bookings_dao.get_user_bookings_by_event_ids(
-            attendee_id, event_id_list
+        attendee_bookings_list = (
+            await self.bookings_dao.get_user_bookings_by_event_ids(
+                attendee_id, event_id_list
+            )
         )
 
         if not attendee_bookings_list:
             return []
 
-        return [
-            {**data, "event_id": binaryConversion.binary_to_str(data["event_id"])}
-            for data in attendee_bookings_list
-        ]
+        return attendee_bookings_list
 
-    def get_attendee_bookings(self, attendee_id):
-        attendee_bookings_list = self.bookings_dao.get_user_bookings_data(attendee_id)
+    async def get_attendee_bookings(self, attendee_id):
+        attendee_bookings_list = await self.bookings_dao.get_user_bookings_data(
+            attendee_id
+        )
 
         if not attendee_bookings_list:
             return []
 
         return [
-            {**data, "event_id": binaryConversion.binary_to_str(data["event_id"])}
+            {**data, "ticket_url": qr_code.create_qr_code_url(data["booking_id"])}
             for data in attendee_bookings_list
         ]
 
-    def get_attendee_booking_data(self, event_id, attendee_id):
-        booking_data = self.bookings_dao.get_user_booking(event_id, attendee_id)
+    async def get_attendee_booking_data(self, event_id, attendee_id):
+        booking_data = await self.bookings_dao.get_user_booking(event_id, attendee_id)
 
         return booking_data
 
-    def get_attendee_booking_status(self, event_id, attendee_id):
-        attendee_data = self.get_attendee_booking_data(event_id, attendee_id)
+    async def get_attendee_booking_status(self, event_id, attendee_id):
+        attendee_data = await self.get_attendee_booking_data(event_id, attendee_id)
 
         if not attendee_data:
             return generic_enum.Registration_Status_Enum.NOT_REGISTERED.value
 
         return generic_enum.Registration_Status_Enum.REGISTERED.value
 
-    def get_available_bookings(self, event_id, total_tickets):
-        bookings_count = self.bookings_dao.get_event_bookings_count(event_id)
+    def get_available_bookings(self, event_data: dict):
+        return event_data["total_tickets"] - event_data["tickets_sold"]
 
-        available_tickets = total_tickets - bookings_count
+    async def add_registration_states(self, events_list: list, attendee_id=None):
+        """Adds the caller's register_state and the live available_tickets to list
+        cards (with str event ids), reading them for the whole list in one query."""
+        registration_states = await self.bookings_dao.get_registration_states(
+            [event_data["event_id"] for event_data in events_list], attendee_id
+        )
 
-        return available_tickets
+        for event_data in events_list:
+            registration_state = registration_states.get(event_data["event_id"])
 
-    def get_event_booking_data(self, event_id, creator_id):
-        validator.events_validator.validate_event_exists(event_id)
+            # Deleted since the list was cached
+            if registration_state is None:
+                continue
 
-        validator.creator_validator.validate_creator_match(event_id, creator_id)
+            event_data["register_state"] = (
+                generic_enum.Registration_Status_Enum.REGISTERED.value
+                if registration_state["booking_status"]
+                else generic_enum.Registration_Status_Enum.NOT_REGISTERED.value
+            )
+            event_data["available_tickets"] = registration_state["available_tickets"]
 
-        event_bookings_list = self.bookings_dao.get_event_booking_data(event_id)
+        return events_list
 
-        if not event_bookings_list:
-            return []
-        return [
-            {**data, "profile_id": binaryConversion.binary_to_str(data["profile_id"])}
-            for data in event_bookings_list
-        ]
+    async def get_event_booking_data(self, event_id, creator_id):
+        await validator.creator_validator.validate_creator_match(event_id, creator_id)
+
+        event_bookings_list = await self.bookings_dao.get_event_booking_data(event_id)
+
+        return event_bookings_list or []
+
+    # Columns of the attendee list export, in order
+    BOOKING_EXPORT_COLUMNS = [
+        "booking_id",
+        "profile_id",
+        "first_name",
+        "last_name",
+        "registered_at",
+        "scanned_at",
+    ]
+
+    async def export_event_bookings(self, event_id, creator_id):
+        """Checks the creator, then returns an async iterator of booking batches
+        which reads the attendee list while it is being sent."""
+        await validator.creator_validator.validate_creator_match(event_id, creator_id)
+
+        return self._export_booking_batches(event_id)
+
+    async def _export_booking_batches(self, event_id):
+        async for bookings_batch in self.bookings_dao.stream_event_bookings(
+            event_id, batch_size=settings.EXPORT_BATCH_SIZE
+        ):
+            yield [
+                {
+                    **booking,
+                    "registered_at": booking["registered_at"].isoformat(),
+                    "scanned_at": booking["scanned_at"]
+                    and booking["scanned_at"].isoformat(),
+                }
+                for booking in bookings_batch
+            ]
+
+    async def register_attendee(self, event_id, attendee_id):
+        """Registers the attendee, idempotent on (attendee_id, event_id).
+
+        Registering again returns the existing booking with is_new_booking False.
+        """
+        await validator.participant_validator.check_profile_exists(attendee_id)
 
-    def register_attendee(self, event_id, attendee_id):
-        validator.participant_validator.check_profile_exists(attendee_id)
+        registration_time = datetime.now()
 
-        event_data = self.event_dao.fetch_record(
-            field_name="event_id", field_value=event_id
+        booking_data = event_schema.Booking_Model_Schema(
+            event_id=event_id,
+            attendee_id=attendee_id,
+            booking_status=True,
+            registered_at=registration_time,
         )
 
-        if not event_data:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND, detail="The event is not found"
-            )
+        new_booking = await self.bookings_dao.reserve_booking(
+            {**booking_data.model_dump(), "booking_id": new_id()},
+            registration_time=registration_time,
+        )
 
-        self.time_validator.event_registration_expiry_check(
-            event_start_date_time=event_data["event_start_date_time"]
+        if new_booking:
+            return {
+                "booking_id": new_booking["booking_id"],
+                "register_state": generic_enum.Registration_Status_Enum.REGISTERED.value,
+                "ticket_url": qr_code.create_qr_code_url(new_booking["booking_id"]),
+                "is_new_booking": True,
+            }
+
+        return await self.resolve_failed_registration(event_id, attendee_id)
+
+    async def add_creator_booking(self, event_id, creator_id):
+        """Books the creator into their new event. The seat is already counted in
+        the event's tickets_sold, so this only inserts the booking."""
+        booking_data = event_schema.Booking_Model_Schema(
+            event_id=event_id,
+            attendee_id=creator_id,
+            booking_status=True,
+            registered_at=datetime.now(),
         )
 
-        available_tickets = self.get_available_bookings(
-            event_data["event_id"], event_data["total_tickets"]
+        return await self.bookings_dao.create_record(
+            {**booking_data.model_dump(), "booking_id": new_id()}
         )
 
-        ticket_type = event_data["ticket_type"]
+    async def resolve_failed_registration(self, event_id, attendee_id):
+        """Explains why reserve_booking took no seat, or returns the booking the
+        attendee already holds."""
+        registration_state = await self.bookings_dao.get_registration_state(
+            event_id, attendee_id
+        )
 
-        if available_tickets == 0:
+        if not registration_state:
             raise HTTPException(
-                status_code=status.HTTP_409_CONFLICT,
-                detail="There are no tickets available for this event",
+                status_code=status.HTTP_404_NOT_FOUND, detail="The event is not found"
             )
 
-        booking_data = self.get_attendee_booking_data(event_id, attendee_id)
+        if registration_state["booking_id"] and registration_state["booking_status"]:
+            return {
+                "booking_id": registration_state["booking_id"],
+                "register_state": generic_enum.Registration_Status_Enum.REGISTERED.value,
+                "ticket_url": qr_code.create_qr_code_url(registration_state["booking_id"]),
+                "is_new_booking": False,
+            }
+
+        self.time_validator.event_registration_expiry_check(
+            event_start_date_time=registration_state["event_start_date_time"]
+        )
+
+        if registration_state["ticket_type"] == generic_enum.Ticket_Type_Enum.PAID:
+            raise HTTPException(
+                status_code=status.HTTP_501_NOT_IMPLEMENTED,
+                detail="Registration for paid events is not available yet",
+            )
 
-        if booking_data and booking_data["booking_status"]:
+        if self.get_available_bookings(registration_state) <= 0:
             raise HTTPException(
                 status_code=status.HTTP_409_CONFLICT,
-                detail="You already registered in this event",
+                detail="There are no tickets available for this event",
             )
 
-        elif booking_data:
-            pass  # connect this with transaction
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="The registration could not be completed, please try again",
+        )
+
+    async def get_ticket_payload(self, booking_id, attendee_id):
+        """Signed QR payload of the attendee's booking, 404 for anyone else's."""
+        booking_data = await self.bookings_dao.fetch_record(
+            field_name="booking_id",
+            field_value=booking_id,
+            fields=["event_id", "attendee_id", "booking_status"],
+        )
 
-        elif ticket_type == generic_enum.Ticket_Type_Enum.FREE:
-            booking_data = event_schema.Booking_Model_Schema(
-                event_id=event_id,
-                attendee_id=attendee_id,
-                booking_status=True,
-                registered_at=datetime.now(),
+        if (
+            not booking_data
+            or booking_data["attendee_id"] != attendee_id
+            or not booking_data["booking_status"]
+        ):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="The booking is not found"
             )
 
-            booking_uuid = uuid4()
+        return qr_code.sign_ticket(booking_id, booking_data["event_id"])
 
-            updated_booking_data = {
-                **booking_data.model_dump(),
-                "booking_id": booking_uuid,
-            }
+    async def pregenerate_event_tickets(self, event_id, creator_id):
+        """Renders the PNG tickets of every booking of the event in the background,
+        for organisers to call when registrations close. Returns the booking count."""
+        await validator.creator_validator.validate_creator_match(event_id, creator_id)
 
-            new_booking = self.bookings_dao.create_record(updated_booking_data)
+        bookings = await self.bookings_dao.fetch_records_where(
+            {"event_id": event_id, "booking_status": True},
+            fields=["booking_id"],
+            row_format=generic_enum.Row_Format_Enum.TUPLE,
+        )
 
-            return {
-                "booking_id": new_booking["booking_id"],
-                "register_state": generic_enum.Registration_Status_Enum.REGISTERED.value,
-            }
+        self.ticket_renderer.submit_pregeneration(
+            [qr_code.sign_ticket(booking_id, event_id) for (booking_id,) in bookings],
+            generic_enum.Ticket_Format_Enum.PNG,
+        )
 
-        elif ticket_type == generic_enum.Ticket_Type_Enum.PAID:
-            pass  # Will write later
+        return len(bookings)
 
 
 # Events Related Class
@@ -235,17 +352,40 @@ class Events_Class:
         location_service,
         bookings_service,
         category_service,
+        search_service,
         event_dao,
         events_validator,
+        upload_pipeline,
+        response_cache,
     ):
         self.location_service = location_service
         self.bookings_service = bookings_service
         self.category_service = category_service
+        self.search_service = search_service
         self.event_dao = event_dao
         self.event_validator = events_validator
+        self.upload_pipeline = upload_pipeline
+        self.response_cache = response_cache
+
+    def store_event_image(self, event_id: str, staged_image):
+        """Uploads the image in the background and then replaces the pending URL."""
+
+        async def set_event_image(image_url: str):
+            await self.event_dao.update_where(
+                {"event_image_url": image_url}, {"event_id": event_id}
+            )
+
+            await self.response_cache.invalidate("events")
+
+        self.upload_pipeline.submit(staged_image, set_event_image)
 
-    def create_event(self, event_data: dict, creator_id):
-        self.event_validator.validate_event_authorization(event_data, creator_id)
+    async def create_event(self, event_data: dict, creator_id, event_image=None):
+        await self.event_validator.validate_event_authorization(
+            event_data, creator_id
+        )
+
+        # Creators are booked into their free events
+        await validator.participant_validator.check_profile_exists(creator_id)
 
         full_address = string_utils.create_full_address(
             {
@@ -257,7 +397,7 @@ class Events_Class:
             }
         )
 
-        category_data = self.category_service.get_category_by_id(
+        category_data = await self.category_service.get_category_by_id(
             event_data["category_id"]
         )
 
@@ -267,12 +407,14 @@ class Events_Class:
                 detail=f"The requested category {event_data['category_id']} id is not exists",
             )
 
-        address_data = self.location_service.get_location_by_name(full_address)
+        address_data = await self.location_service.get_location_by_name(full_address)
 
         if not address_data:
-            address_data = self.location_service.create_location_data(full_address)
+            address_data = await self.location_service.create_location_data(
+                full_address
+            )
 
-        event_id = binaryConversion.str_to_binary(str(uuid4()))
+        event_id = new_id()
 
         event_schema_object = event_schema.Event_Model_Schema(
             **event_data,
@@ -281,14 +423,28 @@ class Events_Class:
             event_id=event_id,
         )
 
-        new_event_dict = self.event_dao.create_record(event_schema_object.model_dump())
+        event_row = event_schema_object.model_dump()
 
-        # default attendee
-        self.bookings_service.register_attendee(new_event_dict["event_id"], creator_id)
+        # Paid registration is not available yet, so only free events hold a seat
+        is_free = event_row["ticket_type"] == generic_enum.Ticket_Type_Enum.FREE
 
-        new_event_dict["event_id"] = binaryConversion.binary_to_str(
-            new_event_dict["event_id"]
-        )
+        # The event and the creator's booking are saved together or not at all
+        async with unit_of_work():
+            new_event_dict = await self.event_dao.create_record(
+                {**event_row, "tickets_sold": 1 if is_free else 0}
+            )
+
+            if is_free:
+                await self.bookings_service.add_creator_booking(
+                    new_event_dict["event_id"], creator_id
+                )
+
+        self.search_service.index_event(new_event_dict)
+
+        await self.response_cache.invalidate("events")
+
+        if event_image:
+            self.store_event_image(new_event_dict["event_id"], event_image)
 
         new_event_dict["category_name"] = category_data["category_name"]
 
@@ -296,7 +452,9 @@ class Events_Class:
             ticket_type=event_data["ticket_type"],
             ticket_fare=event_data["ticket_fare"],
             total_tickets=event_data["total_tickets"],
-            available_tickets=event_data["total_tickets"] - 1,
+            available_tickets=(
+                event_data["total_tickets"] - new_event_dict["tickets_sold"]
+            ),
         )
 
         address_details = event_schema.Address_Response_Schema(
@@ -306,34 +464,65 @@ class Events_Class:
             participant_type=new_event_dict["participant_type"],
             participant_count=new_event_dict["participant_count"],
         )
+        register_state = (
+            generic_enum.Registration_Status_Enum.REGISTERED
+            if is_free
+            else generic_enum.Registration_Status_Enum.NOT_REGISTERED
+        )
+
         return {
             **new_event_dict,
-            "register_state": generic_enum.Registration_Status_Enum.REGISTERED.value,
+            "register_state": register_state.value,
             "address_details": address_details,
             "ticket_details": ticket_response,
             "participant_details": participant_details,
         }
 
-    def update_event(self, update_data: dict, creator_id):
-        event_binary_id = binaryConversion.str_to_binary(update_data["event_id"])
+    async def update_event(self, update_data: dict, creator_id, event_image=None):
+        event_id = update_data["event_id"] = str(update_data["event_id"])
 
-        validator.events_validator.validate_event_exists(event_binary_id)
-        validator.creator_validator.validate_creator_match(
-            event_id=event_binary_id, creator_id=creator_id
+        await validator.creator_validator.validate_creator_match(
+            event_id=event_id, creator_id=creator_id
         )
 
-        update_data["event_id"] = event_binary_id
-
         filtered_data = {
             f"{key}": value for key, value in update_data.items() if value is not None
         }
 
-        updated_data = self.event_dao.update_record(
-            data=filtered_data, field_name="event_id", field_value=event_binary_id
+        # Seats are checked by the UPDATE itself, a registration can not slip in between
+        seat_conditions = (
+            [self.event_dao.model.tickets_sold <= filtered_data["total_tickets"]]
+            if "total_tickets" in filtered_data
+            else None
+        )
+
+        updated_data = await self.event_dao.update_record(
+            data=filtered_data,
+            field_name="event_id",
+            field_value=event_id,
+            conditions=seat_conditions,
+        )
+
+        # The creator check found the event, so only the seat condition can fail
+        if updated_data is None:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="total_tickets can not be lower than the tickets already booked",
+            )
+
+        self.search_service.index_event(updated_data)
+
+        await self.response_cache.invalidate("events")
+
+        if event_image:
+            self.store_event_image(event_id, event_image)
+
+        location_data = await self.location_service.get_location_by_id(
+            updated_data["address_id"]
         )
 
         address_details = event_schema.Address_Response_Schema(
-            **self.location_service.get_location_by_id(updated_data["address_id"]),
+            **location_data,
             landmark=updated_data["landmark"],
         )
 
@@ -342,9 +531,7 @@ class Events_Class:
             participant_count=updated_data["participant_count"],
         )
 
-        available_tickets = self.bookings_service.get_available_bookings(
-            updated_data["event_id"], updated_data["total_tickets"]
-        )
+        available_tickets = self.bookings_service.get_available_bookings(updated_data)
 
         ticket_details = event_schema.Ticket_Response_Schema(
             ticket_type=updated_data["ticket_type"],
@@ -353,8 +540,8 @@ class Events_Class:
             available_tickets=available_tickets,
         )
 
-        booking_status = self.bookings_service.get_attendee_booking_status(
-            event_binary_id, creator_id
+        booking_status = await self.bookings_service.get_attendee_booking_status(
+            event_id, creator_id
         )
 
         return {
@@ -365,22 +552,83 @@ class Events_Class:
             "register_state": booking_status,
         }
 
-    def get_events_list(self):
-        events_list = self.event_dao.get_events()
+    async def get_events_list(self, filters: dict):
+        cursor = filters.pop("cursor", None)
+        limit = filters.pop("limit")
+
+        events_list, has_next_page = await self.event_dao.get_events(
+            filters,
+            cursor=cursor_utils.decode_cursor(cursor) if cursor else None,
+            limit=limit,
+        )
+
+        next_cursor = None
+
+        if has_next_page:
+            last_event = events_list[-1]
+
+            next_cursor = cursor_utils.encode_cursor(
+                last_event["event_start_date_time"], last_event["event_id"]
+            )
+
+        return {
+            "events": events_list,
+            "next_cursor": next_cursor,
+        }
+
+    async def get_nearby_events(
+        self, latitude: float, longitude: float, radius_km: float, limit: int
+    ):
+        candidates = await self.event_dao.get_events_in_cells(
+            geohash.covering_cells(latitude, longitude, radius_km)
+        )
+
+        if not candidates:
+            return {"events": []}
+
+        # The cells overshoot the circle, exact distances trim and order the rest
+        distances = geohash.haversine_km(
+            latitude,
+            longitude,
+            [event_data["latitude"] for event_data in candidates],
+            [event_data["longitude"] for event_data in candidates],
+        )
+
+        within_radius = np.flatnonzero(distances <= radius_km)
+        nearest = within_radius[np.argsort(distances[within_radius], kind="stable")]
 
-        if events_list:
-            return [
+        return {
+            "events": [
                 {
-                    **event_data,
-                    "event_id": binaryConversion.binary_to_str(event_data["event_id"]),
+                    **candidates[position],
+                    "distance_km": round(float(distances[position]), 3),
                 }
-                for event_data in events_list
+                for position in nearest[:limit]
             ]
+        }
+
+    @staticmethod
+    def event_validators(event_data: dict):
+        """ETag and Last-Modified of an event's detail as seen by one attendee.
+
+        Booking a seat bumps the event's version, so the attendee's register_state
+        and the available tickets are covered too.
+        """
+        etag = conditional.make_etag(
+            event_data["version"],
+            event_data["updated_at"],
+            bool(event_data["is_registered"]),
+        )
 
-        return []
+        return etag, event_data["updated_at"]
 
-    def get_event_by_id(self, byte_event_id, byte_user_id):
-        event_data = self.event_dao.get_event_data_by_id(byte_event_id)
+    async def get_event_validators(self, event_id, user_id):
+        version_data = await self.event_dao.get_event_version(event_id, user_id)
+
+        return self.event_validators(version_data) if version_data else None
+
+    async def get_event_by_id(self, event_id, user_id):
+        event_data = await self.event_dao.get_event_data_by_id(event_id, user_id)
 
         if not event_data:
             raise HTTPException(
@@ -388,13 +636,13 @@ class Events_Class:
                 detail=f"The Event with this ({event_data}) is not exist",
             )
 
-        booking_status = self.bookings_service.get_attendee_booking_status(
-            byte_event_id, byte_user_id
+        booking_status = (
+            generic_enum.Registration_Status_Enum.REGISTERED.value
+            if event_data["is_registered"]
+            else generic_enum.Registration_Status_Enum.NOT_REGISTERED.value
         )
 
-        available_tickets = self.bookings_service.get_available_bookings(
-            event_data["event_id"], event_data["total_tickets"]
-        )
+        available_tickets = self.bookings_service.get_available_bookings(event_data)
 
         ticket_details = event_schema.Ticket_Response_Schema(
             ticket_type=event_data["ticket_type"],
@@ -415,7 +663,6 @@ class Events_Class:
             landmark=event_data["landmark"],
         )
 
-        event_data["event_id"] = binaryConversion.binary_to_str(event_data["event_id"])
         return {
             **event_data,
             "address_details": address_details,
@@ -424,57 +671,125 @@ class Events_Class:
             "register_state": booking_status,
         }
 
-    def get_created_events(self, creator_id):
-        events_list = self.event_dao.get_created_events(creator_id)
-
-        if events_list:
-            return [
-                {
-                    **event_data,
-                    "event_id": binaryConversion.binary_to_str(event_data["event_id"]),
-                }
-                for event_data in events_list
-            ]
-
-        return []
+    async def get_created_events(self, creator_id):
+        return await self.event_dao.get_created_events(creator_id) or []
 
 
 class Search_Service:
-    def __init__(self, search_dao):
+    def __init__(self, search_dao, search_index):
         self.search_dao = search_dao
+        self.search_index = search_index
+        self.index_watermark = None  # latest updated_at loaded into the index
+        self.index_refreshed_at = None
+        self.index_lock = asyncio.Lock()
+        self.indexed_during_load = None  # events indexed while a full load runs
+
+    def index_event(self, event_data: dict):
+        self.search_index.add_document(event_data["event_id"], event_data)
+
+        if self.indexed_during_load is not None:
+            self.indexed_during_load.append(event_data)
+
+    async def refresh_search_index(self):
+        """Pulls events changed since the last refresh into the search index.
+
+        The first call loads every event. Events written by this worker are indexed
+        straight away by index_event; this picks up writes made by other workers.
+        """
+        async with self.index_lock:
+            if (
+                self.index_refreshed_at is not None
+                and time.monotonic() - self.index_refreshed_at
+                < settings.SEARCH_INDEX_REFRESH_SECONDS
+            ):
+                return
+
+            documents = await self.search_dao.fetch_search_documents(
+                updated_after=self.index_watermark
+            )
 
-    def get_events_by_category_id(self, category_id):
-        events_list = self.search_dao.fetch_events_by_category_id(category_id)
+            if self.index_watermark is None:
+                # The full load is built off the event loop and swapped in whole
+                search_index = type(self.search_index)()
+                self.indexed_during_load = []
+
+                try:
+                    await asyncio.to_thread(
+                        search_index.add_documents,
+                        [(document["event_id"], document) for document in documents],
+                    )
+
+                    self.search_index = search_index
+                finally:
+                    indexed_during_load, self.indexed_during_load = (
+                        self.indexed_during_load,
+                        None,
+                    )
+
+                for event_data in indexed_during_load:
+                    self.index_event(event_data)
+            else:
+                for document in documents:
+                    self.index_event(document)
+
+            for document in documents:
+                if document["updated_at"] and (
+                    self.index_watermark is None
+                    or document["updated_at"] > self.index_watermark
+                ):
+                    self.index_watermark = document["updated_at"]
+
+            self.index_refreshed_at = time.monotonic()
+
+    async def search_events(self, query: str, offset: int, limit: int):
+        await self.refresh_search_index()
+
+        ranked_events, total = self.search_index.search(query, offset, limit)
+
+        event_id_list = [event_id for event_id, _ in ranked_events]
+
+        events_by_id = {
+            event_data["event_id"]: event_data
+            for event_data in await self.search_dao.fetch_events_by_ids(event_id_list)
+        }
 
-        if events_list:
-            return [
-                {
-                    **event_data,
-                    "event_id": binaryConversion.binary_to_str(event_data["event_id"]),
-                }
-                for event_data in events_list
-            ]
+        # An event deleted since it was indexed is skipped
+        events_list = [
+            events_by_id[event_id]
+            for event_id in event_id_list
+            if event_id in events_by_id
+        ]
+
+        next_offset = offset + limit if offset + limit < total else None
 
-        return []
+        return {"events": events_list, "total": total, "next_offset": next_offset}
 
 
 events_validator = validator.events_validator
 
-search_service = Search_Service(search_dao=models.search_dao)
+search_service = Search_Service(
+    search_dao=models.search_dao, search_index=event_search_index
+)
 
-category_service = Category_Class(models.category_dao)
+category_service = Category_Class(models.category_dao, response_cache)
 bookings_service = Bookings_Class(
-    models.bookings_dao, models.events_dao, validator.time_validator
+    models.bookings_dao,
+    models.events_dao,
+    validator.time_validator,
+    qr_code.ticket_renderer,
 )
 location_service = Location_Class(
-    event_schema.Event_Location_Model_Schema, models.location_dao
+    event_schema.Event_Location_Model_Schema, models.location_dao, geocoder
 )
 events_service = Events_Class(
     location_service,
     bookings_service,
     category_service,
+    search_service,
     models.events_dao,
     events_validator,
+    upload_pipeline,
+    response_cache,
 )
 
 __all__ = ["category_service", "location_service", "events_service"]
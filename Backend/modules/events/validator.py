@@ -20,9 +20,9 @@ class Participant_Validator_Class:
         self.event_bookings_dao = event_bookings_dao
         self.profile_dao = profile_dao
 
-    def check_profile_exists(self, attendee_id):
-        profile = profile_dao.fetch_record(
-            field_name="user_id", field_value=attendee_id
+    async def check_profile_exists(self, attendee_id):
+        profile = await profile_dao.fetch_record(
+            field_name="user_id", field_value=attendee_id, fields=["profile_id"]
         )
 
         if not profile:
@@ -31,8 +31,10 @@ class Participant_Validator_Class:
                 detail="Only Profile holders can register in the events",
             )
 
-    def is_already_registered(self, event_id, user_id):
-        booking_data = self.event_bookings_dao.get_booking_data(user_id, event_id)
+    async def is_already_registered(self, event_id, user_id):
+        booking_data = await self.event_bookings_dao.get_booking_data(
+            user_id, event_id
+        )
 
         if booking_data:
             raise HTTPException(
@@ -46,15 +48,17 @@ class Creator_Validator_Class:
         self.user_profile_dao = user_profile_dao
         self.events_dao = events_dao
 
-    def is_merchant_id_exists(self, creator_id):
-        creator_profile = self.user_profile_dao.get_user_profile(creator_id)
+    async def is_merchant_id_exists(self, creator_id):
+        creator_profile = await self.user_profile_dao.fetch_record(
+            field_name="user_id", field_value=creator_id, fields=["merchant_id"]
+        )
 
         if not creator_profile:
             raise HTTPException(
                 status_code=403, detail="User profile is required to create an event."
             )
 
-        merchant_id = creator_profile.merchant_id
+        merchant_id = creator_profile["merchant_id"]
 
         if not merchant_id:
             raise HTTPException(
@@ -62,11 +66,17 @@ class Creator_Validator_Class:
                 detail="User should enter their razorpay merchant id to create a paid events to receive money from participants",
             )
 
-    def validate_creator_match(self, event_id, creator_id):
-        event = self.events_dao.fetch_record(
-            field_name="event_id", field_value=event_id
+    async def validate_creator_match(self, event_id, creator_id):
+        event = await self.events_dao.fetch_record(
+            field_name="event_id", field_value=event_id, fields=["creator_id"]
         )
 
+        if not event:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Event not exist to see the booking data",
+            )
+
         if event["creator_id"] != creator_id:
            raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
@@ -80,14 +90,16 @@ class Events_Validator_Class:
         self.time_validator = time_validator
         self.creator_validator = creator_validator
 
-    def validate_event_authorization(self, event_data: dict, creator_id: bytes):
+    async def validate_event_authorization(self, event_data: dict, creator_id: str):
         event_ticket_type = event_data["ticket_type"]
 
         if event_ticket_type == generic_enum.Ticket_Type_Enum.PAID:
-            self.creator_validator.is_merchant_id_exists(creator_id)
+            await self.creator_validator.is_merchant_id_exists(creator_id)
 
-    def validate_event_exists(self, event_id):
-        event = self.event_dao.fetch_record(field_name="event_id", field_value=event_id)
+    async def validate_event_exists(self, event_id):
+        event = await self.event_dao.fetch_record(
+            field_name="event_id", field_value=event_id, fields=["event_id"]
+        )
 
         if not event:
             raise HTTPException(
@@ -11,7 +11,7 @@ from fastapi import (
 
 from . import schema
 
-from utils import binaryConversion
+from uuid import UUID
 
 from .models import Auth_Dao
 
@@ -21,7 +21,16 @@ from .validator import Auth_Validator
 
 from middlewares.protected_dependency import get_current_user
 
-from .dependency import get_profile_create_data, get_profile_update_data
+from .dependency import (
+    get_profile_create_data,
+    get_profile_update_data,
+    get_profile_image,
+    get_profile_image_update,
+)
+
+from utils.upload_pipeline import Staged_Upload
+
+from shared import conditional
 
 users_router = APIRouter()
 
@@ -33,7 +42,7 @@ users_router = APIRouter()
 async def register_user(
     response: Response, register_credentials: schema.Auth_Request_Schema
 ):
-    response_details = Authentication_Service.register_user(
+    response_details = await Authentication_Service.register_user(
         register_credentials.model_dump()
     )
 
@@ -52,7 +61,7 @@ async def register_user(
 async def signin_user(
     response: Response, authenticate_credentials: schema.Auth_Request_Schema
 ):
-    response_details = Authentication_Service.authenticate_user(
+    response_details = await Authentication_Service.authenticate_user(
         authenticate_credentials.model_dump()
     )
 
@@ -75,18 +84,38 @@ async def create_profile(
     profile_data: schema.Profile_Create_Request_Schema = Depends(
         get_profile_create_data
     ),
-    user_binary_id: bytes = Depends(get_current_user),
+    profile_photo: Staged_Upload = Depends(get_profile_image),
+    user_id: str = Depends(get_current_user),
 ):
-    response_details = User_Profile_Service.create_profile(
-        profile_data.model_dump(), user_binary_id
+    response_details = await User_Profile_Service.create_profile(
+        profile_data.model_dump(), user_id, profile_photo=profile_photo
     )
 
     return schema.Profile_Response_Schema(**response_details)
 
 
 @users_router.get("/profile", response_model=schema.Profile_Response_Schema)
-async def get_profile(user_binary_id: bytes = Depends(get_current_user)):
-    user_profile = User_Profile_Service.get_profile(user_binary_id)
+async def get_profile(
+    request: Request,
+    response: Response,
+    user_id: str = Depends(get_current_user),
+):
+    # Revalidating only reads the profile's version, merchant_id is decrypted on a change
+    if conditional.has_preconditions(request):
+        validators = await User_Profile_Service.get_profile_validators(
+            "user_id", user_id
+        )
+
+        if validators and conditional.is_not_modified(request, *validators):
+            return conditional.not_modified_response(*validators)
+
+    user_profile = await User_Profile_Service.get_profile(user_id)
+
+    response.headers.update(
+        conditional.validator_headers(
+            *User_Profile_Service.profile_validators(user_profile)
+        )
+    )
 
     return schema.Profile_Response_Schema(**user_profile)
 
@@ -96,10 +125,11 @@ async def patch_profile(
     updated_data: schema.Profile_Update_Request_Schema = Depends(
         get_profile_update_data
     ),
-    user_binary_id: str = Depends(get_current_user),
+    profile_photo: Staged_Upload | None = Depends(get_profile_image_update),
+    user_id: str = Depends(get_current_user),
 ):
-    updated_response = User_Profile_Service.update_profile(
-        updated_data.model_dump(), user_binary_id
+    updated_response = await User_Profile_Service.update_profile(
+        updated_data.model_dump(), user_id, profile_photo=profile_photo
     )
 
     return schema.Profile_Response_Schema(**updated_response)
@@ -110,20 +140,37 @@ async def update_profile(
     updated_data: schema.Profile_Update_Request_Schema = Depends(
         get_profile_update_data
     ),
-    user_binary_id: bytes = Depends(get_current_user),
+    profile_photo: Staged_Upload | None = Depends(get_profile_image_update),
+    user_id: str = Depends(get_current_user),
 ):
-    updated_response = User_Profile_Service.update_profile(
-        updated_data.model_dump(), user_binary_id
+    updated_response = await User_Profile_Service.update_profile(
+        updated_data.model_dump(), user_id, profile_photo=profile_photo
     )
 
     return schema.Profile_Response_Schema(**updated_response)
 
 
 @users_router.get("/profile/{profile_id}", response_model=schema.User_Profile_Response_Schema)
-async def get_user_profile(profile_id : str ,user_binary_id: bytes = Depends(get_current_user)):
+async def get_user_profile(profile_id : UUID, request: Request, response: Response, user_id: str = Depends(get_current_user)):
     
-    binary_profile_id = binaryConversion.str_to_binary(profile_id)
-    
-    user_profile = User_Profile_Service.get_public_user_profile(binary_profile_id)
+    profile_id = str(profile_id)
+
+    if conditional.has_preconditions(request):
+        validators = await User_Profile_Service.get_profile_validators(
+            "profile_id", profile_id
+        )
+
+        if validators and conditional.is_not_modified(request, *validators):
+            return conditional.not_modified_response(*validators)
+
+    user_profile = await User_Profile_Service.get_public_user_profile(
+        profile_id
+    )
+
+    response.headers.update(
+        conditional.validator_headers(
+            *User_Profile_Service.profile_validators(user_profile)
+        )
+    )
 
     return schema.User_Profile_Response_Schema(**user_profile)
@@ -3,12 +3,13 @@ from datetime import date
 
 from pydantic import ValidationError
 
-from utils.cloudinary_util import upload_file
 from fastapi import File, UploadFile, HTTPException
 
+from utils.upload_pipeline import stage_upload
+
 from typing import Optional
 
-from settings import cipher
+from settings import cipher, settings
 
 # Import your existing schemas
 from modules.users.schema import (
@@ -21,7 +22,6 @@ def get_profile_create_data(
     first_name: str = Form(...),
     last_name: str = Form(...),
     college_name: str = Form(...),
-    image_file: UploadFile = File(...),
     gender: str = Form(None),
     about_me: str = Form(None),
     date_of_birth: Optional[str] = Form(None),
@@ -30,10 +30,9 @@ def get_profile_create_data(
 ) -> Profile_Create_Request_Schema:
     """
     Extracts form data and returns a validated Profile_Create_Request_Schema object.
+    The photo is staged by get_profile_image and stored after the profile is saved.
     """
 
-    profile_image_url = upload_file(image_file)
-
     if merchant_id:
         merchant_id = cipher.encrypt(merchant_id.encode())
 
@@ -41,7 +40,7 @@ def get_profile_create_data(
         return Profile_Create_Request_Schema(
         first_name=first_name,
         last_name=last_name,
-        photo_url=profile_image_url,
+        photo_url=settings.PENDING_IMAGE_URL,
         college_name=college_name,
         gender=gender,
         about_me=about_me,
@@ -80,18 +79,11 @@ def get_profile_update_data(
     phone_number = normalize(phone_number)
     merchant_id = normalize(merchant_id)
     
-    profile_image_url= None
-                            
-    if image_file and image_file.filename:
-        allowed_extensions = {"image/jpeg", "image/png", "image/jpg"}
-        
-        if image_file.content_type not in allowed_extensions:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Invalid file type. Only JPG and PNG images are allowed. You uploaded {image_file.content_type}.",
-            )
+    profile_image_url = None
 
-        profile_image_url = upload_file(image_file)
+    # The new photo is stored in the background, see get_profile_image_update
+    if image_file and image_file.filename:
+        profile_image_url = settings.PENDING_IMAGE_URL
 
     if merchant_id:
         merchant_id = cipher.encrypt(merchant_id.encode())
@@ -111,3 +103,26 @@ def get_profile_update_data(
     except ValidationError as e:
         raise HTTPException(status_code=422, detail=e.errors())
         
+
+
+async def get_profile_image(image_file: UploadFile = File(...)):
+    staged_image = await stage_upload(image_file)
+
+    try:
+        yield staged_image
+    finally:
+        # Removed unless the request handed it to the upload pipeline
+        staged_image.discard()
+
+
+async def get_profile_image_update(image_file: UploadFile = File(None)):
+    if not (image_file and image_file.filename):
+        yield None
+        return
+
+    staged_image = await stage_upload(image_file)
+
+    try:
+        yield staged_image
+    finally:
+        staged_image.discard()
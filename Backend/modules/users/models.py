@@ -5,7 +5,7 @@ from sqlalchemy import (
     Date,
     TIMESTAMP,
     String,
-    BINARY,
+    Integer,
     ForeignKey,
     Enum as sqlEnum,
     Date,
@@ -13,17 +13,17 @@ from sqlalchemy import (
 from sqlalchemy.orm import relationship
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy_utils import EmailType
-from sqlalchemy.sql import func
+from sqlalchemy.sql import func, literal_column
 from enum import Enum
 
 from pydantic import EmailStr
 
 from . import schema as users_schema
 
+from shared.column_types import Binary_UUID
 from shared.generic_dao import Base_Dao
-from utils import binaryConversion
-
-from uuid import uuid4
+from .principal_cache import principal_cache
+from utils.ids import new_id
 
 
 class GenderEnum(Enum):
@@ -35,7 +35,7 @@ class GenderEnum(Enum):
 class UsersModel(Base):
     __tablename__ = "users"
 
-    user_id = Column(BINARY(16), primary_key=True, nullable=False)
+    user_id = Column(Binary_UUID, primary_key=True, nullable=False, default=new_id)
     email = Column(EmailType, nullable=False, unique=True)
     password = Column(String(255), nullable=False)
     created_at = Column(TIMESTAMP, nullable=False, server_default=func.now())
@@ -44,9 +44,9 @@ class UsersModel(Base):
 class ProfileModel(Base):
     __tablename__ = "profile"
 
-    profile_id = Column(BINARY(16), primary_key=True, nullable=False)
+    profile_id = Column(Binary_UUID, primary_key=True, nullable=False, default=new_id)
     user_id = Column(
-        BINARY(16), ForeignKey("users.user_id"), nullable=False, index=True
+        Binary_UUID, ForeignKey("users.user_id"), nullable=False, index=True
     )
     first_name = Column(String(50), nullable=False)
     last_name = Column(String(50), nullable=False)
@@ -61,11 +61,50 @@ class ProfileModel(Base):
     updated_at = Column(
         TIMESTAMP, nullable=True, onupdate=func.now(), server_default=func.now()
     )  # Updates on modification
+    # Bumped by every UPDATE of the row, the profile reads' ETags are built from it
+    version = Column(
+        Integer,
+        nullable=False,
+        default=1,
+        server_default="1",
+        onupdate=literal_column("version") + 1,
+    )
 
 
 class Auth_Dao(Base_Dao):
-    def __init__(self, model):
+    def __init__(self, model, principal_cache):
         super().__init__(model)
+        self.principal_cache = principal_cache
+
+    async def update_record(self, data, field_name, field_value, conditions: list = None):
+        updated_user = await super().update_record(
+            data, field_name, field_value, conditions
+        )
+
+        if updated_user is None:
+            return None
+
+        # get_current_user serves cached principals, drop the stale one
+        await self.principal_cache.invalidate(updated_user["user_id"])
+
+        return updated_user
+
+    async def update_where(self, data: dict, filters: dict):
+        # Without the user ids there is no telling which cached principals are stale
+        if "user_id" not in filters:
+            raise ValueError("Updates of users must filter on user_id")
+
+        updated_count = await super().update_where(data, filters)
+
+        user_ids = filters["user_id"]
+
+        if not isinstance(user_ids, (list, tuple, set)):
+            user_ids = [user_ids]
+
+        for user_id in user_ids:
+            await self.principal_cache.invalidate(user_id)
+
+        return updated_count
 
 
 class Profile_Dao(Base_Dao):
@@ -74,4 +113,4 @@ class Profile_Dao(Base_Dao):
 
 
 profile_dao = Profile_Dao(ProfileModel)
-auth_dao = Auth_Dao(UsersModel)
+auth_dao = Auth_Dao(UsersModel, principal_cache)
@@ -0,0 +1,74 @@
+import json
+
+from settings import settings
+from shared.cache import TTL_LRU_Cache, create_cache_backend
+from shared.metrics import metrics
+
+
+class Principal_Cache:
+    """Caches the authenticated user of protected requests by user_id.
+
+    Entries live in a per-worker LRU and, when PRINCIPAL_CACHE_URL is set, in a
+    backend shared by every worker. The local TTL is kept short so invalidations
+    made by another worker are seen quickly.
+    """
+
+    def __init__(self, local_cache: TTL_LRU_Cache, shared_backend=None):
+        self.local_cache = local_cache
+        self.shared_backend = shared_backend
+
+    @staticmethod
+    def _key(user_id: str):
+        return f"principal:{user_id}"
+
+    async def get(self, user_id: str):
+        principal = self.local_cache.get(user_id)
+
+        if principal is not None:
+            metrics.increment("auth.principal_cache.hit")
+            return principal
+
+        if self.shared_backend is not None:
+            cached_value = await self.shared_backend.get(self._key(user_id))
+
+            if cached_value is not None:
+                principal = json.loads(cached_value)
+
+                self.local_cache.set(user_id, principal)
+                metrics.increment("auth.principal_cache.shared_hit")
+
+                return principal
+
+        metrics.increment("auth.principal_cache.miss")
+
+        return None
+
+    async def set(self, user_id: str, principal: dict):
+        self.local_cache.set(user_id, principal)
+
+        if self.shared_backend is not None:
+            await self.shared_backend.set(
+                self._key(user_id),
+                json.dumps(principal).encode(),
+                settings.PRINCIPAL_CACHE_TTL_SECONDS,
+            )
+
+    async def invalidate(self, user_id: str):
+        """Call whenever the users row changes."""
+        self.local_cache.delete(user_id)
+
+        if self.shared_backend is not None:
+            await self.shared_backend.delete(self._key(user_id))
+
+
+principal_cache = Principal_Cache(
+    TTL_LRU_Cache(
+        max_size=settings.PRINCIPAL_CACHE_SIZE,
+        ttl_seconds=(
+            settings.PRINCIPAL_CACHE_LOCAL_TTL_SECONDS
+            if settings.PRINCIPAL_CACHE_URL
+            else settings.PRINCIPAL_CACHE_TTL_SECONDS
+        ),
+    ),
+    create_cache_backend(settings.PRINCIPAL_CACHE_URL),
+)
@@ -2,24 +2,28 @@ from fastapi import HTTPException, status
 
 from core.auth import Jwt_Token, Hashing
 
-from utils import binaryConversion
+from utils.ids import new_id
 
 
 from .models import auth_dao, profile_dao
 
-from uuid import uuid4
+from shared import conditional
 
 from .validator import Auth_Validator
 
 
 from settings import cipher
 
+from utils.upload_pipeline import upload_pipeline
+
 
 class Authentication_Service:
     @classmethod
-    def register_user(cls, register_credentials: dict):
-        user = auth_dao.fetch_record(
-            field_name="email", field_value=register_credentials["email"]
+    async def register_user(cls, register_credentials: dict):
+        user = await auth_dao.fetch_record(
+            field_name="email",
+            field_value=register_credentials["email"],
+            fields=["user_id"],
         )
 
         if user:
@@ -28,26 +32,24 @@ class Authentication_Service:
                 detail="This email id already exists",
             )
 
-        hash_password = Hashing.hash_data(register_credentials["password"])
+        hash_password = await Hashing.hash_data(register_credentials["password"])
 
         register_credentials["password"] = hash_password
 
-        user_binary_id = binaryConversion.str_to_binary(str(uuid4()))
-
-        new_user = auth_dao.create_record(
-            {**register_credentials, "user_id": user_binary_id}
+        new_user = await auth_dao.create_record(
+            {**register_credentials, "user_id": new_id()}
         )
 
-        user_uuid = binaryConversion.binary_to_str(new_user["user_id"])
-
-        access_token = Jwt_Token.create_access_token({"sub": user_uuid})
+        access_token = Jwt_Token.create_access_token({"sub": new_user["user_id"]})
 
         return {"access_token": access_token, "email": new_user["email"]}
 
     @classmethod
-    def authenticate_user(cls, authenticate_credentials: dict):
-        user = auth_dao.fetch_record(
-            field_name="email", field_value=authenticate_credentials["email"]
+    async def authenticate_user(cls, authenticate_credentials: dict):
+        user = await auth_dao.fetch_record(
+            field_name="email",
+            field_value=authenticate_credentials["email"],
+            fields=["user_id", "email", "password"],
         )
 
         if not user:
@@ -55,7 +57,7 @@ class Authentication_Service:
                 status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid Credentials"
             )
 
-        password_check = Auth_Validator.check_password_match(
+        password_check, upgraded_hash = await Hashing.verify_and_update(
             authenticate_credentials["password"], user["password"]
         )
 
@@ -64,18 +66,37 @@ class Authentication_Service:
                 status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid Credentials"
             )
 
-        user_uuid = binaryConversion.binary_to_str(user["user_id"])
+        # The stored hash is below BCRYPT_ROUNDS, replace it while the password is known
+        if upgraded_hash:
+            await auth_dao.update_record(
+                data={"password": upgraded_hash},
+                field_name="user_id",
+                field_value=user["user_id"],
+            )
 
-        access_token = Jwt_Token.create_access_token({"sub": user_uuid})
+        access_token = Jwt_Token.create_access_token({"sub": user["user_id"]})
 
         return {"access_token": access_token, "email": user["email"]}
 
 
 class User_Profile_Service:
     @classmethod
-    def create_profile(cls, profile_data: dict, binary_user_id: bytes):
-        user_profile = profile_dao.fetch_record(
-            field_name="user_id", field_value=binary_user_id
+    def store_profile_photo(cls, profile_id: str, staged_photo):
+        """Uploads the photo in the background and then replaces the pending URL."""
+
+        async def set_profile_photo(photo_url: str):
+            await profile_dao.update_where(
+                {"photo_url": photo_url}, {"profile_id": profile_id}
+            )
+
+        upload_pipeline.submit(staged_photo, set_profile_photo)
+
+    @classmethod
+    async def create_profile(
+        cls, profile_data: dict, user_id: str, profile_photo=None
+    ):
+        user_profile = await profile_dao.fetch_record(
+            field_name="user_id", field_value=user_id, fields=["profile_id"]
         )
 
         if user_profile:
@@ -83,12 +104,15 @@ class User_Profile_Service:
                 status_code=status.HTTP_409_CONFLICT,
                 detail="User Profile already exists",
             )
-        binary_profile_id = binaryConversion.str_to_binary(str(uuid4()))
+        profile_id = new_id()
 
-        profile_data["user_id"] = binary_user_id
-        profile_data["profile_id"] = binary_profile_id
+        profile_data["user_id"] = user_id
+        profile_data["profile_id"] = profile_id
 
-        new_profile = profile_dao.create_record(profile_data)
+        new_profile = await profile_dao.create_record(profile_data)
+
+        if profile_photo:
+            cls.store_profile_photo(profile_id, profile_photo)
 
         if new_profile["merchant_id"]:
             new_profile["merchant_id"] = cipher.decrypt(
@@ -98,9 +122,11 @@ class User_Profile_Service:
         return new_profile
 
     @classmethod
-    def update_profile(cls, update_data: dict, binary_user_id: bytes):
-        user_profile = profile_dao.fetch_record(
-            field_name="user_id", field_value=binary_user_id
+    async def update_profile(
+        cls, update_data: dict, user_id: str, profile_photo=None
+    ):
+        user_profile = await profile_dao.fetch_record(
+            field_name="user_id", field_value=user_id, fields=["profile_id"]
         )
 
         if not user_profile:
@@ -113,12 +139,15 @@ class User_Profile_Service:
             f"{key}": value for key, value in update_data.items() if value is not None
         }
 
-        updated_details = profile_dao.update_record(
+        updated_details = await profile_dao.update_record(
             data=filtered_data,
             field_name="profile_id",
             field_value=user_profile["profile_id"],
         )
 
+        if profile_photo:
+            cls.store_profile_photo(user_profile["profile_id"], profile_photo)
+
         if updated_details["merchant_id"]:
             updated_details["merchant_id"] = cipher.decrypt(
                 updated_details["merchant_id"]
@@ -126,10 +155,25 @@ class User_Profile_Service:
 
         return updated_details
 
+    @staticmethod
+    def profile_validators(profile_data: dict):
+        """ETag and Last-Modified of a profile read."""
+        etag = conditional.make_etag(profile_data["version"], profile_data["updated_at"])
+
+        return etag, profile_data["updated_at"]
+
+    @classmethod
+    async def get_profile_validators(cls, field_name: str, field_value: str):
+        version_data = await profile_dao.fetch_fields(
+            field_name, field_value, ["version", "updated_at"]
+        )
+
+        return cls.profile_validators(version_data) if version_data else None
+
     @classmethod
-    def get_profile(cls, binary_user_id: str):
-        user_profile = profile_dao.fetch_record(
-            field_name="user_id", field_value=binary_user_id
+    async def get_profile(cls, user_id: str):
+        user_profile = await profile_dao.fetch_record(
+            field_name="user_id", field_value=user_id
         )
 
         if not user_profile:
@@ -145,9 +189,9 @@ class User_Profile_Service:
         return user_profile
 
     @classmethod
-    def get_public_user_profile(cls, binary_profile_id):
-        user_profile = profile_dao.fetch_record(
-            field_name="profile_id", field_value=binary_profile_id
+    async def get_public_user_profile(cls, profile_id):
+        user_profile = await profile_dao.fetch_record(
+            field_name="profile_id", field_value=profile_id
         )
 
         if not user_profile:
@@ -160,4 +204,4 @@ class User_Profile_Service:
         
             user_profile["merchant_id"] = cipher.decrypt(user_profile["merchant_id"]).decode()
 
-        return user_profile
\ No newline at end of file
+        return user_profile
\ No newline at end of file
@@ -1,5 +1,6 @@
 from pydantic import EmailStr
 from .models import auth_dao, profile_dao
+from .principal_cache import principal_cache
 from core.auth import Hashing
 
 from fastapi import HTTPException, status
@@ -7,19 +8,25 @@ from fastapi import HTTPException, status
 
 class Auth_Validator:
     @staticmethod
-    def check_password_match(password, hashed_password):
-        is_matching = Hashing.verify_hash_data(password, hashed_password)
+    async def check_password_match(password, hashed_password):
+        is_matching = await Hashing.verify_hash_data(password, hashed_password)
 
         return True if is_matching else False
 
 
 class User_Validation:
-    def __init__(self, auth_dao):
+    def __init__(self, auth_dao, principal_cache):
         self.auth_dao = auth_dao
+        self.principal_cache = principal_cache
 
-    def validate_user_exists(self, user_binary_id):
-        user = self.auth_dao.fetch_record(
-            field_name="user_id", field_value=user_binary_id
+    async def validate_user_exists(self, user_id):
+        principal = await self.principal_cache.get(user_id)
+
+        if principal is not None:
+            return principal
+
+        user = await self.auth_dao.fetch_record(
+            field_name="user_id", field_value=user_id, fields=["email"]
         )
 
         if not user:
@@ -27,5 +34,12 @@ class User_Validation:
                 status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid Credentials"
             )
 
+        # Only what identifies the user is cached, never the password hash
+        principal = {"email": user["email"]}
+
+        await self.principal_cache.set(user_id, principal)
+
+        return principal
+
 
-general_user_validation = User_Validation(auth_dao)
+general_user_validation = User_Validation(auth_dao, principal_cache)
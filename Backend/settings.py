@@ -1,3 +1,5 @@
+import os
+
 from pydantic_settings import BaseSettings
 from cryptography.fernet import Fernet
 
@@ -15,6 +17,73 @@ class Settings(BaseSettings):
     CLOUDINARY_API_KEY: str
     CIPHER_KEY : str
 
+    # Database connection pool
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: int = 30  # seconds to wait for a free connection
+    DB_POOL_RECYCLE: int = 1800  # seconds, keep below MySQL wait_timeout
+    DB_POOL_PRE_PING: bool = True
+
+    # Seconds before a worker pulls events changed by other workers into its search index
+    SEARCH_INDEX_REFRESH_SECONDS: int = 30
+
+    # Geocoding of event addresses
+    GEOCODING_BASE_URL: str = "https://api.geoapify.com/v1/geocode/search"
+    GEOCODING_TIMEOUT_SECONDS: float = 5.0
+    GEOCODING_CONNECT_TIMEOUT_SECONDS: float = 2.0
+    GEOCODING_MAX_RETRIES: int = 2
+    GEOCODING_RETRY_BACKOFF_SECONDS: float = 0.2  # doubled after every retry
+    GEOCODING_MAX_CONNECTIONS: int = 10
+    GEOCODING_CACHE_SIZE: int = 10_000  # addresses kept in memory per worker
+    GEOCODING_CACHE_TTL_SECONDS: int = 3600
+    GEOCODING_DB_CACHE_TTL_DAYS: int = 90
+
+    # Image uploads, stored by a background pool after the record is saved
+    UPLOAD_STORAGE: str = "cloudinary"  # or "local", served from /media
+    UPLOAD_LOCAL_DIR: str = "media"
+    UPLOAD_LOCAL_BASE_URL: str = "http://localhost:8000/media"
+    UPLOAD_STAGING_DIR: str | None = None  # temp files, system temp dir by default
+    UPLOAD_MAX_BYTES: int = 5 * 1024 * 1024
+    UPLOAD_WORKERS: int = 4
+    # Shown until the background upload stores the real image
+    PENDING_IMAGE_URL: str = "https://res.cloudinary.com/do3rfgh8n/image/upload/pending.png"
+
+    # Authenticated users of protected requests, see modules.users.principal_cache
+    PRINCIPAL_CACHE_SIZE: int = 10_000
+    PRINCIPAL_CACHE_TTL_SECONDS: int = 300
+    # Per-worker TTL when the shared backend is configured
+    PRINCIPAL_CACHE_LOCAL_TTL_SECONDS: int = 15
+    PRINCIPAL_CACHE_URL: str | None = None  # eg: redis://localhost:6379/0
+    # Verified access tokens, each kept until its exp
+    JWT_CACHE_SIZE: int = 10_000
+
+    # POST /events/import
+    EVENT_IMPORT_BATCH_SIZE: int = 500  # rows validated and inserted per transaction
+    EVENT_IMPORT_MAX_ROWS: int = 10_000  # per file, later rows are reported as skipped
+    EVENT_IMPORT_GEOCODE_CONCURRENCY: int = 8
+
+    # Rows per server-side cursor fetch of streamed exports
+    EXPORT_BATCH_SIZE: int = 1000
+
+    # Password hashing, run on its own thread pool by core.auth.Hashing
+    BCRYPT_ROUNDS: int = 12  # stored hashes of a lower cost are upgraded on sign in
+    PASSWORD_HASH_WORKERS: int = min(4, os.cpu_count() or 1)
+    # Hashes allowed to wait for a worker, sign in and register answer 503 beyond
+    PASSWORD_HASH_MAX_PENDING: int = 32
+
+    # Cached catalogue reads, see shared.response_cache
+    RESPONSE_CACHE_URL: str | None = None  # redis://... to share it between workers
+    RESPONSE_CACHE_SIZE: int = 1000  # entries kept by the in-process backend
+    RESPONSE_CACHE_TTL_SECONDS: int = 60
+
+    # Booking tickets, see utils.qr_code
+    TICKET_SIGNING_KEY: str | None = None  # HMAC key of the QR payloads, JWT_SECRET_KEY by default
+    TICKET_CACHE_DIR: str = "ticket_cache"  # rendered QR codes, shared by the workers
+    TICKET_CACHE_MAX_BYTES: int = 256 * 1024 * 1024
+    TICKET_RENDER_WORKERS: int = min(4, os.cpu_count() or 1)  # processes
+    TICKET_RENDER_BATCH_SIZE: int = 64  # tickets rendered per process pool task
+    TICKET_QR_SCALE: int = 8  # pixels per QR module of PNG tickets
+
     class Config:
         env_file = ".env"  # Load from .env file
 
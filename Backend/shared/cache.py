@@ -0,0 +1,177 @@
+import asyncio
+import contextvars
+import logging
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from threading import Lock
+
+logger = logging.getLogger(__name__)
+
+
+class TTL_LRU_Cache:
+    """Bounded in-process cache, entries expire after ttl_seconds.
+
+    When full, the least recently used entry is evicted.
+    """
+
+    _missing = object()
+
+    def __init__(self, max_size: int, ttl_seconds: float):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()  # key -> (expires_at, value)
+        self._lock = Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._entries.get(key, self._missing)
+
+            if entry is self._missing:
+                return default
+
+            expires_at, value = entry
+
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return default
+
+            self._entries.move_to_end(key)
+
+            return value
+
+    def set(self, key, value, ttl_seconds: float = None):
+        expires_at = time.monotonic() + (
+            self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        )
+
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class Cache_Backend(ABC):
+    """Cache shared by every worker, values are bytes."""
+
+    @abstractmethod
+    async def get(self, key: str):
+        """The value of key, None when it is missing or expired."""
+
+    @abstractmethod
+    async def set(self, key: str, value: bytes, ttl_seconds: float):
+        """Stores value under key for ttl_seconds."""
+
+    @abstractmethod
+    async def delete(self, key: str):
+        """Removes key, a missing key is not an error."""
+
+
+class Memory_Cache_Backend(Cache_Backend):
+    """In-process stand-in for a shared backend, for single worker runs and tests."""
+
+    def __init__(self, max_size: int = 10_000):
+        self.entries = TTL_LRU_Cache(max_size=max_size, ttl_seconds=0)
+
+    async def get(self, key: str):
+        return self.entries.get(key)
+
+    async def set(self, key: str, value: bytes, ttl_seconds: float):
+        self.entries.set(key, value, ttl_seconds=ttl_seconds)
+
+    async def delete(self, key: str):
+        self.entries.delete(key)
+
+
+class Redis_Cache_Backend(Cache_Backend):
+    """Redis backed cache. Errors are logged and treated as misses, so an
+    unreachable Redis slows requests down instead of failing them."""
+
+    def __init__(self, url: str):
+        try:
+            import redis.asyncio as redis
+        except ImportError as e:
+            raise RuntimeError(
+                "A redis:// cache URL needs the redis extra, uv sync --extra redis"
+            ) from e
+
+        self.client = redis.from_url(url)
+        self.errors = redis.RedisError
+
+    async def get(self, key: str):
+        try:
+            return await self.client.get(key)
+        except self.errors:
+            logger.warning("Shared cache get failed for %s", key, exc_info=True)
+            return None
+
+    async def set(self, key: str, value: bytes, ttl_seconds: float):
+        try:
+            await self.client.set(key, value, ex=max(1, int(ttl_seconds)))
+        except self.errors:
+            logger.warning("Shared cache set failed for %s", key, exc_info=True)
+
+    async def delete(self, key: str):
+        try:
+            await self.client.delete(key)
+        except self.errors:
+            logger.warning("Shared cache delete failed for %s", key, exc_info=True)
+
+
+def create_cache_backend(url: str | None):
+    """Returns the shared backend for a cache URL, None keeps the cache in process."""
+    if not url:
+        return None
+
+    if url == "memory://":
+        return Memory_Cache_Backend()
+
+    if url.startswith(("redis://", "rediss://", "unix://")):
+        return Redis_Cache_Backend(url)
+
+    raise ValueError(f"Unsupported cache URL: {url}")
+
+
+class Single_Flight:
+    """Collapses concurrent calls for the same key into one.
+
+    The first caller starts the call, later callers await the same result. The call
+    runs as its own task in a fresh context, so it neither reuses the request
+    session of the caller that started it nor dies if that caller is cancelled.
+    """
+
+    def __init__(self):
+        self._calls = {}
+
+    def __len__(self):
+        return len(self._calls)
+
+    async def run(self, key, call):
+        task = self._calls.get(key)
+
+        if task is None:
+            task = asyncio.get_running_loop().create_task(
+                call(), context=contextvars.Context()
+            )
+            self._calls[key] = task
+
+            def forget(finished_task):
+                if self._calls.get(key) is finished_task:
+                    del self._calls[key]
+
+            task.add_done_callback(forget)
+
+        return await asyncio.shield(task)
@@ -0,0 +1,39 @@
+from uuid import UUID
+
+from sqlalchemy import BINARY, TypeDecorator
+
+
+class Binary_UUID(TypeDecorator):
+    """UUID stored in 16 bytes, bound and read as its canonical string.
+
+    Every id conversion happens here, so services, caches and responses only see
+    strings. Binds also take UUID objects, any string UUID() parses and raw bytes.
+    """
+
+    impl = BINARY(16)
+    cache_ok = True
+
+    @property
+    def python_type(self):
+        return str
+
+    def process_bind_param(self, value, dialect):
+        if value is None or isinstance(value, bytes):
+            return value
+
+        if isinstance(value, UUID):
+            return value.bytes
+
+        return UUID(value).bytes
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+
+        # Same as str(UUID(bytes=value)) without building the UUID
+        hex_value = value.hex()
+
+        return (
+            f"{hex_value[:8]}-{hex_value[8:12]}-{hex_value[12:16]}-"
+            f"{hex_value[16:20]}-{hex_value[20:]}"
+        )
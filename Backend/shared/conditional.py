@@ -0,0 +1,89 @@
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from hashlib import blake2b
+
+from fastapi import Request, Response, status
+
+# Authenticated reads may be stored by the browser only and are revalidated on
+# every use, which is what makes If-None-Match come back
+PRIVATE_CACHE_CONTROL = "private, no-cache"
+PUBLIC_CACHE_CONTROL = "no-cache"
+
+
+def make_etag(*parts) -> str:
+    """Weak ETag over the values a representation is derived from, e.g. a row's
+    version counter and updated_at."""
+    digest = blake2b("\x1f".join(str(part) for part in parts).encode(), digest_size=12)
+
+    return f'W/"{digest.hexdigest()}"'
+
+
+def content_etag(body: bytes) -> str:
+    """ETag of an encoded body, for representations without a version counter."""
+    return f'W/"{blake2b(body, digest_size=12).hexdigest()}"'
+
+
+def _as_utc(value: datetime) -> datetime:
+    # TIMESTAMP columns come back naive and in UTC
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+
+    return value.astimezone(timezone.utc).replace(microsecond=0)
+
+
+def has_preconditions(request: Request) -> bool:
+    return (
+        "if-none-match" in request.headers or "if-modified-since" in request.headers
+    )
+
+
+def is_not_modified(request: Request, etag: str, last_modified: datetime = None) -> bool:
+    """Evaluates If-None-Match, or If-Modified-Since when there is no If-None-Match,
+    as RFC 9110 asks for GET. ETags are compared weakly."""
+    if_none_match = request.headers.get("if-none-match")
+
+    if if_none_match is not None:
+        if if_none_match.strip() == "*":
+            return True
+
+        opaque_tag = etag.removeprefix("W/")
+
+        return any(
+            tag.strip().removeprefix("W/") == opaque_tag
+            for tag in if_none_match.split(",")
+        )
+
+    if_modified_since = request.headers.get("if-modified-since")
+
+    if if_modified_since and last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+
+        if since.tzinfo is None:
+            return False
+
+        return _as_utc(last_modified) <= since
+
+    return False
+
+
+def validator_headers(
+    etag: str, last_modified: datetime = None, cache_control: str = PRIVATE_CACHE_CONTROL
+) -> dict:
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+
+    if last_modified is not None:
+        headers["Last-Modified"] = format_datetime(_as_utc(last_modified), usegmt=True)
+
+    return headers
+
+
+def not_modified_response(
+    etag: str, last_modified: datetime = None, cache_control: str = PRIVATE_CACHE_CONTROL
+) -> Response:
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED,
+        headers=validator_headers(etag, last_modified, cache_control),
+    )
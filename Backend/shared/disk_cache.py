@@ -0,0 +1,122 @@
+import os
+import tempfile
+from collections import OrderedDict
+from threading import Lock
+
+
+class Disk_LRU_Cache:
+    """Content addressed files under directory. Once they take more than max_bytes
+    the least recently used are removed.
+
+    A key is the hex digest of everything a file is built from, so an entry never
+    goes stale and is never rewritten. Each worker keeps the LRU order in memory,
+    seeded from the file mtimes which hits refresh. A file evicted by another
+    worker is a miss like any other.
+    """
+
+    def __init__(self, directory: str, max_bytes: int):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._entries = None  # key -> size, least recently used first, loaded lazily
+        self._total_bytes = 0
+        self._lock = Lock()
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], key[2:])
+
+    @staticmethod
+    def write_file(path: str, data: bytes):
+        """Writes through a temp file, so readers never see half a file. Also used
+        by the ticket render processes, which have no cache instance."""
+        directory = os.path.dirname(path)
+
+        os.makedirs(directory, exist_ok=True)
+
+        # Dot files are skipped when the index is loaded
+        descriptor, temp_path = tempfile.mkstemp(dir=directory, prefix=".")
+
+        try:
+            with os.fdopen(descriptor, "wb") as file:
+                file.write(data)
+
+            os.replace(temp_path, path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+    def _load(self):
+        if self._entries is not None:
+            return
+
+        files = []
+
+        if os.path.isdir(self.directory):
+            for shard in os.scandir(self.directory):
+                if not shard.is_dir():
+                    continue
+
+                for entry in os.scandir(shard.path):
+                    if entry.name.startswith("."):
+                        continue
+
+                    stat = entry.stat()
+                    files.append((stat.st_mtime, shard.name + entry.name, stat.st_size))
+
+        files.sort()
+
+        self._entries = OrderedDict((key, size) for _, key, size in files)
+        self._total_bytes = sum(self._entries.values())
+
+    def contains(self, key: str) -> bool:
+        return os.path.exists(self.path(key))
+
+    def get(self, key: str):
+        path = self.path(key)
+
+        try:
+            with open(path, "rb") as file:
+                data = file.read()
+        except FileNotFoundError:
+            with self._lock:
+                if self._entries is not None and key in self._entries:
+                    self._total_bytes -= self._entries.pop(key)
+            return None
+
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+        self.record(key, len(data))
+
+        return data
+
+    def set(self, key: str, data: bytes):
+        self.write_file(self.path(key), data)
+
+        self.record(key, len(data))
+
+    def record(self, key: str, size: int):
+        """Marks the file of key as just used and evicts beyond max_bytes."""
+        with self._lock:
+            self._load()
+
+            self._total_bytes += size - self._entries.pop(key, 0)
+            self._entries[key] = size
+
+            while self._total_bytes > self.max_bytes and len(self._entries) > 1:
+                evicted_key, evicted_size = self._entries.popitem(last=False)
+                self._total_bytes -= evicted_size
+
+                try:
+                    os.remove(self.path(evicted_key))
+                except FileNotFoundError:
+                    pass
+
+    @property
+    def total_bytes(self) -> int:
+        with self._lock:
+            self._load()
+
+            return self._total_bytes
@@ -1,145 +1,546 @@
-from database import SessionLocal
+from database import commit_session, session_scope
+from sqlalchemy import TypeDecorator, and_, insert, select, update
+from sqlalchemy.dialects import mysql, postgresql, sqlite
 from sqlalchemy.exc import SQLAlchemyError
 
+from shared.generic_enum import Row_Format_Enum
+from shared.row_mapping import row_class
+
 
 class Base_Dao:
-    session = SessionLocal
+    session = staticmethod(session_scope)
+    commit = staticmethod(commit_session)
+
+    BULK_CHUNK_SIZE = 500
+    IN_CHUNK_SIZE = 500  # values per IN (...) of fetch_records_by_list
 
     def __init__(self, model):
         self.model = model
 
-    def fetch_record(self, field_name, field_value):
+    def _columns(self, fields: list = None):
+        """The columns to select, every column of the table when fields is None."""
+        if fields is None:
+            return list(self.model.__table__.columns)
+
+        return [getattr(self.model, field) for field in fields]
+
+    @staticmethod
+    def _rows(result, row_format: Row_Format_Enum):
+        """Converts a Core result to a list of rows in row_format."""
+        if row_format == Row_Format_Enum.TUPLE:
+            return [tuple(row) for row in result]
+
+        if row_format == Row_Format_Enum.SLOTS:
+            row_type = row_class(tuple(result.keys()))
+
+            return [row_type(*row) for row in result]
+
+        return [dict(row) for row in result.mappings()]
+
+    async def fetch_record(self, field_name, field_value, fields: list = None):
         """can be used for fetching single record. For eg: Fetching events by the event id providing field name(event_id) and field_value(12345).
 
         Args:
             field_name (_type_): Field name of the model
             field_value (_type_): Field value of the selected Field
+            fields (list): columns to read, all of them when None
 
         Returns:
             _type_: Returns the column and value as a dictionary
         """
 
+        return await self._select_record(field_name, field_value, fields)
+
+    async def _select_record(self, field_name, field_value, fields: list = None):
         try:
-            with Base_Dao.session() as db:
-                record_object = (
-                    db.query(self.model)
+            async with Base_Dao.session() as db:
+                stmt = (
+                    select(*self._columns(fields))
                     .filter(getattr(self.model, field_name) == field_value)
-                    .first()
+                    .limit(1)
                 )
 
-                return record_object.__dict__ if record_object else None
+                record = (await db.execute(stmt)).mappings().first()
+
+                return dict(record) if record else None
         except SQLAlchemyError as e:
             raise e
 
-    def fetch_records_by_field_name(self, field_name, field_value):
+    async def fetch_fields(self, field_name, field_value, fields: list):
+        """Like fetch_record, but reads only the given columns and always queries.
+
+        Returns:
+            dict: the selected columns of the first match, None when nothing matched
+        """
+
+        return await self._select_record(field_name, field_value, fields)
+
+    async def fetch_records_by_field_name(
+        self,
+        field_name,
+        field_value,
+        fields: list = None,
+        row_format: Row_Format_Enum = Row_Format_Enum.DICT,
+    ):
         """can be used for fetching records by . For eg: Filtering paid events by providing field name(ticket_type) and field_name(free).
 
         Args:
             field_name (_type_): Field name of the model
             field_value (_type_): Field value of the selected Field
+            fields (list): columns to read, all of them when None
+            row_format (Row_Format_Enum): dicts, Slots_Rows or tuples
 
         Returns:
-            _type_: Returns the column and value as a dictionary
+            _type_: Returns the rows in row_format
         """
 
         try:
-            with Base_Dao.session() as db:
-                records_object_list = (
-                    db.query(self.model)
-                    .filter(getattr(self.model, field_name) == field_value)
-                    .all()
+            async with Base_Dao.session() as db:
+                stmt = select(*self._columns(fields)).filter(
+                    getattr(self.model, field_name) == field_value
                 )
 
-                if not records_object_list:
-                    return []
+                return self._rows(await db.execute(stmt), row_format)
+        except SQLAlchemyError as e:
+            raise e
+
+    @staticmethod
+    def _stored_value(column, value):
+        """The value as the database returns it, eg: EmailType lowercases emails."""
+        column_type = column.type
+
+        if isinstance(column_type, TypeDecorator) and value is not None:
+            value = column_type.process_bind_param(value, None)
+
+            if type(column_type).process_result_value is not (
+                TypeDecorator.process_result_value
+            ):
+                value = column_type.process_result_value(value, None)
+
+        return value
+
+    async def fetch_records_by_list(
+        self,
+        field_name,
+        field_value_list: list,
+        fields: list = None,
+        chunk_size: int = IN_CHUNK_SIZE,
+    ):
+        """Loads the records whose field is one of field_value_list, with one
+        IN (...) query per chunk_size values.
+
+        Args:
+            field_name (_type_): Field name of the model
+            field_value_list (list): values to look up, duplicates are read once
+            fields (list): columns to read, all of them when None
+
+        Returns:
+            dict: {field_value: record as a dictionary} in the order of
+            field_value_list, None for values without a record. When several
+            records share a value the first one read is kept.
+        """
+
+        column = getattr(self.model, field_name)
+        columns = self._columns(fields)
 
-                records_list = [record.__dict__ for record in records_object_list]
+        if fields is not None and field_name not in fields:
+            columns.append(column)
+
+        field_values = list(dict.fromkeys(field_value_list))
+        records_by_value = {}
+
+        try:
+            async with Base_Dao.session() as db:
+                for start in range(0, len(field_values), chunk_size):
+                    stmt = select(*columns).filter(
+                        column.in_(field_values[start : start + chunk_size])
+                    )
+
+                    for record in (await db.execute(stmt)).mappings():
+                        records_by_value.setdefault(record[field_name], dict(record))
 
-                return records_list
         except SQLAlchemyError as e:
             raise e
 
-    def fetch_records_by_list(self, field_name, field_value_list: list):
-        try:
-            with Base_Dao.session() as db:
-                data_object_list = (
-                    db.query(self.model)
-                    .filter(getattr(self.model, field_name) in (field_value_list))
-                    .all()
+        records = {}
+
+        for field_value in field_values:
+            record = records_by_value.get(self._stored_value(column, field_value))
+
+            # Case insensitive collations (MySQL's default) match other casings
+            if record is None and isinstance(field_value, str):
+                record = next(
+                    (
+                        record
+                        for value, record in records_by_value.items()
+                        if isinstance(value, str)
+                        and value.casefold() == field_value.casefold()
+                    ),
+                    None,
                 )
 
-                if not data_object_list:
-                    return None
+            # field_name is only selected to key the records
+            if record is not None and fields is not None and field_name not in fields:
+                record = {
+                    key: value for key, value in record.items() if key != field_name
+                }
 
-                data_list = [data.__dict__ for data in data_list]
+            records[field_value] = record
 
-                return data_list
+        return records
 
-        except SQLAlchemyError as e:
-            raise e
+    async def load_many(self, field_name, field_values: list, fields: list = None):
+        """Batch form of fetch_record: reads the records of every field value with
+        one IN (...) query per IN_CHUNK_SIZE values, instead of one query each.
 
-    def fetch_records_from_model(self):
+        Returns:
+            list: the record of each field value as fetch_record returns it, in
+            the order of field_values, None for values without a record
+        """
+
+        records = await self.fetch_records_by_list(field_name, field_values, fields)
+
+        # Every position gets its own dict, callers modify the dicts they receive
+        return [
+            dict(records[field_value]) if records[field_value] is not None else None
+            for field_value in field_values
+        ]
+
+    async def fetch_records_from_model(
+        self, fields: list = None, row_format: Row_Format_Enum = Row_Format_Enum.DICT
+    ):
         """can be used for fetching all records from the model.
 
         Args:
-            field_name (_type_): Field name of the model
-            field_value (_type_): Field value of the selected Field
+            fields (list): columns to read, all of them when None
+            row_format (Row_Format_Enum): dicts, Slots_Rows or tuples
 
         Returns:
-            _type_: Returns the column and value as a dictionary
+            _type_: Returns the rows in row_format
         """
 
         try:
-            with Base_Dao.session() as db:
-                records_object_list = db.query(self.model).all()
+            async with Base_Dao.session() as db:
+                stmt = select(*self._columns(fields))
+
+                return self._rows(await db.execute(stmt), row_format)
+
+        except SQLAlchemyError as e:
+            raise e
+
+    def _where(self, filters: dict):
+        """{field: value} as criteria, a list value matches any of its values."""
+        return and_(
+            *(
+                getattr(self.model, field).in_(value)
+                if isinstance(value, (list, tuple, set))
+                else getattr(self.model, field) == value
+                for field, value in filters.items()
+            )
+        )
+
+    def _primary_key_filters(self, primary_key) -> dict:
+        return {
+            column.key: value
+            for column, value in zip(self.model.__table__.primary_key.columns, primary_key)
+        }
+
+    async def create_record(self, data: dict):
+        """Inserts a record and returns it as stored, defaults and generated keys
+        included.
+
+        Dialects with INSERT ... RETURNING read the row back in the INSERT itself,
+        the others (MySQL) read it by primary key after the commit.
+        """
+
+        table = self.model.__table__
+
+        async with Base_Dao.session() as db:
+            try:
+                stmt = insert(table).values(**data)
+
+                if db.get_bind().dialect.insert_returning:
+                    record = (
+                        (await db.execute(stmt.returning(*table.columns))).mappings().one()
+                    )
+
+                    await self.commit(db)
+
+                    return dict(record)
+
+                result = await db.execute(stmt)
+
+                await self.commit(db)
+
+                primary_key = result.inserted_primary_key
+
+            except SQLAlchemyError as e:
+                await db.rollback()
 
-                if not records_object_list:
-                    return []
+                raise e
 
-                records_list = [record.__dict__ for record in records_object_list]
+        records = await self.fetch_records_where(self._primary_key_filters(primary_key))
 
-                return records_list
+        return records[0] if records else None
 
+    async def create_records(self, rows: list):
+        """Inserts rows in one transaction and returns them as stored, in order.
+
+        Dialects which return rows from a batched INSERT do it in one statement,
+        the others insert the rows one by one to learn their keys and read them
+        all back with one query.
+        """
+
+        table = self.model.__table__
+
+        async with Base_Dao.session() as db:
+            try:
+                if db.get_bind().dialect.insert_executemany_returning:
+                    result = await db.execute(
+                        insert(table).returning(*table.columns, sort_by_parameter_order=True),
+                        rows,
+                    )
+                    records = [dict(record) for record in result.mappings()]
+
+                    await self.commit(db)
+
+                    return records
+
+                primary_keys = [
+                    tuple((await db.execute(insert(table).values(**data))).inserted_primary_key)
+                    for data in rows
+                ]
+
+                await self.commit(db)
+
+            except SQLAlchemyError as e:
+                await db.rollback()
+
+                raise e
+
+        primary_key_columns = [column.key for column in table.primary_key.columns]
+
+        records = await self.fetch_records_where(
+            {
+                column: [primary_key[index] for primary_key in primary_keys]
+                for index, column in enumerate(primary_key_columns)
+            }
+        )
+        records_by_key = {
+            tuple(record[column] for column in primary_key_columns): record
+            for record in records
+        }
+
+        return [records_by_key[primary_key] for primary_key in primary_keys]
+
+    async def fetch_records_where(
+        self,
+        filters: dict,
+        fields: list = None,
+        row_format: Row_Format_Enum = Row_Format_Enum.DICT,
+    ):
+        """Reads the records matching every {field: value} of filters, a list
+        value matches any of its values."""
+
+        try:
+            async with Base_Dao.session() as db:
+                stmt = select(*self._columns(fields)).where(self._where(filters))
+
+                return self._rows(await db.execute(stmt), row_format)
         except SQLAlchemyError as e:
             raise e
 
-    def create_record(self, data: dict):
-        try:
-            with Base_Dao.session() as db:
-                new_data = self.model(**data)
+    async def bulk_create(self, rows: list, chunk_size: int = BULK_CHUNK_SIZE):
+        """Inserts many records, one transaction per chunk of chunk_size rows. Each
+        chunk is sent as an executemany, which SQLAlchemy batches into multi-row
+        INSERT statements.
 
-                db.add(new_data)
+        Unlike create_record nothing is read back, so rows must carry their primary
+        keys if the caller needs them. A failing chunk is rolled back and raises,
+        the chunks before it stay committed.
 
-                db.commit()
+        Returns:
+            int: the number of rows inserted
+        """
 
-                db.refresh(new_data)
+        async with Base_Dao.session() as db:
+            try:
+                for start in range(0, len(rows), chunk_size):
+                    await db.execute(insert(self.model), rows[start : start + chunk_size])
 
-                return new_data.__dict__
+                    await self.commit(db)
 
-        except SQLAlchemyError as e:
-            db.rollback()
+                return len(rows)
 
-            raise e
+            except SQLAlchemyError as e:
+                await db.rollback()
 
-    def update_record(self, data, field_name, field_value):
-        try:
-            with self.session() as db:
-                data_row = (
-                    db.query(self.model)
-                    .filter(getattr(self.model, field_name) == field_value)
-                    .first()
+                raise e
+
+    def _upsert_statement(self, dialect_name: str, conflict_fields: list, update_fields: list):
+        """The dialect's single statement upsert, None when it has none."""
+        if dialect_name == "mysql":
+            stmt = mysql.insert(self.model)
+
+            # MySQL matches the conflict on any unique key, there is no DO NOTHING:
+            # assigning a conflict field to itself leaves an existing row untouched
+            if not update_fields:
+                return stmt.on_duplicate_key_update(
+                    **{field: getattr(self.model, field) for field in conflict_fields}
                 )
 
-                for key, value in data.items():
-                    setattr(data_row, key, value)
+            return stmt.on_duplicate_key_update(
+                **{field: stmt.inserted[field] for field in update_fields}
+            )
+
+        if dialect_name in ("sqlite", "postgresql"):
+            dialect = sqlite if dialect_name == "sqlite" else postgresql
+            stmt = dialect.insert(self.model)
+
+            if not update_fields:
+                return stmt.on_conflict_do_nothing(index_elements=conflict_fields)
+
+            return stmt.on_conflict_do_update(
+                index_elements=conflict_fields,
+                set_={field: stmt.excluded[field] for field in update_fields},
+            )
+
+        return None
+
+    async def _upsert_row(self, db, row: dict, conflict_fields: list, update_fields: list):
+        """Upserts one row with a SELECT and then an INSERT or UPDATE, for dialects
+        without an upsert statement. A concurrent insert of the same key fails the
+        chunk with an IntegrityError."""
+        matches_row = and_(
+            *(getattr(self.model, field) == row[field] for field in conflict_fields)
+        )
+
+        existing = (await db.execute(select(1).where(matches_row).limit(1))).first()
+
+        if existing is None:
+            await db.execute(insert(self.model).values(**row))
+        elif update_fields:
+            await db.execute(
+                update(self.model)
+                .where(matches_row)
+                .values(**{field: row[field] for field in update_fields})
+            )
+
+    async def bulk_upsert(
+        self,
+        rows: list,
+        conflict_fields: list,
+        update_fields: list = None,
+        chunk_size: int = BULK_CHUNK_SIZE,
+    ):
+        """Inserts many records, rows clashing with an existing record on
+        conflict_fields (a unique key) update its update_fields instead. Without
+        update_fields the existing record is kept as it is.
+
+        MySQL, PostgreSQL and SQLite send each chunk as one upsert statement, other
+        databases upsert row by row.
 
-                db.commit()
+        Returns:
+            int: the number of rows sent
+        """
 
-                db.refresh(data_row)
+        async with Base_Dao.session() as db:
+            try:
+                update_fields = update_fields or []
+                stmt = self._upsert_statement(
+                    db.get_bind().dialect.name, conflict_fields, update_fields
+                )
 
-                return data_row.__dict__
+                for start in range(0, len(rows), chunk_size):
+                    chunk = rows[start : start + chunk_size]
 
-        except SQLAlchemyError as e:
-            db.rollback()
+                    if stmt is None:
+                        for row in chunk:
+                            await self._upsert_row(db, row, conflict_fields, update_fields)
+                    else:
+                        await db.execute(stmt, chunk)
 
-            raise e
+                    await self.commit(db)
+
+                return len(rows)
+
+            except SQLAlchemyError as e:
+                await db.rollback()
+
+                raise e
+
+    async def update_record(self, data, field_name, field_value, conditions: list = None):
+        """Updates the record whose field_name is field_value, which should
+        identify a single record, and returns it as updated. conditions are extra
+        criteria the record must meet, checked by the UPDATE itself. None when no
+        record matches.
+
+        Dialects with UPDATE ... RETURNING read the row back in the UPDATE itself,
+        the others (MySQL) read it again after the commit.
+        """
+
+        if not data:
+            return await self._select_record(field_name, field_value)
+
+        table = self.model.__table__
+
+        async with self.session() as db:
+            try:
+                stmt = (
+                    update(table)
+                    .where(
+                        getattr(self.model, field_name) == field_value,
+                        *(conditions or []),
+                    )
+                    .values(**data)
+                )
+
+                if db.get_bind().dialect.update_returning:
+                    record = (
+                        (await db.execute(stmt.returning(*table.columns)))
+                        .mappings()
+                        .first()
+                    )
+
+                    await self.commit(db)
+
+                    return dict(record) if record else None
+
+                result = await db.execute(stmt)
+
+                await self.commit(db)
+
+                if result.rowcount == 0:
+                    return None
+
+            except SQLAlchemyError as e:
+                await db.rollback()
+
+                raise e
+
+        return await self._select_record(field_name, data.get(field_name, field_value))
+
+    async def update_where(self, data: dict, filters: dict):
+        """Set based UPDATE of every record matching filters (see
+        fetch_records_where), a single statement however many records match.
+
+        Returns:
+            int: the number of records matched
+        """
+
+        async with self.session() as db:
+            try:
+                result = await db.execute(
+                    update(self.model.__table__)
+                    .where(self._where(filters))
+                    .values(**data)
+                )
+
+                await self.commit(db)
+
+                return result.rowcount
+
+            except SQLAlchemyError as e:
+                await db.rollback()
+
+                raise e
@@ -47,6 +47,22 @@ class Registration_Status_Enum(str, Enum):
     NOT_REGISTERED = "not_registered"
 
 
+class Export_Format_Enum(str, Enum):
+    CSV = "csv"
+    JSONL = "jsonl"
+
+
+class Ticket_Format_Enum(str, Enum):
+    PNG = "png"
+    SVG = "svg"
+
+
+class Row_Format_Enum(str, Enum):
+    DICT = "dict"  # a dict per row, free to modify
+    SLOTS = "slots"  # a read mostly Slots_Row per row, the lightest mapping
+    TUPLE = "tuple"  # plain tuples in the order of the selected columns
+
+
 # Cloudinary Based Enum
 
 
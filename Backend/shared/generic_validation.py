@@ -111,16 +111,9 @@ class Event_Request_Validation:
             )
 
     def check_participant_details(self, participant_details):
-        print(participant_details)
-
         participant_type = participant_details.get("participant_type").lower()
         participant_count = participant_details.get("participant_count")
 
-        print(
-            participant_type == generic_enum.Participant_Enum.INDIVIDUAL
-            and participant_count > 1
-        )
-
         if participant_type == generic_enum.Participant_Enum.GROUP and (
             participant_count == None or participant_count == 1
         ):
@@ -0,0 +1,22 @@
+from fastapi import Response
+from pydantic import TypeAdapter
+
+
+class Typed_JSON_Response(Response):
+    """JSON response which validates its content against a TypeAdapter once and
+    encodes it with pydantic-core.
+
+    Returning it from a route skips FastAPI's response_model pass (validate,
+    dump to python, stdlib json.dumps), so build the adapter from the same type
+    as the route's response_model and keep that for the OpenAPI schema.
+    """
+
+    media_type = "application/json"
+
+    def __init__(self, content, adapter: TypeAdapter, status_code: int = 200, headers=None):
+        self.adapter = adapter
+
+        super().__init__(content, status_code=status_code, headers=headers)
+
+    def render(self, content) -> bytes:
+        return self.adapter.dump_json(self.adapter.validate_python(content))
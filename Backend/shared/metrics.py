@@ -0,0 +1,57 @@
+from collections import defaultdict
+from threading import Lock
+
+
+class Timing_Metric:
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float):
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    def snapshot(self):
+        return {
+            "count": self.count,
+            "avg_ms": round(self.total / self.count * 1000, 3) if self.count else 0.0,
+            "max_ms": round(self.max * 1000, 3),
+        }
+
+
+class Metrics_Registry:
+    """In-process counters, timings and gauges exposed through GET /metrics."""
+
+    def __init__(self):
+        self._lock = Lock()
+        self._counters = defaultdict(int)
+        self._timings = defaultdict(Timing_Metric)
+        self._gauges = {}
+
+    def increment(self, name: str, value: int = 1):
+        with self._lock:
+            self._counters[name] += value
+
+    def observe(self, name: str, seconds: float):
+        with self._lock:
+            self._timings[name].observe(seconds)
+
+    def register_gauge(self, name: str, read_value):
+        """read_value is a callable which is evaluated on every snapshot."""
+        self._gauges[name] = read_value
+
+    def snapshot(self):
+        with self._lock:
+            counters = dict(self._counters)
+            timings = {
+                name: timing.snapshot() for name, timing in self._timings.items()
+            }
+
+        gauges = {name: read_value() for name, read_value in self._gauges.items()}
+
+        return {"counters": counters, "timings": timings, "gauges": gauges}
+
+
+metrics = Metrics_Registry()
@@ -0,0 +1,129 @@
+import json
+from uuid import uuid4
+
+from fastapi import Request, Response
+
+from settings import settings
+from shared import conditional
+from shared.cache import Memory_Cache_Backend, Single_Flight, create_cache_backend
+from shared.metrics import metrics
+
+
+class Response_Cache:
+    """Caches encoded JSON bodies of reads which are the same for every user.
+
+    Entries are grouped in namespaces. Every namespace has a generation token
+    stored in the backend next to the entries and part of every key, so
+    invalidate() drops all of a namespace's entries at once by swapping the token,
+    on every worker sharing the backend. Concurrent misses for one key share a
+    single load.
+
+    json_response() stores every body behind its ETag and a space, so hits are
+    revalidated without hashing the body again.
+    """
+
+    # Generation tokens outlive entries by far, losing one only costs misses
+    GENERATION_TTL_SECONDS = 30 * 24 * 3600
+
+    def __init__(self, backend, ttl_seconds: float):
+        self.backend = backend
+        self.ttl_seconds = ttl_seconds
+        self.loads = Single_Flight()
+
+    @staticmethod
+    def _generation_key(namespace: str):
+        return f"response_cache:{namespace}:generation"
+
+    async def _generation(self, namespace: str):
+        generation = await self.backend.get(self._generation_key(namespace))
+
+        if generation is None:
+            generation = uuid4().hex.encode()
+
+            await self.backend.set(
+                self._generation_key(namespace), generation, self.GENERATION_TTL_SECONDS
+            )
+
+        return generation.decode()
+
+    async def invalidate(self, *namespaces: str):
+        for namespace in namespaces:
+            await self.backend.set(
+                self._generation_key(namespace),
+                uuid4().hex.encode(),
+                self.GENERATION_TTL_SECONDS,
+            )
+
+            metrics.increment(f"response_cache.{namespace}.invalidate")
+
+    async def get_or_load(self, namespace: str, key: str, load):
+        """Returns the cached body, or awaits load() for it and caches the result."""
+        cache_key = f"response_cache:{namespace}:{await self._generation(namespace)}:{key}"
+
+        body = await self.backend.get(cache_key)
+
+        if body is not None:
+            metrics.increment(f"response_cache.{namespace}.hit")
+            return body
+
+        metrics.increment(f"response_cache.{namespace}.miss")
+
+        async def load_and_store():
+            body = await load()
+
+            await self.backend.set(cache_key, body, self.ttl_seconds)
+
+            return body
+
+        return await self.loads.run(cache_key, load_and_store)
+
+    async def _json_entry(self, namespace: str, key: str, load, adapter):
+        """(ETag, JSON body) of await load(), from the cache when it holds them."""
+
+        async def load_json():
+            body = adapter.dump_json(adapter.validate_python(await load()))
+
+            return conditional.content_etag(body).encode() + b" " + body
+
+        etag, body = (await self.get_or_load(namespace, key, load_json)).split(b" ", 1)
+
+        return etag.decode(), body
+
+    async def cached_json(self, namespace: str, key: str, load, adapter):
+        """The decoded JSON json_response() would send for the same arguments,
+        for responses which add per user data to a shared cached read."""
+        _, body = await self._json_entry(namespace, key, load, adapter)
+
+        return json.loads(body)
+
+    async def json_response(
+        self,
+        namespace: str,
+        key: str,
+        load,
+        adapter,
+        request: Request = None,
+        cache_control: str = conditional.PUBLIC_CACHE_CONTROL,
+    ):
+        """Response with the cached JSON of await load(), encoded through adapter.
+
+        Answers 304 when the request's If-None-Match holds the body's ETag.
+        """
+
+        etag, body = await self._json_entry(namespace, key, load, adapter)
+
+        if request is not None and conditional.is_not_modified(request, etag):
+            return conditional.not_modified_response(etag, cache_control=cache_control)
+
+        return Response(
+            content=body,
+            media_type="application/json",
+            headers=conditional.validator_headers(etag, cache_control=cache_control),
+        )
+
+
+response_cache = Response_Cache(
+    create_cache_backend(settings.RESPONSE_CACHE_URL)
+    or Memory_Cache_Backend(settings.RESPONSE_CACHE_SIZE),
+    ttl_seconds=settings.RESPONSE_CACHE_TTL_SECONDS,
+)
@@ -0,0 +1,50 @@
+from collections.abc import Mapping
+from functools import lru_cache
+
+
+class Slots_Row(Mapping):
+    """A row with one slot per selected column and no per instance __dict__.
+
+    Rows read like dicts (row["event_name"], row.get(...), {**row}) and like
+    objects (row.event_name), so pydantic schemas and services accept them
+    unchanged. Columns can be reassigned, none can be added.
+    """
+
+    __slots__ = ()
+    _fields = ()
+    _field_set = frozenset()
+
+    def __init__(self, *values):
+        for field, value in zip(self._fields, values):
+            object.__setattr__(self, field, value)
+
+    def __getitem__(self, key):
+        if key not in self._field_set:
+            raise KeyError(key)
+
+        return getattr(self, key)
+
+    def __setitem__(self, key, value):
+        if key not in self._field_set:
+            raise KeyError(key)
+
+        object.__setattr__(self, key, value)
+
+    def __iter__(self):
+        return iter(self._fields)
+
+    def __len__(self):
+        return len(self._fields)
+
+    def __repr__(self):
+        return f"Row({', '.join(f'{field}={self[field]!r}' for field in self._fields)})"
+
+
+@lru_cache(maxsize=256)
+def row_class(fields: tuple):
+    """The Slots_Row subclass for a column list, built once per distinct list."""
+    return type(
+        "Row",
+        (Slots_Row,),
+        {"__slots__": fields, "_fields": fields, "_field_set": frozenset(fields)},
+    )
@@ -0,0 +1,57 @@
+import csv
+import io
+import json
+
+from fastapi.responses import StreamingResponse
+
+from shared.generic_enum import Export_Format_Enum
+
+EXPORT_MEDIA_TYPES = {
+    Export_Format_Enum.CSV: "text/csv; charset=utf-8",
+    Export_Format_Enum.JSONL: "application/x-ndjson",
+}
+
+
+async def encode_csv(columns: list, row_batches):
+    """Yields the header line, then one encoded chunk per batch of rows."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    writer.writerow(columns)
+
+    async for rows in row_batches:
+        writer.writerows([[row[column] for column in columns] for row in rows])
+
+        yield buffer.getvalue().encode()
+
+        buffer.seek(0)
+        buffer.truncate()
+
+    # Only the header when there were no rows
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+async def encode_jsonl(row_batches):
+    """Yields one encoded chunk of JSON lines per batch of rows."""
+    async for rows in row_batches:
+        yield "".join(json.dumps(row) + "\n" for row in rows).encode()
+
+
+def export_response(
+    export_format: Export_Format_Enum, columns: list, row_batches, filename: str
+):
+    """StreamingResponse which encodes row_batches, an async iterator of lists of
+    dicts with JSON friendly values, as they are produced."""
+    if export_format == Export_Format_Enum.CSV:
+        body = encode_csv(columns, row_batches)
+    else:
+        body = encode_jsonl(row_batches)
+
+    return StreamingResponse(
+        body,
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={
+            "Content-Disposition": f'attachment; filename="{filename}.{export_format.value}"'
+        },
+    )
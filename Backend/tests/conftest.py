@@ -0,0 +1,211 @@
+"""Shared fixtures of the test suite.
+
+Tests run against a throwaway SQLite database, created again for every test, so
+they never touch the database configured in .env. The environment is set before
+anything from the app is imported, since settings are read at import time.
+
+Run the suite from the Backend folder: python -m pytest
+"""
+
+import os
+import tempfile
+from datetime import datetime, timedelta
+
+import pytest
+from cryptography.fernet import Fernet
+
+TEST_DIR = tempfile.mkdtemp(prefix="event_tests_")
+
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{os.path.join(TEST_DIR, 'test.sqlite')}"
+os.environ["UPLOAD_STORAGE"] = "local"
+os.environ["UPLOAD_LOCAL_DIR"] = os.path.join(TEST_DIR, "media")
+os.environ["TICKET_CACHE_DIR"] = os.path.join(TEST_DIR, "tickets")
+os.environ["RESPONSE_CACHE_URL"] = ""
+os.environ["PRINCIPAL_CACHE_URL"] = ""
+
+_defaults = {
+    "APP_NAME": "Event Management Tests",
+    "JWT_SECRET_KEY": "test-secret-key-which-is-long-enough",
+    "ACCESS_TOKEN_EXPIRE_MINUTES": "120",
+    "ALGORITHM": "HS256",
+    "GEOCODING_API_KEY": "test",
+    "RAZORPAY_MERCHANT_ID": "test",
+    "RAZORPAY_SECRET_KEY": "test",
+    "CLOUDINARY_SECRET_KEY": "test",
+    "CLOUDINARY_API_KEY": "test",
+    "CIPHER_KEY": Fernet.generate_key().decode(),
+    "BCRYPT_ROUNDS": "4",
+}
+
+for key, value in _defaults.items():
+    os.environ.setdefault(key, value)
+
+import httpx  # noqa: E402
+from sqlalchemy import event, insert  # noqa: E402
+
+import main  # noqa: E402
+from core.auth import Jwt_Token  # noqa: E402
+from database import Base, SessionLocal, engine  # noqa: E402
+from modules.events import models as event_models  # noqa: E402
+from modules.users import models as user_models  # noqa: E402
+from shared import generic_enum  # noqa: E402
+from shared.response_cache import response_cache  # noqa: E402
+from utils.ids import new_id  # noqa: E402
+from utils.upload_pipeline import upload_pipeline  # noqa: E402
+
+CATEGORY_ID = 1
+LOCATION_ID = 1
+
+
+@event.listens_for(engine.sync_engine, "connect")
+def _configure_sqlite(dbapi_connection, connection_record):
+    # WAL plus a busy timeout lets concurrent requests queue for the write lock
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA busy_timeout=30000")
+    cursor.close()
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture(autouse=True)
+async def database(anyio_backend):
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.drop_all)
+        await connection.run_sync(Base.metadata.create_all)
+
+    async with SessionLocal() as db:
+        await db.execute(
+            insert(event_models.Event_Category_Model),
+            [
+                {
+                    "category_id": CATEGORY_ID,
+                    "category_name": "Music",
+                    "category_image_url": "https://example.com/music.png",
+                }
+            ],
+        )
+        await db.execute(
+            insert(event_models.Event_Location_Model),
+            [
+                {
+                    "location_id": LOCATION_ID,
+                    "full_location": "1 Test Street Chennai Tamil Nadu India",
+                    "latitude": 13.08,
+                    "longitude": 80.27,
+                }
+            ],
+        )
+        await db.commit()
+
+    response_cache.backend.entries.clear()
+
+    yield
+
+    await upload_pipeline.drain()
+
+    # Pooled connections belong to this test's event loop
+    await engine.dispose()
+
+
+@pytest.fixture
+def make_user():
+    """Inserts a user, with a profile unless told otherwise, and returns its id."""
+
+    async def make_user(with_profile: bool = True):
+        user_id = new_id()
+
+        async with SessionLocal() as db:
+            await db.execute(
+                insert(user_models.UsersModel),
+                [{"user_id": user_id, "email": f"{user_id}@test.dev", "password": "x"}],
+            )
+
+            if with_profile:
+                await db.execute(
+                    insert(user_models.ProfileModel),
+                    [
+                        {
+                            "profile_id": new_id(),
+                            "user_id": user_id,
+                            "first_name": "Test",
+                            "last_name": "User",
+                            "college_name": "Test College",
+                            "gender": user_models.GenderEnum.female,
+                            "about_me": "Created by the test suite",
+                        }
+                    ],
+                )
+
+            await db.commit()
+
+        return user_id
+
+    return make_user
+
+
+@pytest.fixture
+def make_event():
+    """Inserts an upcoming free event, columns can be overridden, and returns its id."""
+
+    async def make_event(creator_id: str, **columns):
+        now = datetime.now()
+        event_id = new_id()
+
+        event_row = {
+            "event_id": event_id,
+            "event_name": "Test event",
+            "event_description": "An event created by the test suite",
+            "event_image_url": "https://example.com/event.png",
+            "event_agenda": "Talks and music",
+            "landmark": "Near the test park",
+            "event_start_date_time": now + timedelta(days=1),
+            "event_end_date_time": now + timedelta(days=2),
+            "ticket_type": generic_enum.Ticket_Type_Enum.FREE,
+            "ticket_fare": 0,
+            "total_tickets": 100,
+            "tickets_sold": 0,
+            "participant_type": generic_enum.Participant_Enum.INDIVIDUAL,
+            "participant_count": 1,
+            "category_id": CATEGORY_ID,
+            "address_id": LOCATION_ID,
+            "creator_id": creator_id,
+            **columns,
+        }
+
+        async with SessionLocal() as db:
+            await db.execute(insert(event_models.Events_Model), [event_row])
+            await db.commit()
+
+        return event_id
+
+    return make_event
+
+
+@pytest.fixture
+async def make_client():
+    """Opens an HTTP client on the app, signed in as user_id when one is given."""
+    clients = []
+
+    def make_client(user_id: str = None):
+        cookies = {}
+
+        if user_id is not None:
+            cookies["access_token"] = Jwt_Token.create_access_token({"sub": user_id})
+
+        client = httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=main.app),
+            base_url="http://test",
+            cookies=cookies,
+        )
+        clients.append(client)
+
+        return client
+
+    yield make_client
+
+    for client in clients:
+        await client.aclose()
@@ -0,0 +1,59 @@
+import pytest
+
+from modules.events.models import location_dao
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture(params=["statement", "row_by_row"])
+def upsert_path(request, monkeypatch):
+    """Runs a test with the dialect's upsert statement and with the fallback."""
+    if request.param == "row_by_row":
+        monkeypatch.setattr(
+            location_dao, "_upsert_statement", lambda *arguments: None
+        )
+
+    return request.param
+
+
+def location(full_location: str, latitude: float):
+    return {"full_location": full_location, "latitude": latitude, "longitude": 80.0}
+
+
+async def stored_latitudes(full_locations: list):
+    locations = await location_dao.get_locations_by_full_locations(full_locations)
+
+    return {
+        full_location: locations[full_location]["latitude"]
+        for full_location in full_locations
+    }
+
+
+async def test_existing_rows_are_kept_without_update_fields(upsert_path):
+    await location_dao.bulk_upsert([location("A Street", 1.0)], ["full_location"])
+
+    sent = await location_dao.bulk_upsert(
+        [location("A Street", 2.0), location("B Street", 3.0)], ["full_location"]
+    )
+
+    assert sent == 2
+    assert await stored_latitudes(["A Street", "B Street"]) == {
+        "A Street": 1.0,
+        "B Street": 3.0,
+    }
+
+
+async def test_existing_rows_take_the_update_fields(upsert_path):
+    await location_dao.bulk_upsert([location("A Street", 1.0)], ["full_location"])
+
+    await location_dao.bulk_upsert(
+        [location("A Street", 2.0), location("B Street", 3.0)],
+        ["full_location"],
+        update_fields=["latitude"],
+        chunk_size=1,
+    )
+
+    assert await stored_latitudes(["A Street", "B Street"]) == {
+        "A Street": 2.0,
+        "B Street": 3.0,
+    }
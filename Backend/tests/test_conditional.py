@@ -0,0 +1,103 @@
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+
+async def revalidate(client, url: str, etag: str):
+    return await client.get(url, headers={"If-None-Match": etag})
+
+
+async def test_event_detail_answers_304_for_its_etag(make_user, make_event, make_client):
+    creator_id = await make_user()
+    event_id = await make_event(creator_id)
+    client = make_client(creator_id)
+
+    response = await client.get(f"/events/{event_id}")
+
+    assert response.status_code == 200
+    assert "Last-Modified" in response.headers
+
+    etag = response.headers["ETag"]
+    not_modified = await revalidate(client, f"/events/{event_id}", etag)
+
+    assert not_modified.status_code == 304
+    assert not_modified.content == b""
+    assert not_modified.headers["ETag"] == etag
+
+    not_modified = await client.get(
+        f"/events/{event_id}",
+        headers={"If-Modified-Since": response.headers["Last-Modified"]},
+    )
+
+    assert not_modified.status_code == 304
+
+
+async def test_event_update_changes_the_etag(make_user, make_event, make_client):
+    creator_id = await make_user()
+    event_id = await make_event(creator_id)
+    client = make_client(creator_id)
+
+    etag = (await client.get(f"/events/{event_id}")).headers["ETag"]
+
+    updated = await client.patch(
+        "/events/", data={"event_id": event_id, "event_name": "Renamed event"}
+    )
+
+    assert updated.status_code == 200
+
+    response = await revalidate(client, f"/events/{event_id}", etag)
+
+    assert response.status_code == 200
+    assert response.json()["event_name"] == "Renamed event"
+    assert response.headers["ETag"] != etag
+
+
+async def test_a_booking_changes_every_viewers_etag(make_user, make_event, make_client):
+    creator_id = await make_user()
+    event_id = await make_event(creator_id, total_tickets=10)
+    creator_client = make_client(creator_id)
+    attendee_client = make_client(await make_user())
+
+    creator_etag = (await creator_client.get(f"/events/{event_id}")).headers["ETag"]
+    attendee_etag = (await attendee_client.get(f"/events/{event_id}")).headers["ETag"]
+
+    registered = await attendee_client.post(
+        "/events/register", json={"event_id": event_id}
+    )
+
+    assert registered.status_code == 201
+
+    # The available tickets changed for everyone, the register_state for the attendee
+    creator_response = await revalidate(creator_client, f"/events/{event_id}", creator_etag)
+    attendee_response = await revalidate(
+        attendee_client, f"/events/{event_id}", attendee_etag
+    )
+
+    assert creator_response.status_code == 200
+    assert creator_response.json()["ticket_details"]["available_tickets"] == 9
+    assert attendee_response.status_code == 200
+    assert attendee_response.json()["register_state"] == "registered"
+
+
+async def test_profile_answers_304_until_it_is_updated(make_user, make_client):
+    client = make_client(await make_user())
+
+    response = await client.get("/users/profile")
+
+    assert response.status_code == 200
+
+    etag = response.headers["ETag"]
+
+    assert (await revalidate(client, "/users/profile", etag)).status_code == 304
+
+    updated = await client.patch(
+        "/users/profile", data={"first_name": "Renamed", "gender": "female"}
+    )
+
+    assert updated.status_code == 200
+
+    response = await revalidate(client, "/users/profile", etag)
+
+    assert response.status_code == 200
+    assert response.json()["first_name"] == "Renamed"
+    assert response.headers["ETag"] != etag
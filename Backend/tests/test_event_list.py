@@ -0,0 +1,136 @@
+from base64 import urlsafe_b64encode
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import HTTPException
+
+from shared import generic_enum
+from utils import cursor as cursor_utils
+from utils.ids import new_id
+
+pytestmark = pytest.mark.anyio
+
+
+async def walk_pages(client, url: str = "/events/", **params):
+    """Follows next_cursor from the first page to the last, returns every page."""
+    pages = []
+    cursor = None
+
+    while True:
+        response = await client.get(
+            url, params={**params, **({"cursor": cursor} if cursor else {})}
+        )
+
+        assert response.status_code == 200
+
+        pages.append(response.json())
+        cursor = pages[-1]["next_cursor"]
+
+        if cursor is None:
+            return pages
+
+
+def test_cursor_round_trip():
+    start_date_time = datetime(2030, 5, 17, 18, 30, 15, 250000)
+    event_id = new_id()
+
+    cursor = cursor_utils.encode_cursor(start_date_time, event_id)
+
+    assert cursor_utils.decode_cursor(cursor) == (start_date_time, event_id)
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        "not a cursor",
+        urlsafe_b64encode(b"2030-05-17T18:30:00").decode(),
+        urlsafe_b64encode(b"yesterday|00000000000070008000000000000000").decode(),
+        urlsafe_b64encode(b"2030-05-17T18:30:00|not-a-uuid").decode(),
+        urlsafe_b64encode(b"\xff\xfe|\x00").decode(),
+    ],
+)
+def test_tampered_cursor_is_rejected(cursor):
+    with pytest.raises(HTTPException) as raised:
+        cursor_utils.decode_cursor(cursor)
+
+    assert raised.value.status_code == 400
+
+
+async def test_tampered_cursor_answers_400(make_client):
+    response = await make_client().get("/events/", params={"cursor": "bm90LWEtY3Vyc29y"})
+
+    assert response.status_code == 400
+
+
+async def test_pages_are_stable_across_equal_start_times(make_user, make_event, make_client):
+    creator_id = await make_user()
+    start_date_time = (datetime.now() + timedelta(days=3)).replace(microsecond=0)
+
+    event_ids = [
+        await make_event(creator_id, event_start_date_time=start_date_time)
+        for _ in range(7)
+    ]
+    later_event_id = await make_event(
+        creator_id, event_start_date_time=start_date_time + timedelta(hours=1)
+    )
+
+    pages = await walk_pages(make_client(), limit=3)
+
+    assert [len(page["events"]) for page in pages] == [3, 3, 2]
+    # Ties on the start time are broken by event_id, so nothing repeats or goes missing
+    assert [event["event_id"] for page in pages for event in page["events"]] == [
+        *sorted(event_ids),
+        later_event_id,
+    ]
+
+
+async def test_filtered_pages_are_stable_across_equal_start_times(
+    make_user, make_event, make_client
+):
+    creator_id = await make_user()
+    start_date_time = (datetime.now() + timedelta(days=3)).replace(microsecond=0)
+
+    free_event_ids = []
+
+    for index in range(8):
+        if index % 2:
+            await make_event(
+                creator_id,
+                event_start_date_time=start_date_time,
+                ticket_type=generic_enum.Ticket_Type_Enum.PAID,
+                ticket_fare=100,
+            )
+        else:
+            free_event_ids.append(
+                await make_event(creator_id, event_start_date_time=start_date_time)
+            )
+
+    # An event which already started is never listed
+    await make_event(creator_id, event_start_date_time=datetime.now() - timedelta(hours=1))
+
+    pages = await walk_pages(make_client(), limit=3, ticket_type="free")
+
+    assert [len(page["events"]) for page in pages] == [3, 1]
+    assert [event["event_id"] for page in pages for event in page["events"]] == sorted(
+        free_event_ids
+    )
+
+
+async def test_category_pages_follow_the_event_list(make_user, make_event, make_client):
+    creator_id = await make_user()
+    start_date_time = (datetime.now() + timedelta(days=3)).replace(microsecond=0)
+
+    event_ids = [
+        await make_event(creator_id, event_start_date_time=start_date_time)
+        for _ in range(5)
+    ]
+    await make_event(creator_id, event_start_date_time=datetime.now() - timedelta(hours=1))
+
+    client = make_client(creator_id)
+    category_pages = await walk_pages(client, "/events/category/1", limit=2)
+
+    assert [len(page["events"]) for page in category_pages] == [2, 2, 1]
+    assert category_pages == await walk_pages(client, category_id=1, limit=2)
+    assert [
+        event["event_id"] for page in category_pages for event in page["events"]
+    ] == sorted(event_ids)
@@ -0,0 +1,102 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import func, select
+
+from database import SessionLocal
+from modules.events.models import Event_Bookings_Model, Events_Model
+from shared import generic_enum
+
+pytestmark = pytest.mark.anyio
+
+
+async def event_seats(event_id: str):
+    """(tickets_sold, bookings) of the event, read straight from the database."""
+    async with SessionLocal() as db:
+        tickets_sold = (
+            await db.execute(
+                select(Events_Model.tickets_sold).where(Events_Model.event_id == event_id)
+            )
+        ).scalar_one()
+        bookings = (
+            await db.execute(
+                select(func.count()).where(Event_Bookings_Model.event_id == event_id)
+            )
+        ).scalar_one()
+
+    return tickets_sold, bookings
+
+
+async def test_concurrent_registrations_never_oversell(make_user, make_event, make_client):
+    creator_id = await make_user()
+    event_id = await make_event(creator_id, total_tickets=5)
+    attendee_ids = [await make_user() for _ in range(20)]
+
+    responses = await asyncio.gather(
+        *(
+            make_client(attendee_id).post("/events/register", json={"event_id": event_id})
+            for attendee_id in attendee_ids
+        )
+    )
+
+    status_codes = sorted(response.status_code for response in responses)
+
+    assert status_codes == [201] * 5 + [409] * 15
+    assert await event_seats(event_id) == (5, 5)
+
+
+async def test_registering_twice_returns_the_same_booking(make_user, make_event, make_client):
+    creator_id = await make_user()
+    event_id = await make_event(creator_id)
+    client = make_client(await make_user())
+
+    first = await client.post("/events/register", json={"event_id": event_id})
+    second = await client.post("/events/register", json={"event_id": event_id})
+
+    assert first.status_code == 201
+    assert second.status_code == 200
+    assert second.json()["booking_id"] == first.json()["booking_id"]
+    assert await event_seats(event_id) == (1, 1)
+
+
+async def test_concurrent_duplicates_take_one_seat(make_user, make_event, make_client):
+    creator_id = await make_user()
+    event_id = await make_event(creator_id)
+    client = make_client(await make_user())
+
+    responses = await asyncio.gather(
+        *(client.post("/events/register", json={"event_id": event_id}) for _ in range(5))
+    )
+
+    assert sorted(response.status_code for response in responses) == [200] * 4 + [201]
+    assert len({response.json()["booking_id"] for response in responses}) == 1
+    assert await event_seats(event_id) == (1, 1)
+
+
+async def test_started_events_are_rejected(make_user, make_event, make_client):
+    creator_id = await make_user()
+    event_id = await make_event(
+        creator_id, event_start_date_time=datetime.now() - timedelta(hours=1)
+    )
+
+    response = await make_client(await make_user()).post(
+        "/events/register", json={"event_id": event_id}
+    )
+
+    assert response.status_code == 400
+    assert await event_seats(event_id) == (0, 0)
+
+
+async def test_paid_events_answer_501(make_user, make_event, make_client):
+    creator_id = await make_user()
+    event_id = await make_event(
+        creator_id, ticket_type=generic_enum.Ticket_Type_Enum.PAID, ticket_fare=250
+    )
+
+    response = await make_client(await make_user()).post(
+        "/events/register", json={"event_id": event_id}
+    )
+
+    assert response.status_code == 501
+    assert await event_seats(event_id) == (0, 0)
@@ -0,0 +1,142 @@
+import io
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from modules.events.geocoding import Geocoding_Provider, geocoder
+from settings import settings
+from shared.cache import Memory_Cache_Backend
+from shared.response_cache import Response_Cache
+from utils.upload_pipeline import upload_pipeline
+
+pytestmark = pytest.mark.anyio
+
+PNG_IMAGE = b"\x89PNG\r\n\x1a\n" + b"\x00" * 64
+
+
+class Fixed_Provider(Geocoding_Provider):
+    async def geocode(self, client, address: str):
+        return {"latitude": 12.97, "longitude": 77.59}
+
+
+@pytest.fixture
+def fixed_geocoding(monkeypatch):
+    monkeypatch.setattr(geocoder, "provider", Fixed_Provider())
+
+
+def event_form(event_name: str) -> dict:
+    now = datetime.now(timezone.utc)
+
+    return {
+        "event_name": event_name,
+        "event_description": "An event created through the API",
+        "event_agenda": "Talks and music",
+        "event_start_date_time": (now + timedelta(days=3)).isoformat(),
+        "event_end_date_time": (now + timedelta(days=4)).isoformat(),
+        "category_id": 1,
+        "street_address": "12 Gandhi Street",
+        "city": "Bengaluru",
+        "state": "Karnataka",
+        "pin_code": "560001",
+        "country": "India",
+        "ticket_type": "free",
+        "ticket_fare": 0,
+        "total_tickets": 50,
+        "participant_type": "individual",
+        "participant_count": 1,
+        "landmark": "Near the park",
+    }
+
+
+async def listed_events(client) -> dict:
+    """{event_id: event} of the first page of GET /events."""
+    response = await client.get("/events/")
+
+    assert response.status_code == 200
+
+    return {event["event_id"]: event for event in response.json()["events"]}
+
+
+async def test_invalidate_drops_a_namespace_for_every_worker():
+    backend = Memory_Cache_Backend()
+    worker, other_worker = Response_Cache(backend, 60), Response_Cache(backend, 60)
+    loads = []
+
+    def loader(body: bytes):
+        async def load():
+            loads.append(body)
+            return body
+
+        return load
+
+    assert await worker.get_or_load("events", "list", loader(b"v1")) == b"v1"
+    assert await other_worker.get_or_load("events", "list", loader(b"v2")) == b"v1"
+    assert await worker.get_or_load("categories", "list", loader(b"c1")) == b"c1"
+
+    await other_worker.invalidate("events")
+
+    assert await worker.get_or_load("events", "list", loader(b"v3")) == b"v3"
+    # Other namespaces keep their entries
+    assert await worker.get_or_load("categories", "list", loader(b"c2")) == b"c1"
+    assert loads == [b"v1", b"c1", b"v3"]
+
+
+async def test_created_event_and_its_image_reach_the_list(
+    make_user, make_client, fixed_geocoding
+):
+    client = make_client(await make_user())
+
+    assert await listed_events(client) == {}
+
+    created = await client.post(
+        "/events/",
+        data=event_form("Created event"),
+        files={"image_file": ("event.png", io.BytesIO(PNG_IMAGE), "image/png")},
+    )
+
+    assert created.status_code == 201
+
+    (event_id,) = await listed_events(client)
+
+    # The background upload saves the stored image's URL, then invalidates
+    await upload_pipeline.drain()
+
+    events = await listed_events(client)
+
+    assert events[event_id]["event_image_url"].startswith(settings.UPLOAD_LOCAL_BASE_URL)
+
+
+async def test_updated_event_reaches_the_list(make_user, make_event, make_client):
+    creator_id = await make_user()
+    event_id = await make_event(creator_id)
+    client = make_client(creator_id)
+
+    assert (await listed_events(client))[event_id]["event_name"] == "Test event"
+
+    updated = await client.patch(
+        "/events/", data={"event_id": event_id, "event_name": "Renamed event"}
+    )
+
+    assert updated.status_code == 200
+    assert (await listed_events(client))[event_id]["event_name"] == "Renamed event"
+
+
+async def test_imported_events_reach_the_list(make_user, make_client, fixed_geocoding):
+    client = make_client(await make_user())
+
+    assert await listed_events(client) == {}
+
+    form = event_form("Imported event")
+    csv_file = ",".join(form) + "\n" + ",".join(str(value) for value in form.values())
+
+    imported = await client.post(
+        "/events/import",
+        files={"import_file": ("events.csv", io.BytesIO(csv_file.encode()), "text/csv")},
+    )
+
+    assert imported.status_code == 200
+    assert imported.json()["imported"] == 1
+
+    events = await listed_events(client)
+
+    assert [event["event_name"] for event in events.values()] == ["Imported event"]
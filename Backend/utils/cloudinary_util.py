@@ -1,39 +1,23 @@
 import config
 from cloudinary import uploader, exceptions as cloudinary_exception
-from shared import generic_enum
 
-from fastapi import status
+from utils.upload_pipeline import Storage_Backend, Storage_Error
 
 
-from fastapi import HTTPException
+class Cloudinary_Storage(Storage_Backend):
+    # Files above this go up in chunks through upload_large
+    CHUNK_SIZE = 6 * 1024 * 1024
 
+    def store(self, staged_upload):
+        try:
+            if staged_upload.size > self.CHUNK_SIZE:
+                upload_result = uploader.upload_large(
+                    staged_upload.path, chunk_size=self.CHUNK_SIZE
+                )
+            else:
+                upload_result = uploader.upload(staged_upload.path)
 
-def upload_file(file):
-    try:
-        if file.content_type not in {
-            member.value for member in generic_enum.AllowedFileTypes
-        }:
-            raise HTTPException(
-                status_code=415, detail="Only JPG and PNG files are allowed"
-            )
+            return upload_result["secure_url"]
 
-        upload_result = uploader.upload(file.file)
-        return upload_result["secure_url"]
-
-    except cloudinary_exception.Error as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Cloudinary API error: {str(e)}",
-        )
-
-    except HTTPException as http_err:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Cloudinary API error: {str(http_err)}",
-        )
-
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Cloudinary API error: {str(e)}",
-        )
+        except cloudinary_exception.Error as e:
+            raise Storage_Error(f"Cloudinary API error: {str(e)}") from e
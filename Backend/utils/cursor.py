@@ -0,0 +1,30 @@
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from binascii import Error as BinasciiError
+from datetime import datetime
+from uuid import UUID
+
+from fastapi import HTTPException, status
+
+
+# Keyset cursors point at the last row of a page: (event_start_date_time, event_id)
+
+
+def encode_cursor(start_date_time: datetime, event_id: str) -> str:
+    raw_cursor = f"{start_date_time.isoformat()}|{UUID(event_id).hex}"
+
+    return urlsafe_b64encode(raw_cursor.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple:
+    try:
+        padding = "=" * (-len(cursor) % 4)
+        raw_cursor = urlsafe_b64decode(cursor + padding).decode()
+
+        start_date_time, event_id = raw_cursor.split("|")
+
+        return datetime.fromisoformat(start_date_time), str(UUID(hex=event_id))
+
+    except (BinasciiError, UnicodeDecodeError, ValueError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid page cursor"
+        )
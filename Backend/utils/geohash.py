@@ -0,0 +1,121 @@
+import math
+
+import numpy as np
+
+
+# Geohash cells are nested: every extra character splits a cell into 32, so all
+# points inside a cell share its hash as a prefix and an indexed geohash column
+# can be searched cell by cell with plain range scans.
+
+BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+
+PRECISION = 9  # ~5 m cells, precision stored in event_location.geohash
+MAX_SEARCH_CELLS = 16
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180
+
+
+def cell_size(precision: int) -> tuple:
+    """Returns (latitude degrees, longitude degrees) covered by one cell."""
+    bits = precision * 5
+    latitude_bits, longitude_bits = bits // 2, bits - bits // 2
+
+    return 180 / 2**latitude_bits, 360 / 2**longitude_bits
+
+
+def _encode_cell(latitude_index: int, longitude_index: int, precision: int) -> str:
+    bits = precision * 5
+    latitude_bits, longitude_bits = bits // 2, bits - bits // 2
+
+    # Longitude and latitude bits are interleaved, longitude first
+    value = 0
+
+    for bit in range(bits):
+        if bit % 2 == 0:
+            position = longitude_bits - 1 - bit // 2
+            value = (value << 1) | ((longitude_index >> position) & 1)
+        else:
+            position = latitude_bits - 1 - bit // 2
+            value = (value << 1) | ((latitude_index >> position) & 1)
+
+    return "".join(
+        BASE32[(value >> shift) & 31] for shift in range(bits - 5, -1, -5)
+    )
+
+
+def _cell_index(latitude: float, longitude: float, precision: int) -> tuple:
+    latitude_size, longitude_size = cell_size(precision)
+    bits = precision * 5
+    latitude_cells, longitude_cells = 2 ** (bits // 2), 2 ** (bits - bits // 2)
+
+    latitude_index = min(int((latitude + 90) / latitude_size), latitude_cells - 1)
+    longitude_index = min(int((longitude + 180) / longitude_size), longitude_cells - 1)
+
+    return latitude_index, longitude_index
+
+
+def encode(latitude: float, longitude: float, precision: int = PRECISION) -> str:
+    return _encode_cell(*_cell_index(latitude, longitude, precision), precision)
+
+
+def covering_cells(latitude: float, longitude: float, radius_km: float) -> list:
+    """Returns the geohash prefixes of the cells which cover a circle.
+
+    The finest precision whose cells cover the circle's bounding box with at most
+    MAX_SEARCH_CELLS cells is used, so a search is a handful of index range scans.
+    """
+    latitude_delta = radius_km / KM_PER_DEGREE
+    south = max(latitude - latitude_delta, -90.0)
+    north = min(latitude + latitude_delta, 90.0)
+
+    # Longitude degrees shrink towards the poles, measure them at the widest edge
+    widest_cos = math.cos(math.radians(max(abs(south), abs(north))))
+    longitude_delta = (
+        radius_km / (KM_PER_DEGREE * widest_cos) if widest_cos > 1e-9 else 360.0
+    )
+
+    # West of the antimeridian the box wraps around to the far east cells
+    west = ((longitude - longitude_delta + 180) % 360) - 180
+
+    for precision in range(PRECISION, 0, -1):
+        _, longitude_size = cell_size(precision)
+        bits = precision * 5
+        longitude_cells = 2 ** (bits - bits // 2)
+
+        south_index, west_index = _cell_index(south, west, precision)
+        north_index, _ = _cell_index(north, west, precision)
+
+        latitude_span = north_index - south_index + 1
+        longitude_span = min(
+            int(2 * longitude_delta / longitude_size) + 2, longitude_cells
+        )
+
+        if latitude_span * longitude_span <= MAX_SEARCH_CELLS or precision == 1:
+            return sorted(
+                {
+                    _encode_cell(
+                        latitude_index,
+                        (west_index + offset) % longitude_cells,
+                        precision,
+                    )
+                    for latitude_index in range(south_index, north_index + 1)
+                    for offset in range(longitude_span)
+                }
+            )
+
+
+def haversine_km(latitude: float, longitude: float, latitudes, longitudes):
+    """Great circle distances from one point to arrays of points, in km."""
+    latitude, longitude = math.radians(latitude), math.radians(longitude)
+    latitudes = np.radians(np.asarray(latitudes, dtype=np.float64))
+    longitudes = np.radians(np.asarray(longitudes, dtype=np.float64))
+
+    a = (
+        np.sin((latitudes - latitude) / 2) ** 2
+        + math.cos(latitude)
+        * np.cos(latitudes)
+        * np.sin((longitudes - longitude) / 2) ** 2
+    )
+
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
@@ -0,0 +1,38 @@
+import secrets
+import threading
+import time
+from uuid import UUID
+
+# UUIDv7 (RFC 9562): 48 bits of Unix milliseconds, then 12 bits of sub
+# millisecond time, so ids sort by creation time and new rows land at the right
+# end of the primary key index instead of on random pages.
+
+_lock = threading.Lock()
+_last_timestamp = 0
+
+
+def uuid7() -> UUID:
+    """Time ordered UUID, strictly increasing within the process."""
+    global _last_timestamp
+
+    # Milliseconds in the top 48 bits, 1/4096 ms steps in the 12 below
+    timestamp = time.time_ns() * 4096 // 1_000_000
+
+    with _lock:
+        if timestamp <= _last_timestamp:
+            timestamp = _last_timestamp + 1
+
+        _last_timestamp = timestamp
+
+    return UUID(
+        int=(timestamp >> 12) << 80
+        | 0x7 << 76
+        | (timestamp & 0xFFF) << 64
+        | 0b10 << 62
+        | secrets.randbits(62)
+    )
+
+
+def new_id() -> str:
+    """Id for a new row, see Binary_UUID."""
+    return str(uuid7())
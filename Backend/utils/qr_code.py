@@ -1,2 +1,239 @@
-def create_qr_code_url():
-    pass
+import asyncio
+import base64
+import hashlib
+import hmac
+import io
+import logging
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from uuid import UUID
+
+import segno
+
+from settings import settings
+from shared import generic_enum
+from shared.disk_cache import Disk_LRU_Cache
+from shared.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+
+# A ticket is the QR code of a signed payload naming a booking and its event:
+# "1.<BOOKING_ID HEX>.<EVENT_ID HEX>.<SIGNATURE>". verify_ticket checks one at
+# the door without a database read. Payloads only use QR alphanumeric characters
+# (upper case, digits and "."), which keeps the code at version 5.
+#
+# A payload never changes for a booking, so its image is rendered once into a
+# disk cache keyed by the hash of what it is rendered from, and served from there.
+
+PAYLOAD_VERSION = "1"
+SIGNATURE_BYTES = 16
+# Part of every cache key, bump it when the rendering below changes
+RENDER_VERSION = "1"
+QR_ERROR_LEVEL = "m"
+QR_BORDER = 4
+
+MEDIA_TYPES = {
+    generic_enum.Ticket_Format_Enum.PNG: "image/png",
+    generic_enum.Ticket_Format_Enum.SVG: "image/svg+xml",
+}
+
+
+def _signature(body: str) -> str:
+    key = (settings.TICKET_SIGNING_KEY or settings.JWT_SECRET_KEY).encode()
+    digest = hmac.new(key, body.encode(), hashlib.sha256).digest()[:SIGNATURE_BYTES]
+
+    return base64.b32encode(digest).decode().rstrip("=")
+
+
+def sign_ticket(booking_id: str, event_id: str) -> str:
+    body = f"{PAYLOAD_VERSION}.{UUID(booking_id).hex.upper()}.{UUID(event_id).hex.upper()}"
+
+    return f"{body}.{_signature(body)}"
+
+
+def verify_ticket(payload: str):
+    """Returns (booking_id, event_id) of a genuine ticket payload, else None."""
+    try:
+        version, booking_hex, event_hex, signature = payload.split(".")
+
+        ids = (str(UUID(hex=booking_hex)), str(UUID(hex=event_hex)))
+    except ValueError:
+        return None
+
+    if version != PAYLOAD_VERSION or not hmac.compare_digest(
+        signature, _signature(f"{version}.{booking_hex}.{event_hex}")
+    ):
+        return None
+
+    return ids
+
+
+def create_qr_code_url(
+    booking_id: str,
+    image_format: generic_enum.Ticket_Format_Enum = generic_enum.Ticket_Format_Enum.PNG,
+) -> str:
+    """Path of the booking's ticket image, see GET /events/bookings/{booking_id}/ticket."""
+    return f"/events/bookings/{booking_id}/ticket?format={image_format.value}"
+
+
+def render_qr(payload: str, image_format: str, scale: int) -> bytes:
+    """Runs in the render processes, segno is pure Python and holds the GIL."""
+    qr_code = segno.make(payload, error=QR_ERROR_LEVEL)
+    buffer = io.BytesIO()
+
+    if image_format == generic_enum.Ticket_Format_Enum.SVG:
+        qr_code.save(buffer, kind="svg", scale=scale, border=QR_BORDER, xmldecl=False)
+    else:
+        qr_code.save(buffer, kind="png", scale=scale, border=QR_BORDER)
+
+    return buffer.getvalue()
+
+
+def render_qr_files(jobs: list) -> list:
+    """Process pool task of pre-generation: renders every (path, payload,
+    image_format, scale) straight into the cache and returns the file sizes."""
+    sizes = []
+
+    for path, payload, image_format, scale in jobs:
+        image = render_qr(payload, image_format, scale)
+
+        Disk_LRU_Cache.write_file(path, image)
+        sizes.append(len(image))
+
+    return sizes
+
+
+class Ticket_Renderer:
+    """Renders ticket images on a process pool, each one once.
+
+    Concurrent requests for the same image wait for a single render, and
+    pre-generation of a whole event runs in batches of batch_size per task.
+    """
+
+    def __init__(self, cache: Disk_LRU_Cache, max_workers: int, batch_size: int, scale: int):
+        self.cache = cache
+        self.max_workers = max_workers
+        self.batch_size = batch_size
+        self.scale = scale
+        self.executor = None  # started on the first render
+        self.rendering = {}  # cache key -> future of its render in flight
+        self.pending_tasks = set()
+
+    def _pool(self):
+        if self.executor is None:
+            # Forking a process which runs an event loop and thread pools is unsafe
+            self.executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+
+        return self.executor
+
+    def cache_key(self, payload: str, image_format: str) -> str:
+        image_format = generic_enum.Ticket_Format_Enum(image_format).value
+
+        return hashlib.sha256(
+            f"{RENDER_VERSION}:{image_format}:{self.scale}:{payload}".encode()
+        ).hexdigest()
+
+    async def get_image(self, payload: str, image_format: str) -> bytes:
+        key = self.cache_key(payload, image_format)
+
+        image = self.cache.get(key)
+
+        if image is not None:
+            metrics.increment("tickets.cache_hits")
+            return image
+
+        rendering = self.rendering.get(key)
+
+        if rendering is None:
+            rendering = asyncio.ensure_future(self._render(key, payload, image_format))
+
+            self.rendering[key] = rendering
+            rendering.add_done_callback(lambda _: self.rendering.pop(key, None))
+
+        # A cancelled request leaves the render running for the others
+        return await asyncio.shield(rendering)
+
+    async def _render(self, key: str, payload: str, image_format: str) -> bytes:
+        started = time.perf_counter()
+
+        image = await asyncio.get_running_loop().run_in_executor(
+            self._pool(), render_qr, payload, image_format, self.scale
+        )
+
+        self.cache.set(key, image)
+
+        metrics.observe("tickets.render", time.perf_counter() - started)
+
+        return image
+
+    async def pregenerate(self, payloads: list, image_format: str) -> int:
+        """Renders the images of payloads missing from the cache, returns how many."""
+        jobs = []
+
+        for payload in payloads:
+            key = self.cache_key(payload, image_format)
+
+            if key not in self.rendering and not self.cache.contains(key):
+                jobs.append((key, (self.cache.path(key), payload, image_format, self.scale)))
+
+        loop = asyncio.get_running_loop()
+
+        batches = [
+            jobs[start : start + self.batch_size]
+            for start in range(0, len(jobs), self.batch_size)
+        ]
+        batch_sizes = await asyncio.gather(
+            *(
+                loop.run_in_executor(
+                    self._pool(), render_qr_files, [job for _, job in batch]
+                )
+                for batch in batches
+            )
+        )
+
+        for batch, sizes in zip(batches, batch_sizes):
+            for (key, _), size in zip(batch, sizes):
+                self.cache.record(key, size)
+
+        metrics.increment("tickets.pregenerated", len(jobs))
+
+        return len(jobs)
+
+    def submit_pregeneration(self, payloads: list, image_format: str):
+        """Pre-generates in the background, the caller does not wait for it."""
+        task = asyncio.get_running_loop().create_task(
+            self._pregenerate_logged(payloads, image_format)
+        )
+
+        self.pending_tasks.add(task)
+        task.add_done_callback(self.pending_tasks.discard)
+
+        return task
+
+    async def _pregenerate_logged(self, payloads: list, image_format: str):
+        try:
+            await self.pregenerate(payloads, image_format)
+        except Exception:
+            logger.exception("Ticket pre-generation failed, tickets render on demand")
+
+    async def aclose(self):
+        """Waits for background pre-generation and stops the pool, called on shutdown."""
+        if self.pending_tasks:
+            await asyncio.gather(*self.pending_tasks, return_exceptions=True)
+
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+
+
+ticket_renderer = Ticket_Renderer(
+    Disk_LRU_Cache(settings.TICKET_CACHE_DIR, settings.TICKET_CACHE_MAX_BYTES),
+    max_workers=settings.TICKET_RENDER_WORKERS,
+    batch_size=settings.TICKET_RENDER_BATCH_SIZE,
+    scale=settings.TICKET_QR_SCALE,
+)
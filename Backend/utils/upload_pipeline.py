@@ -0,0 +1,184 @@
+import asyncio
+import contextvars
+import logging
+import os
+import shutil
+import tempfile
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from uuid import uuid4
+
+from fastapi import HTTPException, UploadFile, status
+
+from settings import settings
+from shared import generic_enum
+from shared.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+
+# Image uploads are staged to a local temp file while the request is validated,
+# then stored by a background worker. Records are saved with
+# settings.PENDING_IMAGE_URL and get the real URL once the upload finishes.
+
+CHUNK_SIZE = 64 * 1024
+
+# Leading bytes of the accepted image types, the declared content type is not trusted
+FILE_SIGNATURES = {
+    generic_enum.AllowedFileTypes.JPEG.value: (b"\xff\xd8\xff", ".jpg"),
+    generic_enum.AllowedFileTypes.PNG.value: (b"\x89PNG\r\n\x1a\n", ".png"),
+}
+
+
+class Storage_Error(Exception):
+    pass
+
+
+class Staged_Upload:
+    def __init__(self, path: str, content_type: str, extension: str, size: int):
+        self.path = path
+        self.content_type = content_type
+        self.extension = extension
+        self.size = size
+        self.claimed = False  # set once the pipeline owns the temp file
+
+    def discard(self):
+        if not self.claimed and os.path.exists(self.path):
+            os.remove(self.path)
+
+
+class Storage_Backend(ABC):
+    @abstractmethod
+    def store(self, staged_upload: Staged_Upload) -> str:
+        """Stores the staged file and returns its public URL. Runs in a worker thread."""
+
+
+class Local_Storage(Storage_Backend):
+    """Keeps images on the local disk, for development and tests."""
+
+    def __init__(self, directory: str, base_url: str):
+        self.directory = directory
+        self.base_url = base_url.rstrip("/")
+
+        os.makedirs(directory, exist_ok=True)
+
+    def store(self, staged_upload: Staged_Upload) -> str:
+        file_name = f"{uuid4().hex}{staged_upload.extension}"
+
+        with open(staged_upload.path, "rb") as source, open(
+            os.path.join(self.directory, file_name), "wb"
+        ) as target:
+            shutil.copyfileobj(source, target, CHUNK_SIZE)
+
+        return f"{self.base_url}/{file_name}"
+
+
+async def stage_upload(upload_file: UploadFile) -> Staged_Upload:
+    """Checks the image and copies it chunk by chunk to a temp file."""
+
+    if upload_file.content_type not in FILE_SIGNATURES:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail="Only JPG and PNG files are allowed",
+        )
+
+    signature, extension = FILE_SIGNATURES[upload_file.content_type]
+
+    staged_file = tempfile.NamedTemporaryFile(
+        prefix="upload_", suffix=extension, dir=settings.UPLOAD_STAGING_DIR, delete=False
+    )
+    staged_upload = Staged_Upload(staged_file.name, upload_file.content_type, extension, 0)
+
+    try:
+        with staged_file:
+            while chunk := await upload_file.read(CHUNK_SIZE):
+                if staged_upload.size == 0 and not chunk.startswith(signature):
+                    raise HTTPException(
+                        status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+                        detail="The file content does not match its image type",
+                    )
+
+                staged_upload.size += len(chunk)
+
+                if staged_upload.size > settings.UPLOAD_MAX_BYTES:
+                    raise HTTPException(
+                        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                        detail=f"Images must be at most {settings.UPLOAD_MAX_BYTES} bytes",
+                    )
+
+                staged_file.write(chunk)
+
+        if staged_upload.size == 0:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST, detail="The image file is empty"
+            )
+
+    except BaseException:
+        staged_upload.discard()
+        raise
+
+    return staged_upload
+
+
+class Upload_Pipeline:
+    """Stores staged uploads on a bounded thread pool, off the request path."""
+
+    def __init__(self, storage: Storage_Backend, max_workers: int):
+        self.storage = storage
+        self.executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="upload"
+        )
+        self.pending_tasks = set()
+
+    def submit(self, staged_upload: Staged_Upload, finalize):
+        """Uploads in the background, then awaits finalize(url) to save the URL.
+
+        The task runs in a fresh context so finalize opens its own DB session
+        instead of reusing the one of the request, which is closed by then.
+        """
+        staged_upload.claimed = True
+
+        task = asyncio.get_running_loop().create_task(
+            self._upload(staged_upload, finalize), context=contextvars.Context()
+        )
+
+        self.pending_tasks.add(task)
+        task.add_done_callback(self.pending_tasks.discard)
+
+        return task
+
+    async def _upload(self, staged_upload: Staged_Upload, finalize):
+        loop = asyncio.get_running_loop()
+
+        try:
+            url = await loop.run_in_executor(
+                self.executor, self.storage.store, staged_upload
+            )
+
+            await finalize(url)
+
+            metrics.increment("uploads.stored")
+
+        except Exception:
+            metrics.increment("uploads.failed")
+            logger.exception("Image upload failed, the record keeps its pending URL")
+
+        finally:
+            os.remove(staged_upload.path)
+
+    async def drain(self):
+        """Waits for in flight uploads, called on shutdown."""
+        if self.pending_tasks:
+            await asyncio.gather(*self.pending_tasks, return_exceptions=True)
+
+
+def _create_storage() -> Storage_Backend:
+    if settings.UPLOAD_STORAGE == "local":
+        return Local_Storage(settings.UPLOAD_LOCAL_DIR, settings.UPLOAD_LOCAL_BASE_URL)
+
+    from utils.cloudinary_util import Cloudinary_Storage
+
+    return Cloudinary_Storage()
+
+
+upload_pipeline = Upload_Pipeline(_create_storage(), settings.UPLOAD_WORKERS)